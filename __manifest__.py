@@ -9,8 +9,13 @@
     },
     'data': [
         'security/ir.model.access.csv',
+        'security/ai_marketing_security.xml',
         'views/marketing_data_views.xml',
         'views/database_test_views.xml',
+        'views/chat_assistant_views.xml',
+        'data/recommendation_rules.xml',
+        'data/ir_cron.xml',
+        'views/ai_assistant_views.xml',
     ],
     'assets': {
         'web.assets_backend': [
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""Chat latency benchmark.
+
+Starts a throwaway PostgreSQL server (or uses ``--dsn``), loads a synthetic
+marketing_data table at each requested size and replays a fr/en/ar question
+corpus covering every question category through
+``ai.marketing.service.generate_chat_response`` and
+``chat.assistant.process_query``. Reports p50/p95/p99 latency, queries per
+message and peak allocated memory per handler, and writes them as JSON so
+two versions can be compared::
+
+    python3 benchmarks/chat_latency.py -c odoo.conf -d scratch_db \\
+        --sizes 1000,100000 --output after.json --compare before.json
+
+``-d`` must be a scratch Odoo database with this module installed:
+process_query logs every exchange into it. Every size reloads
+marketing_data, so ``--dsn`` refuses a database whose marketing_data holds
+rows unless ``--allow-truncate`` is given.
+"""
+import argparse
+import ast
+import json
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2 import extensions
+
+ADDON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Questions replayed for every category, per language
+CORPUS = {
+    'greeting': {
+        'en': ["hello there", "hey, good morning"],
+        'fr': ["bonjour !", "salut, ça va ?"],
+        'ar': ["مرحبا", "أهلا وسهلا"],
+    },
+    'campaign': {
+        'en': ["show me my campaigns", "list the ads campaigns"],
+        'fr': ["montre mes campagnes", "liste des campagnes"],
+        'ar': ["أرني حملاتي", "قائمة الحملات"],
+    },
+    'roi': {
+        'en': ["what is my roi", "are we profitable"],
+        'fr': ["quelle est la rentabilité", "quel bénéfice"],
+        'ar': ["ما هو العائد", "كم الربح"],
+    },
+    'conversion': {
+        'en': ["conversion numbers", "how do conversions convert"],
+        'fr': ["taux de conversion", "les conversions"],
+        'ar': ["معدل تحويل", "التحويلات"],
+    },
+    'performance': {
+        'en': ["performance results", "analytics overview"],
+        'fr': ["les performances", "les résultats"],
+        'ar': ["الأداء والنتائج", "نتائج"],
+    },
+    'budget': {
+        'en': ["what is my budget", "total spend and cost"],
+        'fr': ["mon budget", "les coûts"],
+        'ar': ["الميزانية", "التكلفة"],
+    },
+    'best_channel': {
+        'en': ["best channel", "top performing"],
+        'fr': ["meilleur canal", "le meilleur canal"],
+        'ar': ["أفضل قناة", "ما هي أفضل قناة"],
+    },
+    'worst_campaigns': {
+        # The localized phrases also match 'performance', which wins the tie
+        'en': ["worst performing", "list worst performing"],
+        'fr': ["worst performing", "les worst performing"],
+        'ar': ["worst performing", "ما هي worst performing"],
+    },
+    'help': {
+        'en': ["help me", "i need help"],
+        'fr': ["aide moi", "de l'aide"],
+        'ar': ["مساعدة", "أحتاج مساعدة"],
+    },
+    'time': {
+        'en': ["what time is it", "today"],
+        'fr': ["quel temps", "quand"],
+        'ar': ["وقت", "متى"],
+    },
+    'math': {
+        'en': ["calculate 2 + 2", "math please"],
+        'fr': ["calculer 3 * 4", "calculer 10 / 2"],
+        'ar': ["حساب 5 + 5", "حساب"],
+    },
+    'personal': {
+        'en': ["who are you", "your name"],
+        'fr': ["qui es-tu", "qui es-tu donc"],
+        'ar': ["من أنت", "من أنت؟"],
+    },
+    'general': {
+        'en': ["marketing tips", "suggest an idea"],
+        'fr': ["dis-moi quelque chose", "des idées"],
+        'ar': ["أخبرني شيئا", "أفكار"],
+    },
+}
+
+
+class QueryCounter:
+    """Counts statements sent to the ai_marketing database"""
+    count = 0
+
+
+_counting_cursors = {}
+
+
+def _counting_cursor(base):
+    cls = _counting_cursors.get(base)
+    if cls is None:
+        class CountingCursor(base):
+            def execute(self, query, vars=None):
+                QueryCounter.count += 1
+                return super().execute(query, vars)
+
+            def executemany(self, query, vars_list):
+                QueryCounter.count += 1
+                return super().executemany(query, vars_list)
+
+        cls = _counting_cursors[base] = CountingCursor
+    return cls
+
+
+class CountingConnection(extensions.connection):
+    def cursor(self, *args, **kwargs):
+        base = kwargs.get('cursor_factory') or self.cursor_factory or extensions.cursor
+        kwargs['cursor_factory'] = _counting_cursor(base)
+        return super().cursor(*args, **kwargs)
+
+
+def has_campaigns(connect_params):
+    """Whether marketing_data exists and holds at least one row"""
+    connection = psycopg2.connect(**connect_params)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass('marketing_data')")
+            if not cursor.fetchone()[0]:
+                return False
+            cursor.execute("SELECT EXISTS (SELECT 1 FROM marketing_data)")
+            return cursor.fetchone()[0]
+    finally:
+        connection.close()
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _pg_bindir(pg_bin):
+    if pg_bin:
+        return pg_bin
+    if shutil.which('initdb'):
+        return os.path.dirname(shutil.which('initdb'))
+    return subprocess.check_output(['pg_config', '--bindir'], text=True).strip()
+
+
+@contextmanager
+def throwaway_postgres(pg_bin=None):
+    """Run a private PostgreSQL server in a temporary directory; yields connect params"""
+    bindir = _pg_bindir(pg_bin)
+    workdir = tempfile.mkdtemp(prefix='ai_marketing_bench_')
+    datadir = os.path.join(workdir, 'data')
+    port = _free_port()
+    subprocess.run([os.path.join(bindir, 'initdb'), '-D', datadir, '-U', 'bench', '-A', 'trust',
+                    '-E', 'UTF8', '--no-sync'], check=True, stdout=subprocess.DEVNULL)
+    options = f"-p {port} -k {workdir} -c listen_addresses='' -c fsync=off -c synchronous_commit=off"
+    subprocess.run([os.path.join(bindir, 'pg_ctl'), '-D', datadir, '-o', options,
+                    '-l', os.path.join(workdir, 'server.log'), '-w', 'start'],
+                   check=True, stdout=subprocess.DEVNULL)
+    try:
+        params = {'host': workdir, 'port': str(port), 'user': 'bench', 'password': ''}
+        admin = psycopg2.connect(database='postgres', **params)
+        admin.autocommit = True
+        with admin.cursor() as cursor:
+            cursor.execute("CREATE DATABASE ai_marketing")
+        admin.close()
+        yield dict(params, database='ai_marketing')
+    finally:
+        subprocess.run([os.path.join(bindir, 'pg_ctl'), '-D', datadir, '-m', 'fast', '-w', 'stop'],
+                       stdout=subprocess.DEVNULL)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(int(round(pct / 100.0 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(timings, queries, odoo_queries, allocations):
+    timings = sorted(timings)
+    count = len(timings)
+    return {
+        'messages': count,
+        'p50_ms': percentile(timings, 50) * 1000,
+        'p95_ms': percentile(timings, 95) * 1000,
+        'p99_ms': percentile(timings, 99) * 1000,
+        'mean_ms': sum(timings) / count * 1000,
+        'queries_per_message': queries / count,
+        'odoo_queries_per_message': odoo_queries / count,
+        'alloc_peak_kb': max(allocations) / 1024 if allocations else None,
+    }
+
+
+def replay(env, path, ask, iterations, cold, trace):
+    """Replay the corpus through ``ask(message, language)``; one result per category"""
+    from odoo.addons.ai_marketing_assistant.tools.query_cache import invalidate_marketing_cache
+
+    results = []
+    for category, by_language in CORPUS.items():
+        timings, allocations = [], []
+        queries = odoo_queries = 0
+        for _i in range(iterations):
+            for language, questions in by_language.items():
+                for question in questions:
+                    if cold:
+                        invalidate_marketing_cache()
+                    QueryCounter.count = 0
+                    odoo_before = env.cr.sql_log_count
+                    if trace:
+                        tracemalloc.reset_peak()
+                        base = tracemalloc.get_traced_memory()[0]
+                    start = time.perf_counter()
+                    ask(question, language)
+                    timings.append(time.perf_counter() - start)
+                    if trace:
+                        allocations.append(tracemalloc.get_traced_memory()[1] - base)
+                    queries += QueryCounter.count
+                    odoo_queries += env.cr.sql_log_count - odoo_before
+        results.append(dict(summarize(timings, queries, odoo_queries, allocations),
+                            path=path, category=category))
+    return results
+
+
+def check_corpus(classify):
+    """Warn about corpus questions that no longer land in their category"""
+    for category, by_language in CORPUS.items():
+        for questions in by_language.values():
+            for question in questions:
+                found = classify(question.lower())
+                if found != category:
+                    print(f"warning: {question!r} is classified as {found}, not {category}", file=sys.stderr)
+
+
+def run(env, connect_params, sizes, iterations, cold, seed):
+    from odoo.addons.ai_marketing_assistant.tools import pg_pool
+    from odoo.addons.ai_marketing_assistant.tools.marketing_indexes import ensure_indexes
+    from odoo.addons.ai_marketing_assistant.tools.marketing_summary import ensure_summary, reset_installed
+    from odoo.addons.ai_marketing_assistant.tools.query_cache import invalidate_marketing_cache
+    from odoo.addons.ai_marketing_assistant.tools.sample_data import MARKETING_DATA_TABLE_SQL, load_sample_data
+
+    pool_params = dict(connect_params, connection_factory=CountingConnection)
+    pg_pool.set_pool(pg_pool.MarketingConnectionPool(pool_params, minconn=1, maxconn=4))
+    reset_installed()
+
+    service = env['ai.marketing.service']
+    assistant = env['chat.assistant']
+    check_corpus(service._classify_question)
+
+    results = []
+    for size in sizes:
+        with pg_pool.marketing_connection() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(MARKETING_DATA_TABLE_SQL)
+            load_sample_data(connection, size, seed)
+            # Installed once after the first load; its triggers follow the later reloads
+            ensure_summary(connection)
+            ensure_indexes(connection)
+        invalidate_marketing_cache()
+        print(f"marketing_data loaded with {size} rows", file=sys.stderr)
+
+        for trace in (False, True):
+            if trace:
+                tracemalloc.start()
+            rows = replay(env, 'service', service.generate_chat_response, iterations, cold, trace)
+            if trace:
+                tracemalloc.stop()
+                # Latency comes from the untraced pass, allocations from the traced one
+                for row, traced in zip(results[-len(rows):], rows):
+                    row['alloc_peak_kb'] = traced['alloc_peak_kb']
+            else:
+                for row in rows:
+                    row['size'] = size
+                results.extend(rows)
+
+    # process_query reads marketing.data from the Odoo database, whatever its size
+    session_id = assistant.new_session_id()
+    rows = replay(env, 'process_query', lambda message, _language: assistant.process_query(message, session_id),
+                  iterations, cold, False)
+    for row in rows:
+        row['size'] = env['marketing.data'].search_count([])
+    results.extend(rows)
+    assistant.flush_chat_log()
+    pg_pool.close_pool()
+    return results
+
+
+def metadata(args):
+    with open(os.path.join(ADDON_DIR, '__manifest__.py')) as manifest:
+        version = ast.literal_eval(manifest.read()).get('version')
+    try:
+        revision = subprocess.check_output(['git', '-C', ADDON_DIR, 'rev-parse', '--short', 'HEAD'],
+                                           text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        'module_version': version,
+        'revision': revision,
+        'python': platform.python_version(),
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'sizes': args.sizes,
+        'iterations': args.iterations,
+        'cold': args.cold,
+        'seed': args.seed,
+    }
+
+
+def compare(results, baseline_path):
+    """Print the p95 change of every (path, size, category) present in both runs"""
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)
+    before = {(row['path'], row['size'], row['category']): row for row in baseline['results']}
+    print(f"{'path':<14}{'size':>10}  {'category':<16}{'p95 before':>12}{'p95 after':>12}{'change':>9}")
+    for row in results:
+        old = before.get((row['path'], row['size'], row['category']))
+        if not old:
+            continue
+        change = (row['p95_ms'] - old['p95_ms']) / old['p95_ms'] * 100 if old['p95_ms'] else 0
+        print(f"{row['path']:<14}{row['size']:>10}  {row['category']:<16}"
+              f"{old['p95_ms']:>10.2f}ms{row['p95_ms']:>10.2f}ms{change:>+8.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('-c', '--config', help='Odoo configuration file')
+    parser.add_argument('-d', '--database', required=True, help='Scratch Odoo database with the module installed')
+    parser.add_argument('--dsn', help='Use this ai_marketing database instead of a throwaway server')
+    parser.add_argument('--allow-truncate', action='store_true',
+                        help='Let the benchmark empty a --dsn marketing_data that already holds campaigns')
+    parser.add_argument('--pg-bin', help='Directory holding initdb and pg_ctl')
+    parser.add_argument('--sizes', default='1000,100000',
+                        type=lambda value: [int(size) for size in value.split(',')])
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--cold', action='store_true', help='Clear the query cache before every message')
+    parser.add_argument('--output', default='chat_latency.json')
+    parser.add_argument('--compare', help='Previous JSON report to compare p95 latencies with')
+    args = parser.parse_args(argv)
+    if args.dsn and not args.allow_truncate and has_campaigns(extensions.parse_dsn(args.dsn)):
+        parser.error("marketing_data at --dsn already holds campaigns and would be truncated; "
+                     "point it at a scratch database or pass --allow-truncate")
+
+    import odoo
+    from odoo import api, SUPERUSER_ID
+    from odoo.modules.registry import Registry
+    odoo.tools.config.parse_config((['-c', args.config] if args.config else []) + ['-d', args.database])
+
+    @contextmanager
+    def ai_marketing():
+        if args.dsn:
+            yield extensions.parse_dsn(args.dsn)
+        else:
+            with throwaway_postgres(args.pg_bin) as params:
+                yield params
+
+    with ai_marketing() as connect_params, Registry(args.database).cursor() as cr:
+        env = api.Environment(cr, SUPERUSER_ID, {})
+        results = run(env, connect_params, args.sizes, args.iterations, args.cold, args.seed)
+        cr.rollback()
+
+    report = {'meta': metadata(args), 'results': results}
+    with open(args.output, 'w') as output:
+        json.dump(report, output, indent=2)
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+    for row in results:
+        print(f"{row['path']:<14}{row['size']:>10}  {row['category']:<16}"
+              f"p50 {row['p50_ms']:7.2f}ms  p95 {row['p95_ms']:7.2f}ms  p99 {row['p99_ms']:7.2f}ms  "
+              f"{row['queries_per_message']:.1f} q/msg")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,29 @@
-from odoo import http, fields
+from odoo import api, http, fields
 from odoo.http import request
+import csv
+import io
 import logging
 import json
+import psycopg2
+from werkzeug.exceptions import Forbidden
+
+from ..models.ai_service import CAMPAIGN_EXPORT_COLUMNS
+from ..tools.chat_metrics import chat_metrics
+from ..tools.pg_pool import get_pool, marketing_circuit
+from ..tools.prepared_statements import marketing_statements
+from ..tools.query_cache import query_cache
 
 _logger = logging.getLogger(__name__)
 
 class MarketingChatController(http.Controller):
     
+    @http.route('/ai_marketing_assistant/chat_session', type='json', auth='user', methods=['POST'])
+    def chat_session(self):
+        """New session id, created once per conversation and sent with each of its messages"""
+        return {'session_id': request.env['chat.assistant'].new_session_id()}
+
     @http.route('/ai_marketing_assistant/chat', type='json', auth='user', methods=['POST'])
-    def chat_response(self, message, language='en'):
+    def chat_response(self, message, language='en', session_id=None):
         try:
             _logger.info(f"Chat request received: {message} (language: {language})")
             
@@ -17,6 +32,8 @@ class MarketingChatController(http.Controller):
             
             # Generate response based on actual database data from ai_marketing
             response = ai_service.generate_chat_response(message, language)
+            if session_id:
+                request.env['chat.assistant']._log_exchange(message, response, session_id)
             
             _logger.info(f"Chat response generated successfully")
             
@@ -41,31 +58,117 @@ class MarketingChatController(http.Controller):
                 'error': str(e)
             }
 
+    @http.route('/ai_marketing_assistant/chat_stream', type='http', auth='user', methods=['POST'])
+    def chat_stream_response(self, message, language='en', session_id=None, **kwargs):
+        """Stream the chat response as chunked plain text"""
+        _logger.info(f"Chat stream request received: {message} (language: {language})")
+        
+        # The body is produced after this method returns, once the request
+        # cursor is closed: the generator works on its own cursor.
+        registry = request.env.registry
+        uid = request.env.uid
+        context = dict(request.env.context)
+        
+        def generate():
+            with registry.cursor() as cr:
+                env = api.Environment(cr, uid, context)
+                chunks = []
+                for chunk in env['ai.marketing.service'].stream_chat_response(message, language):
+                    chunks.append(chunk)
+                    yield chunk
+                if session_id:
+                    env['chat.assistant']._log_exchange(message, ''.join(chunks), session_id)
+        
+        return request.make_response(generate(), headers=[
+            ('Content-Type', 'text/plain; charset=utf-8'),
+            ('Cache-Control', 'no-cache'),
+            ('X-Accel-Buffering', 'no'),
+        ])
+
+    @http.route('/ai_marketing_assistant/chat_batch', type='json', auth='user', methods=['POST'])
+    def chat_batch_response(self, items):
+        """Answer a list of {message, language} items in one round-trip"""
+        try:
+            _logger.info(f"Chat batch request received: {len(items)} questions")
+            
+            ai_service = request.env['ai.marketing.service']
+            responses = ai_service.generate_chat_responses(items)
+            
+            return {
+                'responses': responses,
+                'success': True,
+                'timestamp': fields.Datetime.now().isoformat()
+            }
+            
+        except Exception as e:
+            _logger.error(f"Chat batch error: {str(e)}")
+            return {
+                'responses': [],
+                'success': False,
+                'error': str(e)
+            }
+
+    @http.route('/ai_marketing_assistant/export_campaigns', type='http', auth='user', methods=['GET'])
+    def export_campaigns(self, **kwargs):
+        """Download every ai_marketing campaign as CSV, streamed in constant memory"""
+        if not request.env.user.has_group('base.group_system'):
+            raise Forbidden()
+        
+        rows = request.env['ai.marketing.service']._export_campaign_rows()
+        
+        def generate():
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(CAMPAIGN_EXPORT_COLUMNS)
+            for row in rows:
+                writer.writerow(row)
+                if buffer.tell() >= 65536:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+            yield buffer.getvalue()
+        
+        return request.make_response(generate(), headers=[
+            ('Content-Type', 'text/csv; charset=utf-8'),
+            ('Content-Disposition', 'attachment; filename="marketing_data.csv"'),
+        ])
+
+    @http.route('/ai_marketing_assistant/metrics', type='json', auth='user')
+    def chat_metrics(self):
+        """Rolling chat latency histograms and data-access counters of this worker"""
+        if not request.env.user.has_group('base.group_system'):
+            return {'success': False, 'error': 'Access denied'}
+        
+        return {
+            'success': True,
+            'chat': chat_metrics.snapshot(),
+            'query_cache': query_cache.stats(),
+            'connection_pool': get_pool().stats(),
+            'circuit': marketing_circuit.stats(),
+            'prepared_statements': marketing_statements.stats(),
+        }
+
     @http.route('/ai_marketing_assistant/test_connection', type='json', auth='user')
     def test_database_connection(self):
         """Test endpoint for database connection to ai_marketing"""
         try:
             ai_service = request.env['ai.marketing.service']
-            connection = ai_service._get_pg_connection()
-            
-            if connection:
-                cursor = connection.cursor()
-                cursor.execute("SELECT COUNT(*) FROM marketing_data;")
-                count = cursor.fetchone()[0]
-                cursor.close()
-                connection.close()
-                
-                return {
-                    'success': True,
-                    'message': f'Database ai_marketing connected successfully! Found {count} campaigns.',
-                    'count': count
-                }
-            else:
-                return {
-                    'success': False,
-                    'message': 'Failed to connect to ai_marketing database'
-                }
+            with ai_service._pg_connection() as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT COUNT(*) FROM marketing_data;")
+                    count = cursor.fetchone()[0]
+            
+            return {
+                'success': True,
+                'message': f'Database ai_marketing connected successfully! Found {count} campaigns.',
+                'count': count
+            }
                 
+        except psycopg2.OperationalError:
+            return {
+                'success': False,
+                'message': 'Failed to connect to ai_marketing database'
+            }
         except Exception as e:
             return {
                 'success': False,
@@ -78,19 +181,9 @@ class MarketingChatController(http.Controller):
         try:
             ai_service = request.env['ai.marketing.service']
             
-            # Récupérer les stats des campagnes depuis ai_marketing
-            stats_query = """
-                SELECT 
-                    COUNT(*) as total_campaigns,
-                    COUNT(CASE WHEN status = 'active' THEN 1 END) as active_campaigns,
-                    SUM(cost) as total_cost,
-                    SUM(revenue) as total_revenue,
-                    SUM(conversions) as total_conversions,
-                    AVG(CASE WHEN cost > 0 THEN ((revenue - cost) / cost) * 100 ELSE 0 END) as avg_roi
-                FROM marketing_data
-            """
-            
-            stats = ai_service._query_marketing_data(stats_query)
+            # Récupérer les stats des campagnes depuis ai_marketing (requête 'totals', qui
+            # calcule le ROI à la volée tant que les colonnes générées manquent)
+            stats = ai_service._fetch_campaign_query('totals')
             
             if stats and stats[0]:
                 return {
@@ -174,30 +267,28 @@ class MarketingChatController(http.Controller):
             results = []
             results.append("🤖 CHAT INTEGRATION TEST WITH AI_MARKETING DATABASE:\n")
             
-            for question, lang in test_questions:
-                try:
-                    response = ai_service.generate_chat_response(question, lang)
+            responses = ai_service.generate_chat_responses([
+                {'message': question, 'language': lang} for question, lang in test_questions
+            ])
+            for (question, lang), answer in zip(test_questions, responses):
+                if answer['success']:
                     results.append(f"✅ Question: '{question}' ({lang})")
-                    results.append(f"   Response: {response[:100]}...")
-                    results.append("")
-                except Exception as e:
+                    results.append(f"   Response: {answer['response'][:100]}...")
+                else:
                     results.append(f"❌ Question: '{question}' ({lang})")
-                    results.append(f"   Error: {str(e)}")
-                    results.append("")
+                    results.append(f"   Error: {answer['response']}")
+                results.append("")
             
             # Test de connexion à la base ai_marketing
             try:
-                connection = ai_service._get_pg_connection()
-                if connection:
-                    cursor = connection.cursor()
-                    cursor.execute("SELECT COUNT(*) FROM marketing_data")
-                    count = cursor.fetchone()[0]
-                    results.append(f"🔗 Database Connection: ✅ Connected to ai_marketing")
-                    results.append(f"📊 Found {count} campaigns in ai_marketing database")
-                    cursor.close()
-                    connection.close()
-                else:
-                    results.append("🔗 Database Connection: ❌ Failed to connect to ai_marketing")
+                with ai_service._pg_connection() as connection:
+                    with connection.cursor() as cursor:
+                        cursor.execute("SELECT COUNT(*) FROM marketing_data")
+                        count = cursor.fetchone()[0]
+                results.append(f"🔗 Database Connection: ✅ Connected to ai_marketing")
+                results.append(f"📊 Found {count} campaigns in ai_marketing database")
+            except psycopg2.OperationalError:
+                results.append("🔗 Database Connection: ❌ Failed to connect to ai_marketing")
             except Exception as e:
                 results.append(f"🔗 Database Connection: ❌ Error: {str(e)}")
             
@@ -1,3 +1,8 @@
 from . import marketing_data
+from . import marketing_data_summary
 from . import ai_service
-from . import database_test
\ No newline at end of file
+from . import chat_assistant
+from . import chat_history_archive
+from . import database_test
+from . import recommendation_rule
+from . import ai_assistant
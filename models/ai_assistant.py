@@ -1,6 +1,13 @@
 from odoo import models, fields, api
 import logging
 
+from ..tools.query_cache import invalidate_marketing_cache
+from .recommendation_rule import PRIORITIES, RECOMMENDATION_TYPES
+
+# Default multiplier applied to the budget of campaigns whose budget is increased,
+# overridable with the ai_marketing_assistant.budget_increase_factor parameter
+BUDGET_INCREASE_FACTOR = 1.2
+
 _logger = logging.getLogger(__name__)
 
 class AIAssistant(models.Model):
@@ -8,70 +15,107 @@ class AIAssistant(models.Model):
     _description = 'AI Marketing Assistant'
 
     name = fields.Char('Recommendation Title', required=True)
-    recommendation_type = fields.Selection([
-        ('stop_campaign', 'Stop Campaign'),
-        ('increase_budget', 'Increase Budget'),
-        ('optimize_ad', 'Optimize Ad'),
-        ('channel_shift', 'Channel Shift')
-    ], string='Type', required=True)
+    recommendation_type = fields.Selection(RECOMMENDATION_TYPES, string='Type', required=True)
     campaign_id = fields.Many2one('marketing.data', 'Campaign')
     reason = fields.Text('Reason')
     impact_score = fields.Float('Impact Score', help='Expected impact (0-100)')
-    priority = fields.Selection([
-        ('low', 'Low'),
-        ('medium', 'Medium'),
-        ('high', 'High'),
-        ('critical', 'Critical')
-    ], string='Priority', default='medium')
+    priority = fields.Selection(PRIORITIES, string='Priority', default='medium')
     status = fields.Selection([
         ('pending', 'Pending'),
         ('applied', 'Applied'),
         ('rejected', 'Rejected')
     ], string='Status', default='pending')
 
+    @api.model
+    def _pending_recommendation_keys(self, campaign_ids, recommendation_types):
+        """(campaign id, type) pairs that already have a pending recommendation"""
+        groups = self._read_group([
+            ('status', '=', 'pending'),
+            ('campaign_id', 'in', campaign_ids),
+            ('recommendation_type', 'in', recommendation_types),
+        ], groupby=['campaign_id', 'recommendation_type'])
+        return {(campaign.id, recommendation_type) for campaign, recommendation_type in groups}
+
     @api.model
     def generate_recommendations(self):
         """Generate AI recommendations based on marketing data"""
-        campaigns = self.env['marketing.data'].search([])
-        recommendations = []
+        rules = self.env['ai.recommendation.rule'].search([])
 
-        for campaign in campaigns:
-            # Analyze campaign performance
-            if campaign.roi < 0 and campaign.cost > 1000:
-                # Stop campaign recommendation
-                recommendations.append({
-                    'name': f"Stop Campaign: {campaign.name}",
-                    'recommendation_type': 'stop_campaign',
-                    'campaign_id': campaign.id,
-                    'reason': f"High cost ({campaign.cost}) with negative ROI ({campaign.roi:.2f}%)",
-                    'impact_score': 85.0,
-                    'priority': 'high'
-                })
+        # One query per rule; a campaign is claimed by the first rule it matches
+        claimed = set()
+        matches = []
+        for rule in rules:
+            campaign_ids = [cid for cid in rule._matching_campaign_ids() if cid not in claimed]
+            claimed.update(campaign_ids)
+            if campaign_ids:
+                matches.append((rule, campaign_ids))
+        if not matches:
+            return 0
 
-            # Increase budget for high-performing campaigns
-            elif campaign.conversion_rate > 10 and campaign.roi > 50:
+        existing = self._pending_recommendation_keys(
+            list(claimed), list({rule.recommendation_type for rule, _ids in matches}))
+
+        recommendations = []
+        for rule, campaign_ids in matches:
+            for campaign in self.env['marketing.data'].browse(campaign_ids):
+                if (campaign.id, rule.recommendation_type) in existing:
+                    continue
+                title, reason = rule._render({
+                    'name': campaign.name,
+                    'channel': campaign.channel_id.name,
+                    'status': campaign.status,
+                    'cost': campaign.cost,
+                    'revenue': campaign.revenue,
+                    'conversions': campaign.conversions,
+                    'roi': campaign.roi,
+                    'conversion_rate': campaign.conversion_rate,
+                })
                 recommendations.append({
-                    'name': f"Increase Budget: {campaign.name}",
-                    'recommendation_type': 'increase_budget',
+                    'name': title,
+                    'recommendation_type': rule.recommendation_type,
                     'campaign_id': campaign.id,
-                    'reason': f"High conversion rate ({campaign.conversion_rate:.2f}%) and ROI ({campaign.roi:.2f}%)",
-                    'impact_score': 75.0,
-                    'priority': 'medium'
+                    'reason': reason,
+                    'impact_score': rule.impact_score,
+                    'priority': rule.priority
                 })
 
         # Create recommendation records
-        for rec_data in recommendations:
-            self.create(rec_data)
+        self.create(recommendations)
 
         return len(recommendations)
 
     def apply_recommendation(self):
-        """Apply the selected recommendation"""
-        for recommendation in self:
-            if recommendation.recommendation_type == 'stop_campaign':
-                recommendation.campaign_id.status = 'paused'
-            elif recommendation.recommendation_type == 'increase_budget':
-                # Implement budget increase logic
-                pass
-            
-            recommendation.status = 'applied'
\ No newline at end of file
+        """Apply the selected recommendations, batching writes per action type"""
+        pending = self.filtered(lambda r: r.status == 'pending')
+        by_type = pending.grouped('recommendation_type')
+
+        stop = by_type.get('stop_campaign')
+        if stop:
+            stop.campaign_id.write({'status': 'paused'})
+
+        increase = by_type.get('increase_budget')
+        if increase:
+            self._increase_campaign_budgets(increase.campaign_id)
+
+        pending.write({'status': 'applied'})
+        return True
+
+    @api.model
+    def _increase_campaign_budgets(self, campaigns):
+        """Raise the budget of ``campaigns`` by the configured factor in a single UPDATE"""
+        if not campaigns:
+            return
+        factor = float(self.env['ir.config_parameter'].sudo().get_param(
+            'ai_marketing_assistant.budget_increase_factor', BUDGET_INCREASE_FACTOR))
+        MarketingData = self.env['marketing.data']
+        MarketingData.flush_model(['budget', 'cost'])
+        # Campaigns without a planned budget start from what they spent so far
+        self.env.cr.execute("""
+            UPDATE marketing_data
+            SET budget = ROUND((COALESCE(NULLIF(budget, 0), cost) * %s)::numeric, 2),
+                write_uid = %s,
+                write_date = NOW() AT TIME ZONE 'UTC'
+            WHERE id IN %s
+        """, (factor, self.env.uid, tuple(campaigns.ids)))
+        MarketingData.invalidate_model(['budget', 'write_uid', 'write_date'])
+        invalidate_marketing_cache()
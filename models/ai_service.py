@@ -1,50 +1,161 @@
 from odoo import models, fields, api
+import concurrent.futures
 import logging
 import psycopg2
 from psycopg2.extras import RealDictCursor
 import json
 import re
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
+
+from ..tools.pg_pool import CircuitOpenError, marketing_connection
+from ..tools.query_cache import QueryCache, current_memo, query_cache, query_memo
+from ..tools.intent_classifier import question_classifier
+from ..tools.marketing_summary import SUMMARY_STATS_KEYS, SUMMARY_STATS_SQL, read_summary_stats
+from ..tools.chat_metrics import chat_metrics, instrument_methods, instrumented
+from ..tools.marketing_stream import DEFAULT_ITERSIZE, iter_marketing_rows
+from ..tools.marketing_queries import inline_variant, query_variant
+from ..tools.marketing_indexes import generated_columns_present
+from ..tools.campaign_repository import CampaignRepository, OdooCampaigns, PostgresCampaigns
+from ..tools.prepared_statements import marketing_statements
+from ..tools.question_filters import parse_filters
+from ..tools.chat_messages import STATUS_LABELS, chat_catalog
+
+# Cache lifetime (seconds) of the aggregate queries repeated on every chat message
+STATS_CACHE_TTL = 60
+CHANNEL_CACHE_TTL = 300
+ROI_CACHE_TTL = 120
+PERFORMANCE_CACHE_TTL = 120
+
+# MARKETING_QUERIES served from the query cache -> lifetime (seconds)
+CAMPAIGN_QUERY_TTLS = {
+    'totals': STATS_CACHE_TTL,
+    'by_channel': CHANNEL_CACHE_TTL,
+    'by_status': PERFORMANCE_CACHE_TTL,
+    'roi_bounds': ROI_CACHE_TTL,
+    'channels': CHANNEL_CACHE_TTL,
+    'any_campaign': STATS_CACHE_TTL,
+}
+
+# Seconds the greeting waits for ai_marketing stats before using the Odoo ones
+GREETING_PG_TIMEOUT = 1.0
+
+# Maximum number of questions answered by one generate_chat_responses call
+MAX_BATCH_SIZE = 100
+CAMPAIGN_EXPORT_COLUMNS = ('id', 'name', 'channel', 'campaign_type', 'status', 'cost', 'revenue',
+                           'conversions', 'created_date')
+
+# Question category -> handler method
+QUESTION_HANDLERS = {
+    'greeting': '_handle_greeting',
+    'best_channel': '_handle_best_channel_question',
+    'worst_campaigns': '_handle_worst_campaigns_question',
+    'campaign': '_handle_campaign_question',
+    'roi': '_handle_roi_question',
+    'conversion': '_handle_conversion_question',
+    'performance': '_handle_performance_question',
+    'budget': '_handle_budget_question',
+    'help': '_handle_help_question',
+    'time': '_handle_time_question',
+    'math': '_handle_math_question',
+    'personal': '_handle_personal_question',
+}
+
+# Question category -> generator method yielding the response in chunks
+STREAMING_HANDLERS = {
+    'campaign': '_iter_campaign_question',
+    'performance': '_iter_performance_question',
+}
 
 _logger = logging.getLogger(__name__)
 
+# dsn of the ai_marketing databases already reported as lacking the generated columns
+_inline_fallback_reported = set()
+
+# Runs ai_marketing reads that race an Odoo fallback
+_stats_executor = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix='ai_marketing.stats')
+
 class AIMarketingService(models.Model):
     _name = 'ai.marketing.service'
     _description = 'AI Marketing Service'
 
     name = fields.Char('Service Name', default='AI Marketing Assistant')
     
-    def _get_pg_connection(self):
-        """Get PostgreSQL connection to ai_marketing database"""
+    def _pg_connection(self):
+        """Borrow a pooled connection to the ai_marketing database"""
+        return marketing_connection()
+
+    def _query_marketing_data(self, query, params=None, ttl=None, statement=None):
+        """Execute query on ai_marketing database
+
+        When ``ttl`` (seconds) is given the result is served from the shared
+        query cache; cached rows must not be mutated by the caller.
+        ``statement`` names the prepared statement of ``query`` when it is one
+        of the MARKETING_QUERIES or of their filtered variants.
+        """
+        memo = current_memo()
+        if memo is not None:
+            key = QueryCache.make_key(query, params)
+            if key in memo:
+                if chat_metrics.enabled:
+                    chat_metrics.note_source('cache')
+                return memo[key]
+        if ttl:
+            fetched = []
+
+            def compute():
+                fetched.append(True)
+                return self._fetch_marketing_data(query, params, statement)
+            result = query_cache.get_or_compute(query, params, ttl, compute)
+            if not fetched and chat_metrics.enabled:
+                chat_metrics.note_source('cache')
+        else:
+            result = self._fetch_marketing_data(query, params, statement)
+        if memo is not None and result is not None:
+            memo[key] = result
+        return result
+
+    def _stream_marketing_data(self, query, params=None, itersize=DEFAULT_ITERSIZE, named=False):
+        """Iterate over a large ai_marketing result in constant memory (tuples or namedtuples)"""
+        return iter_marketing_rows(query, params, itersize=itersize, named=named)
+
+    def _export_campaign_rows(self):
+        """Every campaign in id order, streamed from a server-side cursor"""
+        query = "SELECT %s FROM marketing_data ORDER BY id" % ', '.join(CAMPAIGN_EXPORT_COLUMNS)
+        return self._stream_marketing_data(query)
+
+    def _fetch_marketing_data(self, query, params=None, statement=None):
         try:
-            connection = psycopg2.connect(
-                host="localhost",
-                database="ai_marketing",
-                user="odoo",
-                password="odoo",
-                port="5432"
-            )
-            return connection
-        except Exception as e:
-            _logger.error(f"Failed to connect to ai_marketing database: {str(e)}")
+            start = time.perf_counter()
+            with self._pg_connection() as connection:
+                connected = time.perf_counter()
+                # The handler queries read the generated roi / conversion_rate columns; adding
+                # them rewrites the table, so that is left to the test wizard and sample loader.
+                # Until then the same queries compute both inline.
+                if statement and not generated_columns_present(connection):
+                    if connection.dsn not in _inline_fallback_reported:
+                        _inline_fallback_reported.add(connection.dsn)
+                        _logger.warning("marketing_data has no generated roi / conversion_rate columns, "
+                                        "computing them in each query until 'Optimize Indexes' is run "
+                                        "from the database test wizard")
+                    statement, query = inline_variant(statement)
+                with connection.cursor(cursor_factory=RealDictCursor) as cursor:
+                    if statement:
+                        marketing_statements.execute(cursor, statement, params, query)
+                    else:
+                        cursor.execute(query, params or ())
+                    rows = cursor.fetchall()
+            if chat_metrics.enabled:
+                chat_metrics.note_query(len(rows), time.perf_counter() - start, connected - start)
+            return rows
+        except CircuitOpenError:
             return None
-
-    def _query_marketing_data(self, query, params=None):
-        """Execute query on ai_marketing database"""
-        connection = self._get_pg_connection()
-        if not connection:
+        except psycopg2.OperationalError as e:
+            _logger.error(f"Failed to connect to ai_marketing database: {str(e)}")
             return None
-        
-        try:
-            with connection.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute(query, params or ())
-                results = cursor.fetchall()
-                return [dict(row) for row in results]
         except Exception as e:
             _logger.error(f"Database query error: {str(e)}")
             return None
-        finally:
-            connection.close()
 
     def _detect_language(self, message):
         """Détection automatique de la langue"""
@@ -62,32 +173,9 @@ class AIMarketingService(models.Model):
 
     def _classify_question(self, message_lower):
         """Classification intelligente des questions"""
-        classifications = {
-            'greeting': ['hello', 'hi', 'hey', 'bonjour', 'salut', 'مرحبا', 'أهلا'],
-            'campaign': ['campaign', 'campaigns', 'campagne', 'campagnes', 'حملة', 'حملات', 'ads', 'advertising'],
-            'roi': ['roi', 'return', 'profit', 'rentabilité', 'bénéfice', 'عائد', 'ربح', 'profitable'],
-            'conversion': ['conversion', 'convert', 'conversions', 'تحويل', 'تحويلات', 'rate', 'taux'],
-            'performance': ['performance', 'performances', 'résultats', 'أداء', 'نتائج', 'results', 'analytics'],
-            'budget': ['budget', 'cost', 'coût', 'coûts', 'ميزانية', 'تكلفة', 'spend', 'spending'],
-            'best_channel': ['best channel', 'top performing', 'meilleur canal', 'أفضل قناة'],
-            'worst_campaigns': ['worst performing', 'low performance', 'pire performance', 'أسوأ أداء'],
-            'help': ['help', 'aide', 'مساعدة', 'how', 'comment', 'كيف'],
-            'time': ['time', 'when', 'date', 'today', 'temps', 'quand', 'وقت', 'متى'],
-            'math': ['calculate', 'computation', 'math', 'calculer', 'حساب'],
-            'personal': ['who are you', 'your name', 'qui es-tu', 'من أنت'],
-        }
-        
-        scores = {}
-        for category, keywords in classifications.items():
-            score = sum(1 for keyword in keywords if keyword in message_lower)
-            if score > 0:
-                scores[category] = score
-        
-        if scores:
-            return max(scores, key=scores.get)
-        
-        return 'general'
+        return question_classifier.classify(message_lower)
 
+    @instrumented()
     def generate_chat_response(self, message, language='en'):
         """Generate intelligent response to ANY question"""
         try:
@@ -97,654 +185,350 @@ class AIMarketingService(models.Model):
             if not language or language == 'auto':
                 language = self._detect_language(message)
             
-            # Classify the question
+            # Classify the question and route to the appropriate handler
             question_type = self._classify_question(message_lower)
-            
-            # Route to appropriate handler
-            if question_type == 'greeting':
-                return self._handle_greeting(message, language)
-            elif question_type == 'best_channel':
-                return self._handle_best_channel_question(message, language)
-            elif question_type == 'worst_campaigns':
-                return self._handle_worst_campaigns_question(message, language)
-            elif question_type == 'campaign':
-                return self._handle_campaign_question(message, language)
-            elif question_type == 'roi':
-                return self._handle_roi_question(message, language)
-            elif question_type == 'conversion':
-                return self._handle_conversion_question(message, language)
-            elif question_type == 'performance':
-                return self._handle_performance_question(message, language)
-            elif question_type == 'budget':
-                return self._handle_budget_question(message, language)
-            elif question_type == 'help':
-                return self._handle_help_question(message, language)
-            elif question_type == 'time':
-                return self._handle_time_question(message, language)
-            elif question_type == 'math':
-                return self._handle_math_question(message, language)
-            elif question_type == 'personal':
-                return self._handle_personal_question(message, language)
-            else:
-                return self._handle_general_intelligent_question(message, language)
+            handler = QUESTION_HANDLERS.get(question_type, '_handle_general_intelligent_question')
+            with query_memo():
+                return getattr(self, handler)(message, language)
                 
         except Exception as e:
             _logger.error(f"Error generating chat response: {str(e)}")
             return self._get_error_response(language)
 
+    @instrumented()
+    def stream_chat_response(self, message, language='en'):
+        """Yield the response to ``message`` in chunks.
+
+        Reports with a streaming variant send their header first and then
+        one chunk per row; every other question is answered in one chunk.
+        """
+        if not language or language == 'auto':
+            language = self._detect_language(message)
+        try:
+            question_type = self._classify_question(message.lower())
+            if question_type in STREAMING_HANDLERS:
+                yield from getattr(self, STREAMING_HANDLERS[question_type])(message, language)
+            else:
+                handler = QUESTION_HANDLERS.get(question_type, '_handle_general_intelligent_question')
+                yield getattr(self, handler)(message, language)
+        except Exception as e:
+            _logger.error(f"Error streaming chat response: {str(e)}")
+            yield self._get_error_response(language)
+
+    @api.model
+    def generate_chat_responses(self, items):
+        """Answer a batch of ``{'message', 'language'}`` items in one call.
+
+        Questions are classified up front and answered grouped by handler
+        inside a query memo scope, so every distinct ai_marketing query runs
+        at most once for the whole batch. Replies keep the input order.
+        """
+        if len(items) > MAX_BATCH_SIZE:
+            raise ValueError(f"At most {MAX_BATCH_SIZE} questions per batch")
+
+        by_handler = {}
+        for index, item in enumerate(items):
+            message = item.get('message') or ''
+            language = item.get('language') or 'en'
+            if language == 'auto':
+                language = self._detect_language(message)
+            question_type = self._classify_question(message.lower())
+            handler = QUESTION_HANDLERS.get(question_type, '_handle_general_intelligent_question')
+            by_handler.setdefault(handler, []).append((index, message, language))
+
+        responses = [None] * len(items)
+        with query_memo():
+            for handler, questions in by_handler.items():
+                for index, message, language in questions:
+                    try:
+                        responses[index] = {
+                            'response': getattr(self, handler)(message, language),
+                            'success': True,
+                        }
+                    except Exception as e:
+                        _logger.error(f"Error generating batch chat response: {str(e)}")
+                        responses[index] = {
+                            'response': self._get_error_response(language),
+                            'success': False,
+                        }
+        return responses
+
     def _handle_greeting(self, message, language):
         """Handle greetings with real-time stats"""
         try:
-            # Try PostgreSQL first, fallback to Odoo
-            pg_data = self._get_pg_stats()
-            odoo_data = self._get_odoo_stats()
-            
-            # Use whichever data source has more campaigns
-            if pg_data and pg_data.get('total_campaigns', 0) > 0:
-                stats = pg_data
-                source = "PostgreSQL ai_marketing"
-            elif odoo_data and odoo_data.get('total_campaigns', 0) > 0:
-                stats = odoo_data
-                source = "Odoo"
-            else:
-                stats = None
-                source = "No data"
-            
-            greetings = {
-                'fr': {
-                    'hello': "Bonjour ! Je suis votre assistant marketing IA. 👋\n\n",
-                    'overview': "📊 Aperçu rapide :\n",
-                    'question': "Comment puis-je vous aider aujourd'hui ?"
-                },
-                'en': {
-                    'hello': "Hello! I'm your AI Marketing Assistant. 👋\n\n",
-                    'overview': "📊 Quick Overview:\n",
-                    'question': "How can I help you today?"
-                },
-                'ar': {
-                    'hello': "مرحباً! أنا مساعد التسويق الذكي. 👋\n\n",
-                    'overview': "📊 نظرة سريعة:\n",
-                    'question': "كيف يمكنني مساعدتك اليوم؟"
-                }
-            }
-            
-            lang_text = greetings.get(language, greetings['en'])
-            greeting = lang_text['hello']
+            stats, source = self._resolve_greeting_stats()
             
+            parts = [chat_catalog.render('greeting.hello', language)]
             if stats and stats['total_campaigns'] > 0:
-                greeting += lang_text['overview']
-                
-                if language == 'fr':
-                    greeting += f"• {stats['active_campaigns']}/{stats['total_campaigns']} campagnes actives\n"
-                    greeting += f"• ${stats['total_revenue']:,.0f} revenus totaux\n"
-                    greeting += f"• {stats['total_conversions']:,} conversions totales\n"
-                    greeting += f"• {stats['avg_roi']:.1f}% ROI moyen\n"
-                    greeting += f"• Source: {source}\n\n"
-                elif language == 'ar':
-                    greeting += f"• {stats['active_campaigns']}/{stats['total_campaigns']} حملة نشطة\n"
-                    greeting += f"• ${stats['total_revenue']:,.0f} إجمالي الإيرادات\n"
-                    greeting += f"• {stats['total_conversions']:,} إجمالي التحويلات\n"
-                    greeting += f"• {stats['avg_roi']:.1f}% متوسط عائد الاستثمار\n"
-                    greeting += f"• المصدر: {source}\n\n"
-                else:
-                    greeting += f"• {stats['active_campaigns']}/{stats['total_campaigns']} campaigns active\n"
-                    greeting += f"• ${stats['total_revenue']:,.0f} total revenue\n"
-                    greeting += f"• {stats['total_conversions']:,} total conversions\n"
-                    greeting += f"• {stats['avg_roi']:.1f}% average ROI\n"
-                    greeting += f"• Source: {source}\n\n"
-            
-            greeting += lang_text['question']
-            return greeting
+                parts.append(chat_catalog.render('greeting.overview', language, {**stats, 'source': source}))
+            parts.append(chat_catalog.render('greeting.question', language))
+            return ''.join(parts)
             
         except Exception as e:
             _logger.error(f"Error in greeting: {str(e)}")
             return self._get_error_response(language)
 
+    def _resolve_greeting_stats(self):
+        """Overview stats and their source: PostgreSQL first, Odoo as fallback.
+
+        Cached PostgreSQL stats are used without touching Odoo. Otherwise
+        the PostgreSQL read runs on a worker thread while the Odoo stats are
+        read here, and is abandoned after GREETING_PG_TIMEOUT seconds (it
+        still fills the cache for the next greeting). The worker's queries
+        are added to the metrics of this request when it answers in time.
+        """
+        pg_data = query_cache.get(QueryCache.make_key(SUMMARY_STATS_SQL, None))
+        odoo_data = None
+        if pg_data is None:
+            future = _stats_executor.submit(chat_metrics.run_traced, self._get_pg_stats)
+            odoo_data = self._get_odoo_stats()
+            try:
+                pg_data, counters = future.result(timeout=GREETING_PG_TIMEOUT)
+                chat_metrics.merge_trace(counters)
+            except concurrent.futures.TimeoutError:
+                _logger.warning(f"ai_marketing stats took more than {GREETING_PG_TIMEOUT}s, using Odoo stats")
+        
+        if pg_data and pg_data.get('total_campaigns', 0) > 0:
+            return pg_data, "PostgreSQL ai_marketing"
+        if odoo_data is None:
+            odoo_data = self._get_odoo_stats()
+        if odoo_data and odoo_data.get('total_campaigns', 0) > 0:
+            return odoo_data, "Odoo"
+        return None, "No data"
+
+    def _get_summary_stats(self):
+        """Precomputed global stats from the marketing_data_summary table"""
+        def compute():
+            try:
+                start = time.perf_counter()
+                with self._pg_connection() as connection:
+                    connected = time.perf_counter()
+                    stats = read_summary_stats(connection)
+                if chat_metrics.enabled:
+                    chat_metrics.note_query(1, time.perf_counter() - start, connected - start)
+                return stats
+            except CircuitOpenError:
+                return None
+            except psycopg2.Error as e:
+                _logger.error(f"Failed to read marketing_data_summary: {str(e)}")
+                return None
+        return query_cache.get_or_compute(SUMMARY_STATS_SQL, None, STATS_CACHE_TTL, compute)
+
     def _get_pg_stats(self):
         """Get stats from PostgreSQL ai_marketing database"""
-        try:
-            query = """
-                SELECT 
-                    COUNT(*) as total_campaigns,
-                    COUNT(CASE WHEN status = 'active' THEN 1 END) as active_campaigns,
-                    COALESCE(SUM(revenue), 0) as total_revenue,
-                    COALESCE(SUM(conversions), 0) as total_conversions,
-                    COALESCE(AVG(CASE WHEN cost > 0 THEN ((revenue - cost) / cost) * 100 ELSE 0 END), 0) as avg_roi
-                FROM marketing_data
-            """
-            
-            data = self._query_marketing_data(query)
-            return data[0] if data and data[0] else None
-        except:
-            return None
+        summary = self._get_summary_stats()
+        if summary is not None:
+            return summary
+        data = self._fetch_campaign_query('totals')
+        return {key: data[0][key] for key in SUMMARY_STATS_KEYS} if data and data[0] else None
 
     def _get_odoo_stats(self):
         """Get stats from Odoo marketing.data"""
         try:
-            campaigns = self.env['marketing.data'].search([])
-            active_campaigns = self.env['marketing.data'].search([('status', '=', 'active')])
-            
-            total_revenue = sum(campaign.revenue for campaign in campaigns)
-            total_conversions = sum(campaign.conversions for campaign in campaigns)
-            avg_roi = sum(campaign.roi for campaign in campaigns) / len(campaigns) if campaigns else 0
-            
-            return {
-                'total_campaigns': len(campaigns),
-                'active_campaigns': len(active_campaigns),
-                'total_revenue': total_revenue,
-                'total_conversions': total_conversions,
-                'avg_roi': avg_roi
-            }
-        except:
+            return self.env['marketing.data.summary']._get_stats()
+        except Exception as e:
+            _logger.error(f"Error reading Odoo marketing stats: {str(e)}")
             return None
 
-    def _handle_best_channel_question(self, message, language):
-        """Handle best channel questions using chat_assistant logic"""
-        try:
-            # Try to use existing chat_assistant method
-            chat_assistant = self.env['chat.assistant']
-            response = chat_assistant._get_best_channel()
-            return self._format_response_by_language(response, language)
-        except:
-            # Fallback to PostgreSQL query
-            return self._handle_best_channel_pg(language)
-
-    def _handle_best_channel_pg(self, language):
-        """Handle best channel using PostgreSQL data"""
-        query = """
-            SELECT 
-                channel,
-                COUNT(*) as campaign_count,
-                AVG(CASE WHEN cost > 0 THEN ((revenue - cost) / cost) * 100 ELSE 0 END) as avg_roi,
-                SUM(revenue) as total_revenue,
-                SUM(conversions) as total_conversions
-            FROM marketing_data 
-            WHERE channel IS NOT NULL
-            GROUP BY channel
-            ORDER BY avg_roi DESC
-            LIMIT 5
+    def _fetch_campaign_query(self, name, params=None, predicates=()):
+        """Rows of one of the MARKETING_QUERIES, None if ai_marketing is unavailable
+
+        ``predicates`` names the FILTER_PREDICATES restricting the query; each
+        combination runs as its own prepared statement.
         """
-        
-        data = self._query_marketing_data(query)
+        statement, query = query_variant(name, tuple(predicates))
+        return self._query_marketing_data(query, params, ttl=CAMPAIGN_QUERY_TTLS.get(name), statement=statement)
+
+    def _campaign_repository(self):
+        """Campaign reads for the current request (see CampaignRepository for the precedence)"""
+        return CampaignRepository([
+            PostgresCampaigns(self._fetch_campaign_query, self._get_summary_stats),
+            OdooCampaigns(self.env),
+        ], current_memo())
+
+    def _question_filters(self, message, repository=None):
+        """Top-N, creation window and channel asked for in ``message``
+
+        Channel names are only recognized when ``repository`` is given.
+        """
+        channels = (repository.channels() or ()) if repository is not None else ()
+        return parse_filters(message.lower(), channels)
+
+    def _render_filters(self, filters, language):
+        """Period and channel a report is restricted to, '' when it is not"""
+        response = ''
+        if filters.date_from is not None:
+            # date_to is exclusive; an open window ends today
+            date_to = filters.date_to - timedelta(days=1) if filters.date_to else fields.Date.today()
+            response += chat_catalog.render('filters.window', language,
+                                            {'date_from': filters.date_from, 'date_to': date_to})
+        if filters.channel is not None:
+            response += chat_catalog.render('filters.channel', language, {'channel': filters.channel})
+        return response + '\n' if response else ''
+
+    def _handle_best_channel_question(self, message, language):
+        """Handle best channel questions"""
+        # Every channel competes, only the window and the top-N apply
+        filters = self._question_filters(message)
+        data = self._campaign_repository().group_by_channel(limit=filters.limit or 5, filters=filters)
+        return self._render_filters(filters, language) + self._render_best_channel(data, language, filters.limit or 3)
+
+    def _render_best_channel(self, data, language, count=3):
         if not data:
-            return {
-                'fr': "Aucune donnée de canal trouvée.",
-                'en': "No channel data found.",
-                'ar': "لم يتم العثور على بيانات القنوات."
-            }.get(language, "No channel data found.")
-        
-        if language == 'fr':
-            response = "🏆 **Meilleur Canal de Performance** :\n\n"
-            best_channel = data[0]
-            response += f"📊 **{best_channel['channel']}**\n"
-            response += f"• ROI Moyen: {best_channel['avg_roi']:.1f}%\n"
-            response += f"• Nombre de campagnes: {best_channel['campaign_count']}\n"
-            response += f"• Revenus totaux: ${best_channel['total_revenue']:,.0f}\n"
-            response += f"• Conversions totales: {best_channel['total_conversions']:,}\n\n"
-            
-            if len(data) > 1:
-                response += "📈 **Top 3 canaux** :\n"
-                for i, channel in enumerate(data[:3], 1):
-                    response += f"{i}. {channel['channel']}: {channel['avg_roi']:.1f}% ROI\n"
-        
-        elif language == 'ar':
-            response = "🏆 **أفضل قناة أداء** :\n\n"
-            best_channel = data[0]
-            response += f"📊 **{best_channel['channel']}**\n"
-            response += f"• متوسط عائد الاستثمار: {best_channel['avg_roi']:.1f}%\n"
-            response += f"• عدد الحملات: {best_channel['campaign_count']}\n"
-            response += f"• إجمالي الإيرادات: ${best_channel['total_revenue']:,.0f}\n"
-            response += f"• إجمالي التحويلات: {best_channel['total_conversions']:,}\n\n"
-            
-            if len(data) > 1:
-                response += "📈 **أفضل 3 قنوات** :\n"
-                for i, channel in enumerate(data[:3], 1):
-                    response += f"{i}. {channel['channel']}: {channel['avg_roi']:.1f}% عائد\n"
-        
-        else:
-            response = "🏆 **Best Performing Channel** :\n\n"
-            best_channel = data[0]
-            response += f"📊 **{best_channel['channel']}**\n"
-            response += f"• Average ROI: {best_channel['avg_roi']:.1f}%\n"
-            response += f"• Campaign count: {best_channel['campaign_count']}\n"
-            response += f"• Total revenue: ${best_channel['total_revenue']:,.0f}\n"
-            response += f"• Total conversions: {best_channel['total_conversions']:,}\n\n"
-            
-            if len(data) > 1:
-                response += "📈 **Top 3 channels** :\n"
-                for i, channel in enumerate(data[:3], 1):
-                    response += f"{i}. {channel['channel']}: {channel['avg_roi']:.1f}% ROI\n"
-        
+            return chat_catalog.render('best_channel.empty', language)
+        
+        response = chat_catalog.render('best_channel.header', language, data[0])
+        if len(data) > 1:
+            response += chat_catalog.render_rows(
+                'best_channel.top_row', language,
+                ({**channel, 'index': i} for i, channel in enumerate(data[:count], 1)),
+                header='best_channel.top_header',
+                values={'count': count},
+            )
         return response
 
     def _handle_worst_campaigns_question(self, message, language):
         """Handle worst campaigns questions"""
-        try:
-            chat_assistant = self.env['chat.assistant']
-            response = chat_assistant._get_worst_campaigns()
-            return self._format_response_by_language(response, language)
-        except:
-            return self._handle_worst_campaigns_pg(language)
-
-    def _handle_worst_campaigns_pg(self, language):
-        """Handle worst campaigns using PostgreSQL data"""
-        query = """
-            SELECT 
-                name, 
-                cost, 
-                revenue, 
-                conversions,
-                status,
-                CASE WHEN cost > 0 THEN ((revenue - cost) / cost) * 100 ELSE 0 END as roi
-            FROM marketing_data 
-            ORDER BY roi ASC
-            LIMIT 5
-        """
-        
-        campaigns = self._query_marketing_data(query)
+        repository = self._campaign_repository()
+        filters = self._question_filters(message, repository)
+        campaigns = repository.top_n('worst_roi', filters.limit or 5, filters)
+        return self._render_filters(filters, language) + self._render_worst_campaigns(campaigns, language)
+
+    def _render_worst_campaigns(self, campaigns, language):
         if not campaigns:
-            return {
-                'fr': "Aucune donnée de campagne trouvée.",
-                'en': "No campaign data found.",
-                'ar': "لم يتم العثور على بيانات حملات."
-            }.get(language, "No campaign data found.")
+            return chat_catalog.render('worst_campaigns.empty', language)
         
-        if language == 'fr':
-            response = "📉 **Campagnes les Moins Performantes** :\n\n"
-            for i, campaign in enumerate(campaigns, 1):
-                response += f"{i}. **{campaign['name']}**\n"
-                response += f"   • ROI: {campaign['roi']:.1f}%\n"
-                response += f"   • Revenus: ${campaign['revenue']:,.0f}\n"
-                response += f"   • Coût: ${campaign['cost']:,.0f}\n"
-                response += f"   • Statut: {campaign['status']}\n\n"
-        
-        elif language == 'ar':
-            response = "📉 **أسوأ الحملات أداءً** :\n\n"
-            for i, campaign in enumerate(campaigns, 1):
-                response += f"{i}. **{campaign['name']}**\n"
-                response += f"   • عائد الاستثمار: {campaign['roi']:.1f}%\n"
-                response += f"   • الإيرادات: ${campaign['revenue']:,.0f}\n"
-                response += f"   • التكلفة: ${campaign['cost']:,.0f}\n"
-                response += f"   • الحالة: {campaign['status']}\n\n"
-        
-        else:
-            response = "📉 **Worst Performing Campaigns** :\n\n"
-            for i, campaign in enumerate(campaigns, 1):
-                response += f"{i}. **{campaign['name']}**\n"
-                response += f"   • ROI: {campaign['roi']:.1f}%\n"
-                response += f"   • Revenue: ${campaign['revenue']:,.0f}\n"
-                response += f"   • Cost: ${campaign['cost']:,.0f}\n"
-                response += f"   • Status: {campaign['status']}\n\n"
-        
-        return response
+        return chat_catalog.render_rows(
+            'worst_campaigns.row', language,
+            ({**campaign, 'index': i} for i, campaign in enumerate(campaigns, 1)),
+            header='worst_campaigns.header',
+        )
 
     def _handle_campaign_question(self, message, language):
-        """Handle campaign questions - try both data sources"""
+        """Handle campaign questions"""
         try:
-            # First try PostgreSQL
-            pg_campaigns = self._get_campaigns_pg()
-            if pg_campaigns:
-                return self._format_campaigns_response(pg_campaigns, language, "PostgreSQL")
-            
-            # Fallback to Odoo
-            odoo_campaigns = self._get_campaigns_odoo()
-            if odoo_campaigns:
-                return self._format_campaigns_response(odoo_campaigns, language, "Odoo")
-            
-            # No data found
-            return {
-                'fr': "Aucune donnée de campagne trouvée. Créez quelques campagnes pour commencer !",
-                'en': "No campaign data found. Create some campaigns to get started!",
-                'ar': "لم يتم العثور على بيانات حملات. أنشئ بعض الحملات للبدء!"
-            }.get(language, "No campaign data found.")
-            
+            return ''.join(self._iter_campaign_question(message, language))
         except Exception as e:
             _logger.error(f"Error in campaign question: {str(e)}")
             return self._get_error_response(language)
 
-    def _get_campaigns_pg(self):
-        """Get campaigns from PostgreSQL"""
-        query = """
-            SELECT name, cost, revenue, conversions, status,
-                   CASE WHEN cost > 0 THEN ((revenue - cost) / cost) * 100 ELSE 0 END as roi
-            FROM marketing_data 
-            ORDER BY roi DESC 
-            LIMIT 5
-        """
-        return self._query_marketing_data(query)
-
-    def _get_campaigns_odoo(self):
-        """Get campaigns from Odoo"""
-        try:
-            campaigns = self.env['marketing.data'].search([], order='roi desc', limit=5)
-            return [{
-                'name': c.name,
-                'cost': c.cost,
-                'revenue': c.revenue,
-                'conversions': c.conversions,
-                'status': c.status,
-                'roi': c.roi
-            } for c in campaigns]
-        except:
-            return None
+    def _iter_campaign_question(self, message, language):
+        """Yield the campaign answer header first, then one chunk per campaign"""
+        repository = self._campaign_repository()
+        filters = self._question_filters(message, repository)
+        campaigns = repository.top_n('best_roi', filters.limit or 5, filters)
+        scope = self._render_filters(filters, language)
+        if scope:
+            yield scope
+        if campaigns:
+            yield from self._iter_campaigns_response(campaigns, language, repository.source)
+            return
+        
+        # No data found
+        yield chat_catalog.render('campaigns.empty', language)
 
     def _format_campaigns_response(self, campaigns, language, source):
         """Format campaigns response"""
-        if language == 'fr':
-            response = f"📊 **Vos Meilleures Campagnes** ({source}):\n\n"
-            for i, campaign in enumerate(campaigns, 1):
-                response += f"{i}. **{campaign['name']}**\n"
-                response += f"   💰 ROI: {campaign['roi']:.1f}%\n"
-                response += f"   💵 Revenus: ${campaign['revenue']:,.0f}\n"
-                response += f"   🎯 Conversions: {campaign['conversions']}\n"
-                response += f"   📊 Statut: {campaign['status']}\n\n"
-        elif language == 'ar':
-            response = f"📊 **أفضل حملاتك** ({source}):\n\n"
-            for i, campaign in enumerate(campaigns, 1):
-                response += f"{i}. **{campaign['name']}**\n"
-                response += f"   💰 عائد الاستثمار: {campaign['roi']:.1f}%\n"
-                response += f"   💵 الإيرادات: ${campaign['revenue']:,.0f}\n"
-                response += f"   🎯 التحويلات: {campaign['conversions']}\n"
-                response += f"   📊 الحالة: {campaign['status']}\n\n"
-        else:
-            response = f"📊 **Your Top Campaigns** ({source}):\n\n"
-            for i, campaign in enumerate(campaigns, 1):
-                response += f"{i}. **{campaign['name']}**\n"
-                response += f"   💰 ROI: {campaign['roi']:.1f}%\n"
-                response += f"   💵 Revenue: ${campaign['revenue']:,.0f}\n"
-                response += f"   🎯 Conversions: {campaign['conversions']}\n"
-                response += f"   📊 Status: {campaign['status']}\n\n"
-        
-        return response
+        return ''.join(self._iter_campaigns_response(campaigns, language, source))
+
+    def _iter_campaigns_response(self, campaigns, language, source):
+        yield chat_catalog.render('campaigns.header', language, {'source': source})
+        row = chat_catalog.template('campaigns.row', language)
+        for i, campaign in enumerate(campaigns, 1):
+            yield row.render({**campaign, 'index': i})
 
     def _handle_roi_question(self, message, language):
         """Handle ROI questions"""
-        try:
-            chat_assistant = self.env['chat.assistant']
-            response = chat_assistant._get_roi_analysis()
-            return self._format_response_by_language(response, language)
-        except:
-            return self._handle_roi_pg(language)
-
-    def _handle_roi_pg(self, language):
-        """Handle ROI using PostgreSQL data"""
-        query = """
-            SELECT 
-                AVG(CASE WHEN cost > 0 THEN ((revenue - cost) / cost) * 100 ELSE 0 END) as avg_roi,
-                COUNT(*) as total_campaigns,
-                COUNT(CASE WHEN ((revenue - cost) / cost) * 100 > 100 THEN 1 END) as profitable_campaigns,
-                MAX(CASE WHEN cost > 0 THEN ((revenue - cost) / cost) * 100 ELSE 0 END) as best_roi,
-                MIN(CASE WHEN cost > 0 THEN ((revenue - cost) / cost) * 100 ELSE 0 END) as worst_roi,
-                SUM(revenue) as total_revenue,
-                SUM(cost) as total_cost
-            FROM marketing_data
-        """
-        
-        data = self._query_marketing_data(query)
-        if not data or not data[0]:
-            return {
-                'fr': "Aucune donnée de ROI disponible.",
-                'en': "No ROI data available.",
-                'ar': "لا توجد بيانات عائد استثمار متاحة."
-            }.get(language, "No ROI data available.")
+        repository = self._campaign_repository()
+        filters = self._question_filters(message, repository)
+        return self._render_filters(filters, language) + self._render_roi(repository.totals(filters), language)
+
+    def _render_roi(self, stats, language):
+        if not stats or not stats['total_campaigns']:
+            return chat_catalog.render('roi.empty', language)
         
-        stats = data[0]
         overall_roi = ((stats['total_revenue'] - stats['total_cost']) / stats['total_cost']) * 100 if stats['total_cost'] > 0 else 0
         
-        if language == 'fr':
-            response = f"💰 **Analyse du ROI** :\n\n"
-            response += f"📊 ROI moyen: **{stats['avg_roi']:.1f}%**\n"
-            response += f"🎯 Campagnes rentables: **{stats['profitable_campaigns']}/{stats['total_campaigns']}**\n"
-            response += f"🏆 Meilleur ROI: **{stats['best_roi']:.1f}%**\n"
-            response += f"📉 Plus faible ROI: **{stats['worst_roi']:.1f}%**\n"
-            response += f"📈 ROI global: **{overall_roi:.1f}%**\n\n"
-            
-            if overall_roi > 150:
-                response += "🚀 **Exceptionnel !** Vos campagnes génèrent des profits extraordinaires !"
-            elif overall_roi > 100:
-                response += "✅ **Excellent !** Vos campagnes sont très rentables."
-            elif overall_roi > 50:
-                response += "👍 **Bon !** Performance solide, vous pouvez optimiser davantage."
-            else:
-                response += "⚠️ **Attention !** Le ROI pourrait être amélioré."
-        
-        elif language == 'ar':
-            response = f"💰 **تحليل عائد الاستثمار** :\n\n"
-            response += f"📊 متوسط عائد الاستثمار: **{stats['avg_roi']:.1f}%**\n"
-            response += f"🎯 حملات مربحة: **{stats['profitable_campaigns']}/{stats['total_campaigns']}**\n"
-            response += f"🏆 أفضل عائد: **{stats['best_roi']:.1f}%**\n"
-            response += f"📉 أقل عائد: **{stats['worst_roi']:.1f}%**\n"
-            response += f"📈 العائد الإجمالي: **{overall_roi:.1f}%**\n\n"
-            
-            if overall_roi > 150:
-                response += "🚀 **استثنائي !** حملاتك تحقق أرباحاً مذهلة !"
-            elif overall_roi > 100:
-                response += "✅ **ممتاز !** حملاتك مربحة جداً."
-            elif overall_roi > 50:
-                response += "👍 **جيد !** أداء قوي، يمكنك التحسين أكثر."
-            else:
-                response += "⚠️ **تنبيه !** عائد الاستثمار يحتاج تحسين."
-        
+        if overall_roi > 150:
+            verdict = 'roi.outstanding'
+        elif overall_roi > 100:
+            verdict = 'roi.excellent'
+        elif overall_roi > 50:
+            verdict = 'roi.good'
         else:
-            response = f"💰 **ROI Analysis** :\n\n"
-            response += f"📊 Average ROI: **{stats['avg_roi']:.1f}%**\n"
-            response += f"🎯 Profitable campaigns: **{stats['profitable_campaigns']}/{stats['total_campaigns']}**\n"
-            response += f"🏆 Best ROI: **{stats['best_roi']:.1f}%**\n"
-            response += f"📉 Worst ROI: **{stats['worst_roi']:.1f}%**\n"
-            response += f"📈 Overall ROI: **{overall_roi:.1f}%**\n\n"
-            
-            if overall_roi > 150:
-                response += "🚀 **Outstanding!** Your campaigns are generating exceptional profits!"
-            elif overall_roi > 100:
-                response += "✅ **Excellent!** Your campaigns are highly profitable."
-            elif overall_roi > 50:
-                response += "👍 **Good!** Solid performance, room for optimization."
-            else:
-                response += "⚠️ **Attention!** ROI could be improved."
+            verdict = 'roi.attention'
         
-        return response
+        return (chat_catalog.render('roi.report', language, {**stats, 'overall_roi': overall_roi})
+                + chat_catalog.render(verdict, language))
 
     def _handle_conversion_question(self, message, language):
         """Handle conversion questions"""
-        try:
-            chat_assistant = self.env['chat.assistant']
-            response = chat_assistant._get_conversion_analysis()
-            return self._format_response_by_language(response, language)
-        except:
-            return self._handle_conversion_pg(language)
-
-    def _handle_conversion_pg(self, language):
-        """Handle conversion using PostgreSQL data"""
-        query = """
-            SELECT 
-                name,
-                conversions,
-                cost,
-                revenue,
-                CASE WHEN cost > 0 THEN (conversions::float / cost) * 100 ELSE 0 END as conversion_rate
-            FROM marketing_data 
-            WHERE status = 'active' AND cost > 0
-            ORDER BY conversion_rate DESC
-            LIMIT 5
-        """
-        
-        data = self._query_marketing_data(query)
+        repository = self._campaign_repository()
+        filters = self._question_filters(message, repository)
+        data = repository.top_n('active_conversion_rate', filters.limit or 5, filters)
+        return self._render_filters(filters, language) + self._render_conversion(data, language, filters.limit or 3)
+
+    def _render_conversion(self, data, language, count=3):
         if not data:
-            return {
-                'fr': "Aucune donnée de conversion disponible.",
-                'en': "No conversion data available.",
-                'ar': "لا توجد بيانات تحويل متاحة."
-            }.get(language, "No conversion data available.")
+            return chat_catalog.render('conversion.empty', language)
         
         total_conversions = sum(d['conversions'] for d in data)
         avg_rate = sum(d['conversion_rate'] for d in data) / len(data) if data else 0
         
-        if language == 'fr':
-            response = f"🎯 **Analyse des Conversions** :\n\n"
-            response += f"📈 Total des conversions: **{total_conversions:,}**\n"
-            response += f"📊 Taux de conversion moyen: **{avg_rate:.2f}%**\n\n"
-            response += f"🏆 **Top performers** :\n"
-            
-            for i, campaign in enumerate(data[:3], 1):
-                response += f"{i}. **{campaign['name']}**\n"
-                response += f"   • {campaign['conversions']} conversions\n"
-                response += f"   • Taux: {campaign['conversion_rate']:.2f}%\n\n"
-        
-        elif language == 'ar':
-            response = f"🎯 **تحليل التحويلات** :\n\n"
-            response += f"📈 إجمالي التحويلات: **{total_conversions:,}**\n"
-            response += f"📊 متوسط معدل التحويل: **{avg_rate:.2f}%**\n\n"
-            response += f"🏆 **الأفضل أداءً** :\n"
-            
-            for i, campaign in enumerate(data[:3], 1):
-                response += f"{i}. **{campaign['name']}**\n"
-                response += f"   • {campaign['conversions']} تحويل\n"
-                response += f"   • المعدل: {campaign['conversion_rate']:.2f}%\n\n"
-        
-        else:
-            response = f"🎯 **Conversion Analysis** :\n\n"
-            response += f"📈 Total conversions: **{total_conversions:,}**\n"
-            response += f"📊 Average conversion rate: **{avg_rate:.2f}%**\n\n"
-            response += f"🏆 **Top performers** :\n"
-            
-            for i, campaign in enumerate(data[:3], 1):
-                response += f"{i}. **{campaign['name']}**\n"
-                response += f"   • {campaign['conversions']} conversions\n"
-                response += f"   • Rate: {campaign['conversion_rate']:.2f}%\n\n"
-        
-        return response
+        return chat_catalog.render_rows(
+            'conversion.row', language,
+            ({**campaign, 'index': i} for i, campaign in enumerate(data[:count], 1)),
+            header='conversion.header',
+            values={'total_conversions': total_conversions, 'avg_rate': avg_rate},
+        )
 
     def _handle_performance_question(self, message, language):
         """Handle performance questions"""
-        try:
-            chat_assistant = self.env['chat.assistant']
-            response = chat_assistant._get_campaign_report()
-            return self._format_response_by_language(response, language)
-        except:
-            return self._handle_performance_pg(language)
-
-    def _handle_performance_pg(self, language):
-        """Handle performance using PostgreSQL data"""
-        query = """
-            SELECT 
-                status,
-                COUNT(*) as campaign_count,
-                AVG(CASE WHEN cost > 0 THEN ((revenue - cost) / cost) * 100 ELSE 0 END) as avg_roi,
-                SUM(revenue) as total_revenue,
-                SUM(cost) as total_cost,
-                SUM(conversions) as total_conversions
-            FROM marketing_data 
-            GROUP BY status
-            ORDER BY avg_roi DESC
-        """
-        
-        data = self._query_marketing_data(query)
+        return ''.join(self._iter_performance_question(message, language))
+
+    def _iter_performance_question(self, message, language):
+        """Yield the performance report header, then one chunk per status"""
+        repository = self._campaign_repository()
+        filters = self._question_filters(message, repository)
+        scope = self._render_filters(filters, language)
+        if scope:
+            yield scope
+        yield from self._iter_performance(repository.group_by_status(filters), language)
+
+    def _iter_performance(self, data, language):
         if not data:
-            return {
-                'fr': "Aucune donnée de performance disponible.",
-                'en': "No performance data available.",
-                'ar': "لا توجد بيانات أداء متاحة."
-            }.get(language, "No performance data available.")
-        
-        if language == 'fr':
-            response = f"📊 **Rapport de Performance des Campagnes** :\n\n"
-            status_map = {'active': 'Actives', 'paused': 'En pause', 'completed': 'Terminées'}
-            for status_data in data:
-                status = status_map.get(status_data['status'], status_data['status'])
-                response += f"🔴 **Campagnes {status}** :\n"
-                response += f"   • Nombre: {status_data['campaign_count']}\n"
-                response += f"   • ROI moyen: {status_data['avg_roi']:.1f}%\n"
-                response += f"   • Revenus: ${status_data['total_revenue']:,.0f}\n"
-                response += f"   • Conversions: {status_data['total_conversions']:,}\n\n"
-        
-        elif language == 'ar':
-            response = f"📊 **تقرير أداء الحملات** :\n\n"
-            status_map = {'active': 'نشطة', 'paused': 'متوقفة', 'completed': 'مكتملة'}
-            for status_data in data:
-                status = status_map.get(status_data['status'], status_data['status'])
-                response += f"🔴 **الحملات ال{status}** :\n"
-                response += f"   • العدد: {status_data['campaign_count']}\n"
-                response += f"   • متوسط عائد الاستثمار: {status_data['avg_roi']:.1f}%\n"
-                response += f"   • الإيرادات: ${status_data['total_revenue']:,.0f}\n"
-                response += f"   • التحويلات: {status_data['total_conversions']:,}\n\n"
+            yield chat_catalog.render('performance.empty', language)
+            return
         
-        else:
-            response = f"📊 **Campaign Performance Report** :\n\n"
-            for status_data in data:
-                status = status_data['status'].title()
-                response += f"🔴 **{status} Campaigns** :\n"
-                response += f"   • Count: {status_data['campaign_count']}\n"
-                response += f"   • Avg ROI: {status_data['avg_roi']:.1f}%\n"
-                response += f"   • Revenue: ${status_data['total_revenue']:,.0f}\n"
-                response += f"   • Conversions: {status_data['total_conversions']:,}\n\n"
-        
-        return response
+        yield chat_catalog.render('performance.header', language)
+        row = chat_catalog.template('performance.row', language)
+        status_labels = STATUS_LABELS.get(language)
+        for status_data in data:
+            status = status_data['status']
+            label = status_labels.get(status, status) if status_labels else status.title()
+            yield row.render({**status_data, 'status_label': label})
 
     def _handle_budget_question(self, message, language):
         """Handle budget questions"""
-        query = """
-            SELECT 
-                name, cost, revenue,
-                CASE WHEN cost > 0 THEN ((revenue - cost) / cost) * 100 ELSE 0 END as roi,
-                conversions,
-                status
-            FROM marketing_data 
-            WHERE status = 'active'
-            ORDER BY cost DESC
-            LIMIT 5
-        """
-        
-        data = self._query_marketing_data(query)
+        repository = self._campaign_repository()
+        filters = self._question_filters(message, repository)
+        data = repository.top_n('active_cost', filters.limit or 5, filters)
+        return self._render_filters(filters, language) + self._render_budget(data, language, filters.limit or 3)
+
+    def _render_budget(self, data, language, count=3):
         if not data:
-            return {
-                'fr': "Aucune donnée de budget disponible.",
-                'en': "No budget data available.",
-                'ar': "لا توجد بيانات ميزانية متاحة."
-            }.get(language, "No budget data available.")
+            return chat_catalog.render('budget.empty', language)
         
         total_cost = sum(d['cost'] for d in data)
         total_revenue = sum(d['revenue'] for d in data)
+        efficiency = (total_revenue - total_cost) / total_cost * 100 if total_cost else 0
         
-        if language == 'fr':
-            response = f"💰 **Analyse du Budget** :\n\n"
-            response += f"📊 Budget total actif: **${total_cost:,.0f}**\n"
-            response += f"💵 Revenus générés: **${total_revenue:,.0f}**\n"
-            response += f"📈 Efficacité globale: **{((total_revenue - total_cost) / total_cost * 100):.1f}% ROI**\n\n"
-            response += f"🏆 **Campagnes à plus gros budget** :\n"
-            
-            for i, campaign in enumerate(data[:3], 1):
-                response += f"{i}. **{campaign['name']}**\n"
-                response += f"   • Budget: ${campaign['cost']:,.0f}\n"
-                response += f"   • Revenus: ${campaign['revenue']:,.0f}\n"
-                response += f"   • ROI: {campaign['roi']:.1f}%\n\n"
-        
-        elif language == 'ar':
-            response = f"💰 **تحليل الميزانية** :\n\n"
-            response += f"📊 إجمالي الميزانية النشطة: **${total_cost:,.0f}**\n"
-            response += f"💵 الإيرادات المحققة: **${total_revenue:,.0f}**\n"
-            response += f"📈 الكفاءة الإجمالية: **{((total_revenue - total_cost) / total_cost * 100):.1f}% عائد استثمار**\n\n"
-            response += f"🏆 **الحملات الأعلى ميزانية** :\n"
-            
-            for i, campaign in enumerate(data[:3], 1):
-                response += f"{i}. **{campaign['name']}**\n"
-                response += f"   • الميزانية: ${campaign['cost']:,.0f}\n"
-                response += f"   • الإيرادات: ${campaign['revenue']:,.0f}\n"
-                response += f"   • عائد الاستثمار: {campaign['roi']:.1f}%\n\n"
-        
-        else:
-            response = f"💰 **Budget Analysis** :\n\n"
-            response += f"📊 Total active budget: **${total_cost:,.0f}**\n"
-            response += f"💵 Revenue generated: **${total_revenue:,.0f}**\n"
-            response += f"📈 Overall efficiency: **{((total_revenue - total_cost) / total_cost * 100):.1f}% ROI**\n\n"
-            response += f"🏆 **Highest budget campaigns** :\n"
-            
-            for i, campaign in enumerate(data[:3], 1):
-                response += f"{i}. **{campaign['name']}**\n"
-                response += f"   • Budget: ${campaign['cost']:,.0f}\n"
-                response += f"   • Revenue: ${campaign['revenue']:,.0f}\n"
-                response += f"   • ROI: {campaign['roi']:.1f}%\n\n"
-        
-        return response
+        return chat_catalog.render_rows(
+            'budget.row', language,
+            ({**campaign, 'index': i} for i, campaign in enumerate(data[:count], 1)),
+            header='budget.header',
+            values={'total_cost': total_cost, 'total_revenue': total_revenue, 'efficiency': efficiency},
+        )
 
     def _handle_help_question(self, message, language):
         """Handle help questions"""
@@ -843,7 +627,7 @@ class AIMarketingService(models.Model):
                 }
                 
                 return responses.get(language, responses['en'])
-        except:
+        except (ValueError, OverflowError):
             pass
         
         responses = {
@@ -926,52 +710,6 @@ class AIMarketingService(models.Model):
         
         return responses.get(language, responses['en'])
 
-    def _format_response_by_language(self, odoo_response, language):
-        """Format Odoo response according to language"""
-        if not odoo_response:
-            return self._get_error_response(language)
-            
-        if language == 'fr':
-            # French translations
-            response = odoo_response.replace("Best Performing Channel", "🏆 Meilleur Canal de Performance")
-            response = response.replace("Average ROI", "ROI Moyen")
-            response = response.replace("Worst Performing Campaigns", "📉 Campagnes les Moins Performantes")
-            response = response.replace("Conversion Analysis", "🎯 Analyse des Conversions")
-            response = response.replace("Total Conversions", "Total des Conversions")
-            response = response.replace("Total Cost", "Coût Total")
-            response = response.replace("Average Conversion Rate", "Taux de Conversion Moyen")
-            response = response.replace("ROI Analysis", "💰 Analyse du ROI")
-            response = response.replace("Total Revenue", "Chiffre d'Affaires Total")
-            response = response.replace("Overall ROI", "ROI Global")
-            response = response.replace("Average Campaign ROI", "ROI Moyen des Campagnes")
-            response = response.replace("Campaign Performance Report", "📊 Rapport de Performance des Campagnes")
-            return response
-            
-        elif language == 'ar':
-            # Arabic translations
-            response = odoo_response.replace("Best Performing Channel", "🏆 أفضل قناة أداء")
-            response = response.replace("Average ROI", "متوسط عائد الاستثمار")
-            response = response.replace("Worst Performing Campaigns", "📉 أسوأ الحملات أداءً")
-            response = response.replace("Conversion Analysis", "🎯 تحليل التحويلات")
-            response = response.replace("Total Conversions", "إجمالي التحويلات")
-            response = response.replace("Total Cost", "التكلفة الإجمالية")
-            response = response.replace("Average Conversion Rate", "متوسط معدل التحويل")
-            response = response.replace("ROI Analysis", "💰 تحليل عائد الاستثمار")
-            response = response.replace("Total Revenue", "إجمالي الإيرادات")
-            response = response.replace("Overall ROI", "عائد الاستثمار الإجمالي")
-            response = response.replace("Average Campaign ROI", "متوسط عائد استثمار الحملات")
-            response = response.replace("Campaign Performance Report", "📊 تقرير أداء الحملات")
-            return response
-            
-        else:
-            # Add emojis to English responses
-            response = odoo_response.replace("Best Performing Channel", "🏆 Best Performing Channel")
-            response = response.replace("Worst Performing Campaigns", "📉 Worst Performing Campaigns")
-            response = response.replace("Conversion Analysis", "🎯 Conversion Analysis")
-            response = response.replace("ROI Analysis", "💰 ROI Analysis")
-            response = response.replace("Campaign Performance Report", "📊 Campaign Performance Report")
-            return response
-
     def _get_error_response(self, language):
         """Get error response"""
         error_messages = {
@@ -979,4 +717,7 @@ class AIMarketingService(models.Model):
             'en': "Sorry, I encountered a technical difficulty. Could you rephrase your question?",
             'ar': "آسف، واجهت صعوبة تقنية. هل يمكنك إعادة صياغة سؤالك؟"
         }
-        return error_messages.get(language, error_messages['en'])
\ No newline at end of file
+        return error_messages.get(language, error_messages['en'])
+
+
+instrument_methods(AIMarketingService, '_handle_')
@@ -1,20 +1,65 @@
-from odoo import models, fields, api
+from odoo import models, fields, api, SUPERUSER_ID
+from odoo.modules.registry import Registry
+from odoo.tools.sql import create_index
 from datetime import datetime, timedelta
 import json
+import logging
+import uuid
+
+from ..tools.chat_log import get_chat_log
+
+# Days a conversation stays in chat.assistant before being compacted
+CHAT_ARCHIVE_DAYS = 30
+# Days compacted conversations are kept before being deleted
+CHAT_RETENTION_DAYS = 365
+# Rows archived or deleted per transaction
+CHAT_HISTORY_CHUNK = 5000
+# Chunks handled per cron run before rescheduling
+CHAT_HISTORY_MAX_CHUNKS = 20
+
+_logger = logging.getLogger(__name__)
+
+
+def _write_chat_log(dbname, values_list):
+    """Insert a batch of buffered conversations in their own transaction"""
+    with Registry(dbname).cursor() as cr:
+        env = api.Environment(cr, SUPERUSER_ID, {})
+        env['chat.assistant'].create(values_list)
+
 
 class ChatAssistant(models.Model):
     _name = 'chat.assistant'
     _description = 'Marketing Chat Assistant'
+    _order = 'session_date desc, id desc'
 
-    name = fields.Char('Session ID')
+    name = fields.Char('Session ID', index=True)
     user_input = fields.Text('User Question')
     ai_response = fields.Text('AI Response')
-    session_date = fields.Datetime('Session Date', default=fields.Datetime.now)
+    session_date = fields.Datetime('Session Date', default=fields.Datetime.now, index=True)
     user_id = fields.Many2one('res.users', 'User', default=lambda self: self.env.user)
 
+    def init(self):
+        # Per-user history, newest first
+        create_index(self.env.cr, 'chat_assistant_user_id_session_date_index',
+                     self._table, ['user_id', 'session_date DESC'])
+
     @api.model
-    def process_query(self, query):
-        """Process user query and return AI response"""
+    def new_session_id(self):
+        """Opaque identifier grouping the exchanges of one conversation.
+
+        Callers create it once when a conversation starts (see the
+        /ai_marketing_assistant/chat_session route) and pass it with every
+        query of that conversation.
+        """
+        return uuid.uuid4().hex
+
+    @api.model
+    def process_query(self, query, session_id=None):
+        """Process user query and return AI response, logged under ``session_id``.
+
+        Without ``session_id`` the exchange starts a conversation of its own.
+        """
+        session_id = session_id or self.new_session_id()
         query_lower = query.lower()
         response = ""
 
@@ -31,47 +76,100 @@ class ChatAssistant(models.Model):
         else:
             response = "I can help you with:\n- Best performing channels\n- Campaign performance reports\n- Conversion rate analysis\n- ROI analysis\n- Low performing campaigns\n\nPlease ask me a specific question about your marketing data."
 
-        # Save the conversation
-        self.create({
-            'name': f"Session_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+        # Save the conversation (buffered, written in batches off the request)
+        self._log_exchange(query, response, session_id)
+
+        return response
+
+    @api.model
+    def _log_exchange(self, query, response, session_id):
+        """Queue one exchange for the background chat log writer"""
+        get_chat_log(_write_chat_log).append(self.env.cr.dbname, {
+            'name': session_id,
             'user_input': query,
-            'ai_response': response
+            'ai_response': response,
+            'session_date': fields.Datetime.now(),
+            'user_id': self.env.uid,
         })
 
-        return response
+    @api.model
+    def _cron_chat_history(self):
+        """Compact old conversations, then delete archives past retention"""
+        get_param = self.env['ir.config_parameter'].sudo().get_param
+        archive_days = int(get_param('ai_marketing_assistant.chat_archive_days', CHAT_ARCHIVE_DAYS))
+        retention_days = int(get_param('ai_marketing_assistant.chat_retention_days', CHAT_RETENTION_DAYS))
+        now = fields.Datetime.now()
+
+        done = self._archive_chat_history(now - timedelta(days=archive_days))
+        if done:
+            done = self._purge_chat_archives(now - timedelta(days=retention_days))
+        if not done:
+            # More work left: run again as soon as possible instead of tomorrow
+            self.env.ref('ai_marketing_assistant.ir_cron_chat_history')._trigger()
+
+    @api.model
+    def _archive_chat_history(self, cutoff, chunk=CHAT_HISTORY_CHUNK, max_chunks=CHAT_HISTORY_MAX_CHUNKS):
+        """Move exchanges older than ``cutoff`` into compressed archives.
+
+        Works in chunks committed one by one so a large backlog never holds
+        locks for long; returns False when rows are left for the next run.
+        """
+        Archive = self.env['chat.assistant.archive'].sudo()
+        self.flush_model()
+        for _i in range(max_chunks):
+            self.env.cr.execute("""
+                SELECT id, name, user_id, session_date, user_input, ai_response
+                FROM chat_assistant
+                WHERE session_date < %s
+                ORDER BY session_date, id
+                LIMIT %s
+            """, (cutoff, chunk))
+            rows = self.env.cr.dictfetchall()
+            if not rows:
+                return True
+            Archive._archive_rows(rows)
+            self.env.cr.execute("DELETE FROM chat_assistant WHERE id = ANY(%s)", ([row['id'] for row in rows],))
+            self.invalidate_model()
+            self.env.cr.commit()
+            _logger.info(f"Archived {len(rows)} chat exchanges older than {cutoff}")
+            if len(rows) < chunk:
+                return True
+        return False
+
+    @api.model
+    def _purge_chat_archives(self, cutoff, chunk=CHAT_HISTORY_CHUNK, max_chunks=CHAT_HISTORY_MAX_CHUNKS):
+        """Delete archives older than ``cutoff`` in chunks; False if some are left"""
+        for _i in range(max_chunks):
+            self.env.cr.execute("""
+                DELETE FROM chat_assistant_archive
+                WHERE id IN (
+                    SELECT id FROM chat_assistant_archive WHERE day < %s LIMIT %s
+                )
+            """, (cutoff.date(), chunk))
+            deleted = self.env.cr.rowcount
+            self.env['chat.assistant.archive'].invalidate_model()
+            self.env.cr.commit()
+            if deleted < chunk:
+                return True
+        return False
+
+    @api.model
+    def flush_chat_log(self):
+        """Write the conversations still buffered in this process"""
+        get_chat_log(_write_chat_log).flush(self.env.cr.dbname)
 
     def _get_best_channel(self):
         """Get best performing channel"""
-        campaigns = self.env['marketing.data'].search([])
+        groups = self.env['marketing.data']._read_group(
+            [], groupby=['channel_id'], aggregates=['roi:avg'],
+            order='roi:avg desc', limit=1,
+        )
         
-        if not campaigns:
+        if not groups:
             return "No marketing data available for analysis."
 
-        # Group by channel and calculate average ROI
-        channel_performance = {}
-        for campaign in campaigns:
-            channel = campaign.channel_id.name
-            if channel not in channel_performance:
-                channel_performance[channel] = {
-                    'total_roi': 0,
-                    'count': 0,
-                    'total_conversion_rate': 0
-                }
-            channel_performance[channel]['total_roi'] += campaign.roi
-            channel_performance[channel]['total_conversion_rate'] += campaign.conversion_rate
-            channel_performance[channel]['count'] += 1
-
-        # Find best channel
-        best_channel = None
-        best_avg_roi = -float('inf')
-        
-        for channel, data in channel_performance.items():
-            avg_roi = data['total_roi'] / data['count']
-            if avg_roi > best_avg_roi:
-                best_avg_roi = avg_roi
-                best_channel = channel
-
-        return f"📊 Best Performing Channel: {best_channel}\nAverage ROI: {best_avg_roi:.2f}%"
+        best_channel, best_avg_roi = groups[0]
+        return f"📊 Best Performing Channel: {best_channel.name}\nAverage ROI: {best_avg_roi:.2f}%"
 
     def _get_worst_campaigns(self):
         """Get worst performing campaigns"""
@@ -88,28 +186,25 @@ class ChatAssistant(models.Model):
 
     def _get_conversion_analysis(self):
         """Get conversion rate analysis"""
-        campaigns = self.env['marketing.data'].search([])
+        [(count, total_conversions, total_cost, avg_conversion_rate)] = self.env['marketing.data']._read_group(
+            [], aggregates=['__count', 'conversions:sum', 'cost:sum', 'conversion_rate:avg'],
+        )
         
-        if not campaigns:
+        if not count:
             return "No marketing data available."
 
-        total_conversions = sum(campaign.conversions for campaign in campaigns)
-        total_cost = sum(campaign.cost for campaign in campaigns)
-        avg_conversion_rate = sum(campaign.conversion_rate for campaign in campaigns) / len(campaigns)
-
         return f"🎯 Conversion Analysis:\nTotal Conversions: {total_conversions}\nTotal Cost: ${total_cost:.2f}\nAverage Conversion Rate: {avg_conversion_rate:.2f}%"
 
     def _get_roi_analysis(self):
         """Get ROI analysis"""
-        campaigns = self.env['marketing.data'].search([])
+        [(count, total_revenue, total_cost, avg_roi)] = self.env['marketing.data']._read_group(
+            [], aggregates=['__count', 'revenue:sum', 'cost:sum', 'roi:avg'],
+        )
         
-        if not campaigns:
+        if not count:
             return "No marketing data available."
 
-        total_revenue = sum(campaign.revenue for campaign in campaigns)
-        total_cost = sum(campaign.cost for campaign in campaigns)
         total_roi = ((total_revenue - total_cost) / total_cost) * 100 if total_cost > 0 else 0
-        avg_roi = sum(campaign.roi for campaign in campaigns) / len(campaigns)
 
         return f"💰 ROI Analysis:\nTotal Revenue: ${total_revenue:.2f}\nTotal Cost: ${total_cost:.2f}\nOverall ROI: {total_roi:.2f}%\nAverage Campaign ROI: {avg_roi:.2f}%"
 
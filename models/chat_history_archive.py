@@ -0,0 +1,51 @@
+from odoo import models, fields, api
+import base64
+import json
+import zlib
+
+
+class ChatHistoryArchive(models.Model):
+    _name = 'chat.assistant.archive'
+    _description = 'Archived Chat Sessions'
+    _order = 'period_end desc, id desc'
+
+    user_id = fields.Many2one('res.users', 'User', index=True, ondelete='cascade')
+    day = fields.Date('Day', required=True, index=True)
+    period_start = fields.Datetime('First Exchange')
+    period_end = fields.Datetime('Last Exchange')
+    exchange_count = fields.Integer('Exchanges')
+    data = fields.Binary('Compressed Exchanges', attachment=False)
+
+    @api.model
+    def _pack(self, exchanges):
+        """zlib-compressed JSON of a list of exchange dicts"""
+        payload = json.dumps(exchanges, ensure_ascii=False, default=str).encode()
+        return base64.b64encode(zlib.compress(payload, 9))
+
+    def _unpack(self):
+        """Exchanges stored in this archive, oldest first"""
+        self.ensure_one()
+        if not self.data:
+            return []
+        return json.loads(zlib.decompress(base64.b64decode(self.data)))
+
+    @api.model
+    def _archive_rows(self, rows):
+        """Compact raw chat.assistant rows into one archive per user and day"""
+        by_day = {}
+        for row in rows:
+            exchange = {
+                'session': row['name'],
+                'date': row['session_date'],
+                'question': row['user_input'],
+                'response': row['ai_response'],
+            }
+            by_day.setdefault((row['user_id'], row['session_date'].date()), []).append(exchange)
+        return self.create([{
+            'user_id': user_id,
+            'day': day,
+            'period_start': exchanges[0]['date'],
+            'period_end': exchanges[-1]['date'],
+            'exchange_count': len(exchanges),
+            'data': self._pack(exchanges),
+        } for (user_id, day), exchanges in by_day.items()])
@@ -3,6 +3,20 @@ import logging
 import psycopg2
 from psycopg2.extras import RealDictCursor
 import json
+import random
+
+from ..tools.pg_pool import marketing_connection, pool_settings
+from ..tools.connection_probe import format_attempts, probe_profiles
+from ..tools.query_cache import invalidate_marketing_cache
+from ..tools.marketing_summary import ensure_summary, read_summary_stats
+from ..tools.marketing_indexes import advise, ensure_indexes
+from ..tools.sample_data import MARKETING_DATA_TABLE_SQL, load_sample_data
+
+# Largest sample loaded while the user waits; bigger ones are queued for the
+# sample data cron, whose worker is bound by limit_time_real_cron instead
+SYNC_SAMPLE_SIZE = 100000
+# "count,seed" of the load waiting for the sample data cron
+SAMPLE_REQUEST_PARAM = 'ai_marketing_assistant.sample_data_request'
 
 _logger = logging.getLogger(__name__)
 
@@ -14,6 +28,14 @@ class DatabaseTest(models.TransientModel):
     connection_status = fields.Text('Connection Status', readonly=True)
     test_results = fields.Text('Test Results', readonly=True)
     last_test_time = fields.Datetime('Last Test', readonly=True)
+    sample_size = fields.Selection([
+        ('1000', '1k campaigns'),
+        ('10000', '10k campaigns'),
+        ('100000', '100k campaigns'),
+        ('1000000', '1M campaigns (background)'),
+        ('10000000', '10M campaigns (background)')
+    ], string='Sample Size', default='1000', required=True)
+    sample_seed = fields.Integer('Sample Seed', default=42, help='The same seed always generates the same campaigns')
 
     def test_connection_wizard(self):
         """Test connection avec retour immédiat"""
@@ -42,36 +64,29 @@ class DatabaseTest(models.TransientModel):
             {'user': 'postgres', 'password': 'postgres', 'desc': 'postgres user (with password)'},
         ]
 
-        for config in connection_configs:
+        connect_params = pool_settings()['connect_params']
+        timeout = connect_params['connect_timeout']
+        _logger.info(f"Testing {len(connection_configs)} connection profiles (timeout {timeout}s)...")
+
+        # Toutes les configurations sont testées en parallèle, la première qui répond gagne
+        connection, config, attempts = probe_profiles(connection_configs, connect_params, timeout)
+        attempts_report = "Connection attempts:\n" + format_attempts(attempts)
+
+        if connection is not None:
             try:
-                connection_params = {
-                    'host': 'localhost',
-                    'database': 'ai_marketing',
-                    'user': config['user'],
-                    'password': config['password'],
-                    'port': '5432'
-                }
-                
-                _logger.info(f"Testing connection with {config['desc']}...")
-                
-                # Test de connexion
-                connection = psycopg2.connect(**connection_params)
-                
-                # Si on arrive ici, la connexion a réussi
                 connection_msg = f"✅ Connection successful with {config['desc']}!\n"
-                connection_msg += f"Host: {connection_params['host']}\n"
-                connection_msg += f"Database: {connection_params['database']}\n"
-                connection_msg += f"User: {connection_params['user']}\n"
-                connection_msg += f"Port: {connection_params['port']}\n"
+                connection_msg += f"Host: {connect_params['host']}\n"
+                connection_msg += f"Database: {connect_params['database']}\n"
+                connection_msg += f"User: {config['user']}\n"
+                connection_msg += f"Port: {connect_params['port']}\n"
                 connection_msg += f"Test Time: {self.last_test_time}"
                 
                 self.connection_status = connection_msg
                 
                 # Test des requêtes
                 results = self._test_database_queries(connection)
-                self.test_results = results
+                self.test_results = f"{attempts_report}\n\n{results}"
                 
-                connection.close()
                 _logger.info("Database connection test completed successfully")
                 
                 # FORCER la sauvegarde immédiate
@@ -86,13 +101,10 @@ class DatabaseTest(models.TransientModel):
                     'target': 'new',
                     'context': {'form_view_initial_mode': 'edit'}
                 }
-                
-            except psycopg2.OperationalError as e:
-                _logger.warning(f"Connection failed with {config['desc']}: {str(e)}")
-                continue  # Essayer la configuration suivante
             except Exception as e:
                 _logger.error(f"Unexpected error with {config['desc']}: {str(e)}")
-                continue
+            finally:
+                connection.close()
 
         # Si on arrive ici, aucune configuration n'a fonctionné
         error_msg = "❌ All connection attempts failed!\n\n"
@@ -107,7 +119,7 @@ class DatabaseTest(models.TransientModel):
         error_msg += f"\nTest Time: {self.last_test_time}"
         
         self.connection_status = error_msg
-        self.test_results = "All connection attempts failed"
+        self.test_results = f"All connection attempts failed\n\n{attempts_report}"
         
         # FORCER la sauvegarde même en cas d'échec
         self.env.cr.commit()
@@ -203,19 +215,11 @@ class DatabaseTest(models.TransientModel):
             # 3. Statistiques générales
             results.append("📊 GENERAL STATISTICS:")
             try:
-                cursor.execute("""
-                    SELECT 
-                        COUNT(*) as total_campaigns,
-                        COUNT(CASE WHEN status = 'active' THEN 1 END) as active_campaigns,
-                        COUNT(CASE WHEN status = 'paused' THEN 1 END) as paused_campaigns,
-                        COUNT(CASE WHEN status = 'completed' THEN 1 END) as completed_campaigns,
-                        COALESCE(SUM(cost), 0) as total_cost,
-                        COALESCE(SUM(revenue), 0) as total_revenue,
-                        COALESCE(SUM(conversions), 0) as total_conversions,
-                        COALESCE(AVG(CASE WHEN cost > 0 THEN ((revenue - cost) / cost) * 100 ELSE 0 END), 0) as avg_roi
-                    FROM marketing_data;
-                """)
-                stats = cursor.fetchone()
+                stats = read_summary_stats(connection)
+                if stats is not None:
+                    results.append("   (from marketing_data_summary)")
+                else:
+                    stats = self._scan_general_statistics(cursor)
                 
                 if stats and stats['total_campaigns'] > 0:
                     results.append(f"   📈 Total Campaigns: {stats['total_campaigns']}")
@@ -232,6 +236,12 @@ class DatabaseTest(models.TransientModel):
             except psycopg2.Error as e:
                 results.append(f"   ❌ Error getting statistics: {str(e)}")
             
+            results.append("")
+            
+            # 4. Index et plans d'exécution des requêtes du chat
+            results.append("🔍 INDEXES & QUERY PLANS:")
+            results.extend(advise(connection))
+            
             cursor.close()
             
         except Exception as e:
@@ -239,35 +249,35 @@ class DatabaseTest(models.TransientModel):
         
         return "\n".join(results)
 
+    def _scan_general_statistics(self, cursor):
+        """Compute the general statistics by scanning marketing_data"""
+        cursor.execute("""
+            SELECT 
+                COUNT(*) as total_campaigns,
+                COUNT(CASE WHEN status = 'active' THEN 1 END) as active_campaigns,
+                COUNT(CASE WHEN status = 'paused' THEN 1 END) as paused_campaigns,
+                COUNT(CASE WHEN status = 'completed' THEN 1 END) as completed_campaigns,
+                COALESCE(SUM(cost), 0) as total_cost,
+                COALESCE(SUM(revenue), 0) as total_revenue,
+                COALESCE(SUM(conversions), 0) as total_conversions,
+                COALESCE(AVG(CASE WHEN cost > 0 THEN ((revenue - cost) / cost) * 100 ELSE 0 END), 0) as avg_roi
+            FROM marketing_data;
+        """)
+        return cursor.fetchone()
+
     def get_sample_data(self):
         """Récupère un échantillon de données pour test"""
         try:
-            connection_params = {
-                'host': 'localhost',
-                'database': 'ai_marketing',
-                'user': 'odoo',
-                'password': 'odoo',
-                'port': '5432'
-            }
-            
-            connection = psycopg2.connect(**connection_params)
-            cursor = connection.cursor(cursor_factory=RealDictCursor)
-            
-            cursor.execute("""
-                SELECT * FROM marketing_data 
-                ORDER BY id DESC 
-                LIMIT 10;
-            """)
-            
-            data = cursor.fetchall()
-            
-            # Convertir en format JSON pour affichage
-            sample_data = []
-            for row in data:
-                sample_data.append(dict(row))
-            
-            cursor.close()
-            connection.close()
+            with marketing_connection() as connection:
+                with connection.cursor(cursor_factory=RealDictCursor) as cursor:
+                    cursor.execute("""
+                        SELECT id, name, cost, revenue, conversions, status,
+                               created_date, channel, campaign_type
+                        FROM marketing_data 
+                        ORDER BY id DESC 
+                        LIMIT 10;
+                    """)
+                    sample_data = cursor.fetchall()
             
             return {
                 'success': True,
@@ -294,78 +304,61 @@ class DatabaseTest(models.TransientModel):
             'test_results': test_record.test_results
         }
 
+    def _create_sample_campaigns(self, connection, count, seed):
+        """Create the marketing_data table and bulk load generated campaigns"""
+        with connection.cursor() as cursor:
+            cursor.execute(MARKETING_DATA_TABLE_SQL)
+        
+        count = load_sample_data(connection, count, seed)
+        # Agrégats maintenus par triggers (marketing_data_summary) : construits une fois
+        # après le premier chargement, les triggers suivent ensuite les rechargements
+        ensure_summary(connection)
+        # Les index existants sont reconstruits par le chargement, seuls les manquants sont créés ici
+        ensure_indexes(connection)
+        return count
+
+    def _queue_sample_data(self, count, seed):
+        """Hand a load too large for a request over to the sample data cron"""
+        self.env['ir.config_parameter'].sudo().set_param(SAMPLE_REQUEST_PARAM, f"{count},{seed}")
+        self.env.ref('ai_marketing_assistant.ir_cron_sample_data').sudo()._trigger()
+        self.connection_status = (f"⏳ Loading {count} sample campaigns (seed {seed}) in the background.\n\n"
+                                  "Run the connection test again once the load is done.")
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': 'Sample Data Queued',
+                'message': f'{count} sample campaigns will be loaded in the background',
+                'type': 'info'
+            }
+        }
+
+    @api.model
+    def _cron_load_sample_data(self):
+        """Load the sample data queued by create_sample_data, if any"""
+        get_param = self.env['ir.config_parameter'].sudo().get_param
+        queued = get_param(SAMPLE_REQUEST_PARAM)
+        if not queued:
+            return
+        # Dequeued first: a load that fails is not retried on every run
+        self.env['ir.config_parameter'].sudo().set_param(SAMPLE_REQUEST_PARAM, False)
+        self.env.cr.commit()
+        count, seed = (int(value) for value in queued.split(','))
+        with marketing_connection() as connection:
+            count = self._create_sample_campaigns(connection, count, seed)
+        invalidate_marketing_cache()
+        _logger.info(f"Loaded {count} sample campaigns (seed {seed}) into ai_marketing")
+
     def create_sample_data(self):
         """Créer des données d'exemple dans la base ai_marketing"""
+        if int(self.sample_size) > SYNC_SAMPLE_SIZE:
+            return self._queue_sample_data(int(self.sample_size), self.sample_seed)
         try:
-            connection_params = {
-                'host': 'localhost',
-                'database': 'ai_marketing',
-                'user': 'odoo',
-                'password': 'odoo',
-                'port': '5432'
-            }
-            
-            connection = psycopg2.connect(**connection_params)
-            cursor = connection.cursor()
-            
-            # 1. Créer la table si elle n'existe pas
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS marketing_data (
-                    id SERIAL PRIMARY KEY,
-                    name VARCHAR(255) NOT NULL,
-                    cost DECIMAL(10,2) DEFAULT 0,
-                    revenue DECIMAL(10,2) DEFAULT 0,
-                    conversions INTEGER DEFAULT 0,
-                    status VARCHAR(50) DEFAULT 'active',
-                    created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    channel VARCHAR(100),
-                    campaign_type VARCHAR(100)
-                );
-            """)
-            
-            # 2. Vider la table existante (optionnel)
-            cursor.execute("DELETE FROM marketing_data;")
+            with marketing_connection() as connection:
+                count = self._create_sample_campaigns(connection, int(self.sample_size), self.sample_seed)
+            invalidate_marketing_cache()
             
-            # 3. Insérer des données d'exemple réalistes
-            sample_campaigns = [
-                ('Google Ads - Electronics', 2500.00, 8500.00, 85, 'active', 'Google Ads', 'Search'),
-                ('Facebook Campaign - Fashion', 1800.00, 5400.00, 54, 'active', 'Facebook', 'Social Media'),
-                ('Instagram Influencers', 3200.00, 9600.00, 96, 'active', 'Instagram', 'Influencer'),
-                ('LinkedIn B2B Campaign', 4500.00, 13500.00, 135, 'active', 'LinkedIn', 'B2B'),
-                ('YouTube Pre-roll Ads', 2200.00, 6600.00, 66, 'paused', 'YouTube', 'Video'),
-                ('Email Marketing - Newsletter', 500.00, 2000.00, 100, 'active', 'Email', 'Newsletter'),
-                ('TikTok Brand Campaign', 1500.00, 3000.00, 30, 'paused', 'TikTok', 'Social Media'),
-                ('Pinterest Shopping Ads', 800.00, 2400.00, 48, 'active', 'Pinterest', 'Shopping'),
-                ('Twitter Promoted Tweets', 1200.00, 2400.00, 24, 'completed', 'Twitter', 'Social Media'),
-                ('Snapchat Stories Ads', 900.00, 1800.00, 18, 'completed', 'Snapchat', 'Stories'),
-                ('Amazon PPC Campaign', 3500.00, 10500.00, 105, 'active', 'Amazon', 'PPC'),
-                ('Reddit Community Marketing', 600.00, 1200.00, 12, 'active', 'Reddit', 'Community'),
-                ('WhatsApp Business Ads', 750.00, 2250.00, 45, 'active', 'WhatsApp', 'Messaging'),
-                ('Telegram Channel Promotion', 400.00, 800.00, 8, 'paused', 'Telegram', 'Messaging'),
-                ('Google Shopping Campaign', 2800.00, 8400.00, 84, 'active', 'Google Shopping', 'E-commerce'),
-                ('Microsoft Ads - Bing', 1600.00, 4800.00, 48, 'active', 'Bing', 'Search'),
-                ('Spotify Audio Ads', 1100.00, 2200.00, 22, 'completed', 'Spotify', 'Audio'),
-                ('Twitch Gaming Campaign', 1300.00, 2600.00, 26, 'paused', 'Twitch', 'Gaming'),
-                ('Discord Community Ads', 500.00, 1000.00, 10, 'active', 'Discord', 'Gaming'),
-                ('Clubhouse Audio Campaign', 700.00, 1400.00, 14, 'completed', 'Clubhouse', 'Audio')
-            ]
-            
-            # Insérer les données avec la nouvelle structure
-            cursor.executemany("""
-                INSERT INTO marketing_data (name, cost, revenue, conversions, status, channel, campaign_type) 
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """, sample_campaigns)
-            
-            connection.commit()
-            
-            # 4. Vérifier les données insérées
-            cursor.execute("SELECT COUNT(*) FROM marketing_data;")
-            count = cursor.fetchone()[0]
-            
-            cursor.close()
-            connection.close()
-            
-            self.connection_status = f"✅ Sample data created successfully!\n\n📊 Statistics:\n• {count} campaigns created\n• Mix of active, paused, and completed campaigns\n• Various channels: Google, Facebook, Instagram, etc.\n• Realistic cost, revenue, and conversion data\n\nYou can now test the chatbot with real data!"
+            self.connection_status = f"✅ Sample data created successfully!\n\n📊 Statistics:\n• {count} campaigns created (seed {self.sample_seed})\n• Mix of active, paused, and completed campaigns\n• Various channels: Google, Facebook, Instagram, etc.\n• Realistic cost, revenue, and conversion data\n\nYou can now test the chatbot with real data!"
             
             return {
                 'type': 'ir.actions.client',
@@ -391,24 +384,48 @@ class DatabaseTest(models.TransientModel):
                 }
             }
     
+    def optimize_indexes(self):
+        """Build the missing marketing_data indexes without blocking writes"""
+        try:
+            with marketing_connection() as connection:
+                built = ensure_indexes(connection, concurrently=True)
+                # Chat statistics read marketing_data_summary once it exists
+                ensure_summary(connection)
+                report = advise(connection)
+            
+            summary = f"Built {len(built)} index(es): {', '.join(built)}" if built else "All indexes already present"
+            self.test_results = "🔍 INDEXES & QUERY PLANS:\n" + "\n".join(report)
+            
+            return {
+                'type': 'ir.actions.client',
+                'tag': 'display_notification',
+                'params': {
+                    'title': 'Indexes Optimized',
+                    'message': summary,
+                    'type': 'success'
+                }
+            }
+            
+        except Exception as e:
+            _logger.error(f"Error building marketing_data indexes: {str(e)}")
+            return {
+                'type': 'ir.actions.client',
+                'tag': 'display_notification',
+                'params': {
+                    'title': 'Error',
+                    'message': f'Failed to build indexes: {str(e)}',
+                    'type': 'danger'
+                }
+            }
+    
     def simple_test(self):
         """Test simple avec notification immédiate"""
         try:
-            # Test de base
-            import psycopg2
-            conn = psycopg2.connect(
-                host='localhost',
-                database='ai_marketing', 
-                user='odoo',
-                password='odoo'
-            )
-            
             # Test simple
-            cursor = conn.cursor()
-            cursor.execute("SELECT version();")
-            version = cursor.fetchone()
-            cursor.close()
-            conn.close()
+            with marketing_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT version();")
+                    version = cursor.fetchone()
             
             # Notification de succès
             return {
@@ -435,17 +452,6 @@ class DatabaseTest(models.TransientModel):
     def populate_database(self):
         """Remplit la base de données avec des campagnes aléatoires pour test"""
         try:
-            connection_params = {
-                'host': 'localhost',
-                'database': 'ai_marketing',
-                'user': 'odoo',
-                'password': 'odoo',
-                'port': '5432'
-            }
-            
-            connection = psycopg2.connect(**connection_params)
-            cursor = connection.cursor()
-            
             # Données pour générer des campagnes aléatoires
             channels = ['Google Ads', 'Facebook', 'Instagram', 'LinkedIn', 'YouTube', 'Email', 'TikTok', 'Pinterest']
             types = ['Search', 'Display', 'Video', 'Social', 'Email', 'Shopping', 'Brand', 'Performance']
@@ -465,17 +471,16 @@ class DatabaseTest(models.TransientModel):
                 
                 campaigns.append((name, cost, revenue, conversions, status, channel, campaign_type))
             
-            cursor.executemany("""
-                INSERT INTO marketing_data (name, cost, revenue, conversions, status, channel, campaign_type) 
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """, campaigns)
-            
-            connection.commit()
+            with marketing_connection() as connection:
+                with connection.cursor() as cursor:
+                    cursor.executemany("""
+                        INSERT INTO marketing_data (name, cost, revenue, conversions, status, channel, campaign_type) 
+                        VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    """, campaigns)
+                connection.commit()
+            invalidate_marketing_cache()
             _logger.info(f"✅ Created {len(campaigns)} campaigns successfully!")
             
-            cursor.close()
-            connection.close()
-            
             return {
                 'type': 'ir.actions.client',
                 'tag': 'display_notification',
@@ -1,5 +1,8 @@
 from odoo import models, fields, api
 
+from ..tools.query_cache import invalidate_marketing_cache
+from .marketing_data_summary import SUMMARY_SOURCE_FIELDS
+
 class MarketingData(models.Model):
     _name = 'marketing.data'
     _description = 'Marketing Performance Data'
@@ -7,12 +10,13 @@ class MarketingData(models.Model):
 
     name = fields.Char('Campaign Name', required=True)
     channel_id = fields.Many2one('utm.medium', 'Channel', required=True)
+    budget = fields.Float('Budget', help='Planned spend; raised when an increase_budget recommendation is applied')
     cost = fields.Float('Cost', required=True)
     revenue = fields.Float('Revenue', required=True)
     conversions = fields.Integer('Conversions', default=0)
     conversion_rate = fields.Float('Conversion Rate', compute='_compute_conversion_rate', store=True)
     roi = fields.Float('ROI', compute='_compute_roi', store=True)
-    date_from = fields.Date('From Date')
+    date_from = fields.Date('From Date', index=True)
     date_to = fields.Date('To Date')
     status = fields.Selection([
         ('active', 'Active'),
@@ -34,4 +38,32 @@ class MarketingData(models.Model):
             if record.cost > 0:
                 record.roi = ((record.revenue - record.cost) / record.cost) * 100
             else:
-                record.roi = 0.0
\ No newline at end of file
+                record.roi = 0.0
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        summary = self.env['marketing.data.summary']
+        summary._apply(summary._snapshot(records), 1)
+        invalidate_marketing_cache()
+        return records
+
+    def write(self, vals):
+        summary = self.env['marketing.data.summary']
+        tracked = any(field in vals for field in SUMMARY_SOURCE_FIELDS)
+        if tracked:
+            before = summary._snapshot(self)
+        result = super().write(vals)
+        if tracked:
+            summary._apply(before, -1)
+            summary._apply(summary._snapshot(self), 1)
+        invalidate_marketing_cache()
+        return result
+
+    def unlink(self):
+        summary = self.env['marketing.data.summary']
+        before = summary._snapshot(self)
+        result = super().unlink()
+        summary._apply(before, -1)
+        invalidate_marketing_cache()
+        return result
@@ -0,0 +1,141 @@
+from odoo import models, fields, api
+
+# Fields of marketing.data that feed the summary
+SUMMARY_SOURCE_FIELDS = ('channel_id', 'status', 'cost', 'revenue', 'conversions')
+
+
+class MarketingDataSummary(models.Model):
+    _name = 'marketing.data.summary'
+    _description = 'Marketing Data Aggregates'
+    _rec_name = 'key'
+
+    scope = fields.Selection([
+        ('global', 'Global'),
+        ('channel', 'Channel'),
+        ('status', 'Status')
+    ], string='Scope', required=True)
+    key = fields.Char('Key', required=True, default='', help='Channel id or status, empty for the global row')
+    campaign_count = fields.Integer('Campaigns', readonly=True)
+    active_count = fields.Integer('Active Campaigns', readonly=True)
+    profitable_count = fields.Integer('Profitable Campaigns', readonly=True)
+    total_cost = fields.Float('Total Cost', readonly=True)
+    total_revenue = fields.Float('Total Revenue', readonly=True)
+    total_conversions = fields.Integer('Total Conversions', readonly=True)
+    roi_sum = fields.Float('Sum of ROI', readonly=True)
+    conversion_rate_sum = fields.Float('Sum of Conversion Rates', readonly=True)
+
+    _sql_constraints = [
+        ('scope_key_uniq', 'unique(scope, key)', 'Only one summary row per scope and key.'),
+    ]
+
+    def init(self):
+        self._rebuild()
+
+    @api.model
+    def _rebuild(self):
+        """Recompute every summary row from marketing_data"""
+        self.env.cr.execute("DELETE FROM marketing_data_summary")
+        self.env.cr.execute("""
+            INSERT INTO marketing_data_summary (
+                scope, key, campaign_count, active_count, profitable_count, total_cost,
+                total_revenue, total_conversions, roi_sum, conversion_rate_sum)
+            SELECT g.scope, g.key, COUNT(*),
+                   COUNT(*) FILTER (WHERE d.status = 'active'),
+                   COUNT(*) FILTER (WHERE d.roi > 100),
+                   COALESCE(SUM(d.cost), 0), COALESCE(SUM(d.revenue), 0),
+                   COALESCE(SUM(d.conversions), 0), COALESCE(SUM(d.roi), 0),
+                   COALESCE(SUM(d.conversion_rate), 0)
+            FROM marketing_data d
+            CROSS JOIN LATERAL (VALUES
+                ('global', ''),
+                ('channel', COALESCE(d.channel_id::varchar, '')),
+                ('status', COALESCE(d.status, ''))
+            ) AS g(scope, key)
+            GROUP BY g.scope, g.key
+        """)
+        self.invalidate_model()
+
+    @api.model
+    def _snapshot(self, campaigns):
+        """Values of ``campaigns`` that contribute to the summary"""
+        return [(
+            campaign.channel_id.id,
+            campaign.status,
+            campaign.cost,
+            campaign.revenue,
+            campaign.conversions,
+        ) for campaign in campaigns]
+
+    @api.model
+    def _apply(self, snapshot, sign):
+        """Add (sign=1) or remove (sign=-1) snapshotted campaigns from the summary"""
+        deltas = {}
+        for channel_id, status, cost, revenue, conversions in snapshot:
+            roi = ((revenue - cost) / cost) * 100 if cost > 0 else 0.0
+            conversion_rate = (conversions / cost) * 100 if cost > 0 else 0.0
+            row = (
+                sign,
+                sign if status == 'active' else 0,
+                sign if roi > 100 else 0,
+                sign * cost,
+                sign * revenue,
+                sign * conversions,
+                sign * roi,
+                sign * conversion_rate,
+            )
+            for group in (('global', ''), ('channel', str(channel_id or '')), ('status', status or '')):
+                current = deltas.get(group)
+                deltas[group] = row if current is None else tuple(a + b for a, b in zip(current, row))
+
+        for (scope, key), delta in deltas.items():
+            self.env.cr.execute("""
+                INSERT INTO marketing_data_summary AS s (
+                    scope, key, campaign_count, active_count, profitable_count, total_cost,
+                    total_revenue, total_conversions, roi_sum, conversion_rate_sum)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ON CONFLICT (scope, key) DO UPDATE SET
+                    campaign_count = s.campaign_count + EXCLUDED.campaign_count,
+                    active_count = s.active_count + EXCLUDED.active_count,
+                    profitable_count = s.profitable_count + EXCLUDED.profitable_count,
+                    total_cost = s.total_cost + EXCLUDED.total_cost,
+                    total_revenue = s.total_revenue + EXCLUDED.total_revenue,
+                    total_conversions = s.total_conversions + EXCLUDED.total_conversions,
+                    roi_sum = s.roi_sum + EXCLUDED.roi_sum,
+                    conversion_rate_sum = s.conversion_rate_sum + EXCLUDED.conversion_rate_sum
+            """, (scope, key) + delta)
+        if deltas:
+            self.invalidate_model()
+
+    @api.model
+    def _get_stats(self, scope='global', key=''):
+        """Aggregates of one summary row as a dict, zeros when the row does not exist.
+
+        The global row has the SUMMARY_STATS_KEYS of the external summary,
+        with the campaigns counted per status from the status rows.
+        """
+        self.env.cr.execute("""
+            SELECT campaign_count, active_count, profitable_count, total_cost, total_revenue,
+                   total_conversions, roi_sum
+            FROM marketing_data_summary
+            WHERE scope = %s AND key = %s
+        """, (scope, key))
+        row = self.env.cr.fetchone() or (0, 0, 0, 0.0, 0.0, 0, 0.0)
+        count = row[0]
+        stats = {
+            'total_campaigns': count,
+            'active_campaigns': row[1],
+            'profitable_campaigns': row[2],
+            'total_cost': row[3],
+            'total_revenue': row[4],
+            'total_conversions': row[5],
+            'avg_roi': row[6] / count if count else 0,
+        }
+        if scope == 'global':
+            self.env.cr.execute("""
+                SELECT key, campaign_count FROM marketing_data_summary
+                WHERE scope = 'status' AND key IN ('paused', 'completed')
+            """)
+            by_status = dict(self.env.cr.fetchall())
+            stats['paused_campaigns'] = by_status.get('paused', 0)
+            stats['completed_campaigns'] = by_status.get('completed', 0)
+        return stats
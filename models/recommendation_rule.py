@@ -0,0 +1,77 @@
+from odoo import models, fields, api, _
+from odoo.exceptions import ValidationError
+from odoo.osv import expression
+from odoo.tools import ormcache
+from odoo.tools.safe_eval import safe_eval
+
+RECOMMENDATION_TYPES = [
+    ('stop_campaign', 'Stop Campaign'),
+    ('increase_budget', 'Increase Budget'),
+    ('optimize_ad', 'Optimize Ad'),
+    ('channel_shift', 'Channel Shift')
+]
+
+PRIORITIES = [
+    ('low', 'Low'),
+    ('medium', 'Medium'),
+    ('high', 'High'),
+    ('critical', 'Critical')
+]
+
+# Values available to the title and reason templates
+TEMPLATE_SAMPLE = {
+    'name': 'Campaign', 'channel': 'Channel', 'status': 'active', 'cost': 0.0,
+    'revenue': 0.0, 'conversions': 0, 'roi': 0.0, 'conversion_rate': 0.0,
+}
+
+
+class RecommendationRule(models.Model):
+    _name = 'ai.recommendation.rule'
+    _description = 'AI Recommendation Rule'
+    _order = 'sequence, id'
+
+    name = fields.Char('Rule Name', required=True)
+    sequence = fields.Integer('Sequence', default=10,
+                              help='Rules are evaluated in sequence order; a campaign only gets '
+                                   'a recommendation from the first rule it matches')
+    active = fields.Boolean('Active', default=True)
+    recommendation_type = fields.Selection(RECOMMENDATION_TYPES, string='Type', required=True)
+    domain = fields.Char('Condition', required=True, default='[]',
+                         help='Domain on marketing.data selecting the campaigns this rule applies to')
+    title_template = fields.Char('Title Template', required=True, default='{name}')
+    reason_template = fields.Text('Reason Template',
+                                  help='Placeholders: {name}, {channel}, {status}, {cost}, {revenue}, '
+                                       '{conversions}, {roi}, {conversion_rate}')
+    impact_score = fields.Float('Impact Score', help='Expected impact (0-100)')
+    priority = fields.Selection(PRIORITIES, string='Priority', default='medium')
+
+    @api.constrains('domain', 'title_template', 'reason_template')
+    def _check_rule(self):
+        for rule in self:
+            try:
+                expression.normalize_domain(rule._get_domain())
+                rule._render(TEMPLATE_SAMPLE)
+            except Exception as e:
+                raise ValidationError(_("Invalid recommendation rule %(rule)s: %(error)s",
+                                        rule=rule.name, error=e))
+
+    @ormcache('self.domain')
+    def _compiled_domain(self):
+        """Parsed domain, kept per condition string so it is evaluated once per worker"""
+        return tuple(safe_eval(self.domain or '[]'))
+
+    def _get_domain(self):
+        self.ensure_one()
+        return list(self._compiled_domain())
+
+    def _matching_campaign_ids(self):
+        """Ids of the campaigns matching this rule, fetched with a single query"""
+        self.ensure_one()
+        return self.env['marketing.data'].search(self._get_domain(), order='id').ids
+
+    def _render(self, values):
+        self.ensure_one()
+        return (
+            self.title_template.format(**values),
+            (self.reason_template or '').format(**values),
+        )
@@ -19,6 +19,16 @@ export class MarketingChatBubble extends Component {
             currentLanguage: 'en',
             isTyping: false
         });
+        // Groups the logged exchanges of this conversation, created on the first message
+        this.sessionId = null;
+    }
+
+    async getSessionId() {
+        if (!this.sessionId) {
+            const result = await rpc("/ai_marketing_assistant/chat_session", {});
+            this.sessionId = result.session_id;
+        }
+        return this.sessionId;
     }
 
     get translations() {
@@ -50,6 +60,8 @@ export class MarketingChatBubble extends Component {
 
     toggleLanguage() {
         this.state.currentLanguage = this.state.currentLanguage === 'en' ? 'ar' : 'en';
+        // The conversation starts over
+        this.sessionId = null;
         // Update welcome message
         this.state.messages = [{
             text: this.t.welcome,
@@ -73,20 +85,8 @@ export class MarketingChatBubble extends Component {
         this.state.isTyping = true;
 
         try {
-            // Call backend service
-            const response = await rpc("/ai_marketing_assistant/chat", {
-                message: message,
-                language: this.state.currentLanguage
-            });
-
-            setTimeout(() => {
-                this.state.isTyping = false;
-                this.state.messages.push({
-                    text: response.response || "Thank you for your message!",
-                    isBot: true,
-                    timestamp: new Date()
-                });
-            }, 1000);
+            // Stream the backend response and render chunks as they arrive
+            await this.streamResponse(message);
 
         } catch (error) {
             console.error("Chat error:", error);
@@ -129,6 +129,55 @@ export class MarketingChatBubble extends Component {
         }
     }
 
+    async streamResponse(message) {
+        const body = new FormData();
+        body.append("message", message);
+        body.append("language", this.state.currentLanguage);
+        body.append("session_id", await this.getSessionId());
+        body.append("csrf_token", odoo.csrf_token);
+
+        const response = await fetch("/ai_marketing_assistant/chat_stream", {
+            method: "POST",
+            body: body
+        });
+        if (!response.ok || !response.body) {
+            throw new Error(`Chat stream failed with status ${response.status}`);
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let botMessage = null;
+
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+
+            const chunk = decoder.decode(value, { stream: true });
+            if (!botMessage) {
+                this.state.isTyping = false;
+                this.state.messages.push({
+                    text: "",
+                    isBot: true,
+                    timestamp: new Date()
+                });
+                botMessage = this.state.messages[this.state.messages.length - 1];
+            }
+            botMessage.text += chunk;
+        }
+
+        const rest = decoder.decode();
+        if (!botMessage) {
+            this.state.isTyping = false;
+            this.state.messages.push({
+                text: rest || "Thank you for your message!",
+                isBot: true,
+                timestamp: new Date()
+            });
+        } else {
+            botMessage.text += rest;
+        }
+    }
+
     onKeyPress(event) {
         if (event.key === 'Enter') {
             event.preventDefault();
@@ -0,0 +1,5 @@
+from . import test_ai_service
+from . import test_chat_assistant
+from . import test_database_test
+from . import test_marketing_summary
+from . import test_recommendations
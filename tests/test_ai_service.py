@@ -0,0 +1,27 @@
+from unittest.mock import patch
+
+from odoo.tests import TransactionCase, tagged
+
+from odoo.addons.ai_marketing_assistant.tools.chat_metrics import chat_metrics
+
+
+@tagged('post_install', '-at_install')
+class TestAIServiceMetrics(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        channel = cls.env['utm.medium'].create({'name': 'Metrics Test Channel'})
+        cls.env['marketing.data'].create({
+            'name': 'Metrics Campaign', 'channel_id': channel.id, 'cost': 100, 'revenue': 250, 'conversions': 4,
+        })
+
+    def test_streamed_campaign_question_is_measured(self):
+        chat_metrics.reset()
+        self.addCleanup(chat_metrics.reset)
+        with patch.object(chat_metrics, 'enabled', True):
+            chunks = list(self.env['ai.marketing.service'].stream_chat_response("list the campaigns", 'en'))
+        self.assertTrue(chunks)
+        operations = chat_metrics.snapshot()['operations']
+        self.assertEqual(operations['stream_chat_response']['count'], 1)
+        self.assertEqual(operations['stream_chat_response']['errors'], 0)
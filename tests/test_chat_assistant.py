@@ -0,0 +1,43 @@
+from unittest.mock import patch
+
+from odoo.exceptions import AccessError
+from odoo.tests import TransactionCase, new_test_user, tagged
+
+from odoo.addons.ai_marketing_assistant.models.chat_assistant import ChatAssistant
+
+
+@tagged('post_install', '-at_install')
+class TestChatAssistant(TransactionCase):
+
+    def test_missing_session_id_starts_a_conversation(self):
+        with patch.object(ChatAssistant, '_log_exchange', autospec=True) as log_exchange:
+            self.env['chat.assistant'].process_query("hello")
+            self.env['chat.assistant'].process_query("hello")
+        first, second = [call.args[3] for call in log_exchange.call_args_list]
+        self.assertTrue(first)
+        self.assertNotEqual(first, second)
+
+    def test_exchanges_share_the_session_id(self):
+        assistant = self.env['chat.assistant']
+        session_id = assistant.new_session_id()
+        with patch.object(ChatAssistant, '_log_exchange', autospec=True) as log_exchange:
+            assistant.process_query("best channel?", session_id)
+            assistant.process_query("roi?", session_id)
+        self.assertEqual([call.args[3] for call in log_exchange.call_args_list], [session_id, session_id])
+
+    def test_new_session_ids_are_unique(self):
+        assistant = self.env['chat.assistant']
+        self.assertNotEqual(assistant.new_session_id(), assistant.new_session_id())
+
+    def test_users_only_see_their_own_conversations(self):
+        alice = new_test_user(self.env, login='chat_alice', groups='base.group_user')
+        bob = new_test_user(self.env, login='chat_bob', groups='base.group_user')
+        Chat = self.env['chat.assistant']
+        mine = Chat.create({'name': 'a', 'user_input': "hi", 'user_id': alice.id})
+        theirs = Chat.create({'name': 'b', 'user_input': "hi", 'user_id': bob.id})
+        self.assertEqual(Chat.with_user(alice).search([('id', 'in', (mine | theirs).ids)]), mine)
+        with self.assertRaises(AccessError):
+            mine.with_user(alice).write({'user_input': "edited"})
+        with self.assertRaises(AccessError):
+            mine.with_user(alice).unlink()
+        self.assertEqual(Chat.search([('id', 'in', (mine | theirs).ids)]), mine | theirs)
@@ -0,0 +1,36 @@
+from contextlib import nullcontext
+from unittest.mock import patch
+
+from odoo.tests import TransactionCase, tagged
+
+from odoo.addons.ai_marketing_assistant.models.database_test import SAMPLE_REQUEST_PARAM, DatabaseTest
+
+
+@tagged('post_install', '-at_install')
+class TestSampleData(TransactionCase):
+
+    def test_small_samples_load_in_the_request(self):
+        wizard = self.env['database.test'].create({'sample_size': '1000', 'sample_seed': 7})
+        with patch('odoo.addons.ai_marketing_assistant.models.database_test.marketing_connection',
+                   return_value=nullcontext('connection')), \
+                patch.object(DatabaseTest, '_create_sample_campaigns', return_value=1000) as create:
+            wizard.create_sample_data()
+        create.assert_called_once_with('connection', 1000, 7)
+
+    def test_large_samples_are_queued_for_the_cron(self):
+        wizard = self.env['database.test'].create({'sample_size': '10000000', 'sample_seed': 7})
+        cron = self.env.ref('ai_marketing_assistant.ir_cron_sample_data')
+        with patch.object(DatabaseTest, '_create_sample_campaigns') as create:
+            wizard.create_sample_data()
+        create.assert_not_called()
+        self.assertEqual(self.env['ir.config_parameter'].get_param(SAMPLE_REQUEST_PARAM), '10000000,7')
+        self.assertTrue(self.env['ir.cron.trigger'].search([('cron_id', '=', cron.id)]))
+
+        with patch('odoo.addons.ai_marketing_assistant.models.database_test.marketing_connection',
+                   return_value=nullcontext('connection')), \
+                patch.object(DatabaseTest, '_create_sample_campaigns', return_value=10000000) as create, \
+                patch.object(self.env.cr, 'commit'):
+            self.env['database.test']._cron_load_sample_data()
+            self.env['database.test']._cron_load_sample_data()
+        create.assert_called_once_with('connection', 10000000, 7)
+        self.assertFalse(self.env['ir.config_parameter'].get_param(SAMPLE_REQUEST_PARAM))
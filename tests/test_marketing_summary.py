@@ -0,0 +1,73 @@
+from odoo.tests import TransactionCase, tagged
+
+from odoo.addons.ai_marketing_assistant.tools.marketing_summary import SUMMARY_STATS_KEYS
+
+
+@tagged('post_install', '-at_install')
+class TestMarketingSummary(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.channel = cls.env['utm.medium'].create({'name': 'Summary Test Channel'})
+        cls.other_channel = cls.env['utm.medium'].create({'name': 'Summary Test Channel 2'})
+        cls.Summary = cls.env['marketing.data.summary']
+
+    def _channel_stats(self, channel):
+        return self.Summary._get_stats('channel', str(channel.id))
+
+    def _assert_matches_rebuild(self):
+        """The incrementally maintained rows equal a full recomputation"""
+        scopes = [('global', ''), ('channel', str(self.channel.id)), ('channel', str(self.other_channel.id)),
+                  ('status', 'active'), ('status', 'paused')]
+        incremental = {scope: self.Summary._get_stats(*scope) for scope in scopes}
+        self.Summary._rebuild()
+        for scope in scopes:
+            expected = self.Summary._get_stats(*scope)
+            for name, value in expected.items():
+                self.assertAlmostEqual(incremental[scope][name], value, places=6, msg=f"{scope} {name}")
+
+    def test_create_write_unlink(self):
+        MarketingData = self.env['marketing.data']
+        first, second = MarketingData.create([
+            {'name': 'First', 'channel_id': self.channel.id, 'status': 'active',
+             'cost': 100, 'revenue': 250, 'conversions': 4},
+            {'name': 'Second', 'channel_id': self.channel.id, 'status': 'active',
+             'cost': 200, 'revenue': 100, 'conversions': 2},
+        ])
+        stats = self._channel_stats(self.channel)
+        self.assertEqual(stats['total_campaigns'], 2)
+        self.assertEqual(stats['active_campaigns'], 2)
+        self.assertEqual(stats['profitable_campaigns'], 1)
+        self.assertEqual(stats['total_cost'], 300)
+        self.assertEqual(stats['total_conversions'], 6)
+        self._assert_matches_rebuild()
+
+        second.write({'channel_id': self.other_channel.id, 'status': 'paused', 'revenue': 700})
+        self.assertEqual(self._channel_stats(self.channel)['total_campaigns'], 1)
+        moved = self._channel_stats(self.other_channel)
+        self.assertEqual(moved['total_campaigns'], 1)
+        self.assertEqual(moved['active_campaigns'], 0)
+        self.assertEqual(moved['profitable_campaigns'], 1)
+        self._assert_matches_rebuild()
+
+        first.unlink()
+        self.assertEqual(self._channel_stats(self.channel)['total_campaigns'], 0)
+        self._assert_matches_rebuild()
+
+    def test_untracked_write_keeps_summary(self):
+        campaign = self.env['marketing.data'].create({
+            'name': 'Renamed', 'channel_id': self.channel.id, 'cost': 100, 'revenue': 50,
+        })
+        before = self._channel_stats(self.channel)
+        campaign.write({'name': 'Renamed Again'})
+        self.assertEqual(self._channel_stats(self.channel), before)
+
+    def test_global_stats_have_the_external_summary_keys(self):
+        self.env['marketing.data'].create({
+            'name': 'Paused', 'channel_id': self.channel.id, 'status': 'paused', 'cost': 100, 'revenue': 50,
+        })
+        stats = self.Summary._get_stats()
+        self.assertEqual(set(stats), set(SUMMARY_STATS_KEYS))
+        self.assertEqual(stats['paused_campaigns'], self.Summary._get_stats('status', 'paused')['total_campaigns'])
+        self.assertGreaterEqual(stats['paused_campaigns'], 1)
@@ -0,0 +1,115 @@
+from odoo.exceptions import AccessError
+from odoo.tests import TransactionCase, new_test_user, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestRecommendations(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.channel = cls.env['utm.medium'].create({'name': 'Recommendation Test Channel'})
+        MarketingData = cls.env['marketing.data']
+        # ROI -75% on 2,000 spent, 0.25% conversion rate: matches the stop and optimize rules
+        cls.loser = MarketingData.create({
+            'name': 'Loser', 'channel_id': cls.channel.id, 'cost': 2000, 'revenue': 500, 'conversions': 5,
+        })
+        # ROI 200%, 20% conversion rate
+        cls.winner = MarketingData.create({
+            'name': 'Winner', 'channel_id': cls.channel.id, 'cost': 100, 'revenue': 300, 'conversions': 20,
+        })
+        cls.average = MarketingData.create({
+            'name': 'Average', 'channel_id': cls.channel.id, 'cost': 100, 'revenue': 110, 'conversions': 1,
+        })
+        cls.campaigns = cls.loser | cls.winner | cls.average
+
+    def _recommendations(self):
+        return self.env['ai.assistant'].search([('campaign_id', 'in', self.campaigns.ids)])
+
+    def test_rules_select_campaigns(self):
+        self.env['ai.assistant'].generate_recommendations()
+        recommendations = self._recommendations()
+        self.assertEqual(
+            {(r.campaign_id, r.recommendation_type) for r in recommendations},
+            {(self.loser, 'stop_campaign'), (self.winner, 'increase_budget')},
+        )
+        stop = recommendations.filtered(lambda r: r.campaign_id == self.loser)
+        self.assertEqual(stop.name, 'Stop Campaign: Loser')
+        self.assertEqual(stop.priority, 'high')
+        self.assertEqual(stop.status, 'pending')
+
+    def test_first_matching_rule_claims_campaign(self):
+        optimize = self.env.ref('ai_marketing_assistant.rule_optimize_ad')
+        self.assertIn(self.loser.id, optimize._matching_campaign_ids())
+        self.env['ai.assistant'].generate_recommendations()
+        self.assertEqual(
+            self._recommendations().filtered(lambda r: r.campaign_id == self.loser).recommendation_type,
+            'stop_campaign',
+        )
+
+    def test_pending_recommendations_are_not_duplicated(self):
+        self.env['ai.assistant'].generate_recommendations()
+        count = len(self._recommendations())
+        self.env['ai.assistant'].generate_recommendations()
+        self.assertEqual(len(self._recommendations()), count)
+
+    def test_archived_rule_is_skipped(self):
+        self.env.ref('ai_marketing_assistant.rule_stop_campaign').active = False
+        self.env['ai.assistant'].generate_recommendations()
+        self.assertEqual(
+            self._recommendations().filtered(lambda r: r.campaign_id == self.loser).recommendation_type,
+            'optimize_ad',
+        )
+
+    def _recommend(self, campaign, recommendation_type, **values):
+        return self.env['ai.assistant'].create(dict({
+            'name': f"{recommendation_type}: {campaign.name}",
+            'recommendation_type': recommendation_type,
+            'campaign_id': campaign.id,
+        }, **values))
+
+    def test_apply_pauses_and_raises_budget(self):
+        self.winner.budget = 500
+        stop = self._recommend(self.loser, 'stop_campaign')
+        increase = self._recommend(self.winner, 'increase_budget') | self._recommend(self.average, 'increase_budget')
+        (stop | increase).apply_recommendation()
+        self.assertEqual(self.loser.status, 'paused')
+        self.assertAlmostEqual(self.winner.budget, 600)
+        # No planned budget: starts from the spend, which is left untouched
+        self.assertAlmostEqual(self.average.budget, 120)
+        self.assertEqual(self.average.cost, 100)
+        self.assertEqual(set((stop | increase).mapped('status')), {'applied'})
+
+    def test_apply_skips_applied_and_rejected(self):
+        self.winner.budget = 500
+        applied = self._recommend(self.winner, 'increase_budget', status='applied')
+        rejected = self._recommend(self.winner, 'increase_budget', status='rejected')
+        (applied | rejected).apply_recommendation()
+        self.assertEqual(self.winner.budget, 500)
+        self.assertEqual(rejected.status, 'rejected')
+
+    def test_budget_increase_is_one_statement(self):
+        def queries(count):
+            campaigns = self.env['marketing.data'].create([{
+                'name': f"Bulk {i}", 'channel_id': self.channel.id, 'cost': 100 + i, 'revenue': 400,
+            } for i in range(count)])
+            self.env.flush_all()
+            before = self.env.cr.sql_log_count
+            self.env['ai.assistant']._increase_campaign_budgets(campaigns)
+            self.assertAlmostEqual(campaigns[-1].budget, round((100 + count - 1) * 1.2, 2))
+            return self.env.cr.sql_log_count - before
+        # Warm the config parameter cache first
+        queries(1)
+        self.assertEqual(queries(20), queries(2))
+
+    def test_only_administrators_edit_rules(self):
+        employee = new_test_user(self.env, login='rule_employee', groups='base.group_user')
+        rule = self.env.ref('ai_marketing_assistant.rule_stop_campaign').with_user(employee)
+        self.assertTrue(rule.domain)
+        with self.assertRaises(AccessError):
+            rule.write({'domain': "[]"})
+        with self.assertRaises(AccessError):
+            rule.copy()
+        # Reading the rules is enough to generate recommendations
+        self.env['ai.assistant'].with_user(employee).generate_recommendations()
+        self.assertTrue(self._recommendations())
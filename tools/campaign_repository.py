@@ -0,0 +1,310 @@
+import logging
+from abc import ABC, abstractmethod
+
+from odoo.tools.sql import escape_psql
+
+from .query_cache import query_cache
+from .question_filters import NO_FILTERS
+
+_logger = logging.getLogger(__name__)
+
+# Orderings served by top_n
+RANKINGS = ('best_roi', 'worst_roi', 'active_cost', 'active_conversion_rate')
+# Fields served by group_by
+GROUPINGS = ('channel', 'status')
+
+_CAMPAIGN_FIELDS = ['name', 'channel_id', 'status', 'cost', 'revenue', 'conversions', 'roi', 'conversion_rate']
+
+
+class CampaignBackend(ABC):
+    """Source of campaign data for the chat handlers.
+
+    Every backend returns the same shapes. Reads take the QuestionFilters
+    of the question (creation window and channel) and return None when the
+    source is unavailable, never raise.
+    """
+
+    name = None
+    label = None
+
+    @abstractmethod
+    def has_campaigns(self):
+        """Whether the source holds at least one campaign"""
+
+    @abstractmethod
+    def top_n(self, ranking, limit=5, filters=NO_FILTERS):
+        """Campaign dicts with name, channel, status, cost, revenue, conversions, roi and conversion_rate"""
+
+    @abstractmethod
+    def group_by(self, field, limit=None, filters=NO_FILTERS):
+        """Dicts with the group value under ``field``, campaign_count, avg_roi,
+        total_revenue, total_cost and total_conversions, best average ROI first"""
+
+    @abstractmethod
+    def totals(self, filters=NO_FILTERS):
+        """One dict with the SUMMARY_STATS_KEYS plus best_roi and worst_roi"""
+
+    @abstractmethod
+    def channels(self):
+        """The channel names"""
+
+
+class PostgresCampaigns(CampaignBackend):
+    """Campaigns of the external ai_marketing database.
+
+    ``fetch(query_name, params, predicates)`` runs one of the
+    MARKETING_QUERIES restricted by the FILTER_PREDICATES in ``predicates``
+    and returns its rows, or None on failure; ``summary()`` returns the
+    precomputed totals of marketing_data_summary, or None. The summary only
+    covers the whole table, so filtered totals are aggregated by the query.
+    """
+
+    name = 'postgresql'
+    label = 'PostgreSQL'
+
+    def __init__(self, fetch, summary=None):
+        self._fetch = fetch
+        self._summary = summary
+
+    def has_campaigns(self):
+        rows = self._fetch('any_campaign', None, ())
+        return None if rows is None else bool(rows)
+
+    def top_n(self, ranking, limit=5, filters=NO_FILTERS):
+        return self._fetch(ranking, filters.params(limit=limit), filters.predicates)
+
+    def group_by(self, field, limit=None, filters=NO_FILTERS):
+        return self._fetch(f"by_{field}", filters.params(limit=limit), filters.predicates)
+
+    def totals(self, filters=NO_FILTERS):
+        summary = self._summary() if self._summary and not filters.predicates else None
+        if summary is not None:
+            bounds = self._fetch('roi_bounds', None, ())
+            return dict(summary, **bounds[0]) if bounds else None
+        rows = self._fetch('totals', filters.params(), filters.predicates)
+        return dict(rows[0]) if rows else None
+
+    def channels(self):
+        rows = self._fetch('channels', None, ())
+        return None if rows is None else [row['channel'] for row in rows]
+
+
+class OdooCampaigns(CampaignBackend):
+    """Campaigns of the Odoo marketing.data model.
+
+    The creation window of the filters applies to the campaign start date
+    (date_from), the Odoo counterpart of created_date.
+    """
+
+    name = 'odoo'
+    label = 'Odoo'
+
+    # ranking -> (domain, order)
+    _RANKINGS = {
+        'best_roi': ([], 'roi desc'),
+        'worst_roi': ([], 'roi asc'),
+        'active_cost': ([('status', '=', 'active')], 'cost desc'),
+        'active_conversion_rate': ([('status', '=', 'active'), ('cost', '>', 0)], 'conversion_rate desc'),
+    }
+
+    # Seconds the channel names stay in the query cache; campaign writes
+    # invalidate it sooner
+    CHANNELS_TTL = 300
+
+    def __init__(self, env):
+        self.env = env
+
+    def has_campaigns(self):
+        try:
+            return bool(self.env['marketing.data'].search([], limit=1))
+        except Exception as e:
+            _logger.error(f"Error reading Odoo campaigns: {str(e)}")
+            return None
+
+    @staticmethod
+    def _domain(filters):
+        domain = []
+        if filters.date_from is not None:
+            domain.append(('date_from', '>=', filters.date_from))
+        if filters.date_to is not None:
+            domain.append(('date_from', '<', filters.date_to))
+        if filters.channel is not None:
+            # Case-insensitive equality: % and _ in the question are not wildcards
+            domain.append(('channel_id.name', '=ilike', escape_psql(filters.channel)))
+        return domain
+
+    def top_n(self, ranking, limit=5, filters=NO_FILTERS):
+        domain, order = self._RANKINGS[ranking]
+        try:
+            campaigns = self.env['marketing.data'].search_read(
+                domain + self._domain(filters), _CAMPAIGN_FIELDS, order=order, limit=limit)
+        except Exception as e:
+            _logger.error(f"Error reading Odoo campaigns: {str(e)}")
+            return None
+        for campaign in campaigns:
+            channel = campaign.pop('channel_id')
+            campaign['channel'] = channel[1] if channel else None
+        return campaigns
+
+    def group_by(self, field, limit=None, filters=NO_FILTERS):
+        groupby = 'channel_id' if field == 'channel' else field
+        try:
+            groups = self.env['marketing.data']._read_group(
+                ([(groupby, '!=', False)] if field == 'channel' else []) + self._domain(filters),
+                [groupby],
+                ['__count', 'roi:avg', 'revenue:sum', 'cost:sum', 'conversions:sum'],
+                order='roi:avg desc',
+                limit=limit,
+            )
+        except Exception as e:
+            _logger.error(f"Error grouping Odoo campaigns by {field}: {str(e)}")
+            return None
+        return [{
+            field: value.name if field == 'channel' else value,
+            'campaign_count': count,
+            'avg_roi': avg_roi or 0.0,
+            'total_revenue': revenue,
+            'total_cost': cost,
+            'total_conversions': conversions,
+        } for value, count, avg_roi, revenue, cost, conversions in groups]
+
+    def totals(self, filters=NO_FILTERS):
+        domain = self._domain(filters)
+        try:
+            if domain:
+                stats = self._filtered_stats(domain)
+            else:
+                stats = self.env['marketing.data.summary']._get_stats()
+            [(best_roi, worst_roi)] = self.env['marketing.data']._read_group(domain, [], ['roi:max', 'roi:min'])
+        except Exception as e:
+            _logger.error(f"Error reading Odoo marketing stats: {str(e)}")
+            return None
+        return dict(stats, best_roi=best_roi or 0.0, worst_roi=worst_roi or 0.0)
+
+    def _filtered_stats(self, domain):
+        """Same keys as marketing.data.summary._get_stats, for the campaigns of ``domain``"""
+        MarketingData = self.env['marketing.data']
+        [(count, cost, revenue, conversions, avg_roi)] = MarketingData._read_group(
+            domain, [], ['__count', 'cost:sum', 'revenue:sum', 'conversions:sum', 'roi:avg'])
+        by_status = dict(MarketingData._read_group(domain, ['status'], ['__count']))
+        return {
+            'total_campaigns': count,
+            'active_campaigns': by_status.get('active', 0),
+            'paused_campaigns': by_status.get('paused', 0),
+            'completed_campaigns': by_status.get('completed', 0),
+            'profitable_campaigns': MarketingData.search_count(domain + [('roi', '>', 100)]),
+            'total_cost': cost or 0.0,
+            'total_revenue': revenue or 0.0,
+            'total_conversions': conversions or 0,
+            'avg_roi': avg_roi or 0.0,
+        }
+
+    def channels(self):
+        def compute():
+            try:
+                groups = self.env['marketing.data']._read_group([], ['channel_id'])
+            except Exception as e:
+                _logger.error(f"Error reading Odoo campaign channels: {str(e)}")
+                return None
+            return [channel.name for (channel,) in groups if channel]
+        return query_cache.get_or_compute('odoo:marketing.data.channels', (self.env.cr.dbname,),
+                                          self.CHANNELS_TTL, compute)
+
+
+class CampaignRepository:
+    """Campaign reads of one request, answered by a single backend.
+
+    Precedence: backends are tried in the given order (PostgreSQL
+    ai_marketing, then Odoo marketing.data). The first one that is
+    reachable and holds at least one campaign, checked with one cheap
+    has_campaigns probe, answers every read, so one
+    answer never mixes numbers from two sources. A backend failing in the
+    middle of a request is skipped for the rest of it. When no backend
+    holds campaigns the reads return the empty results of the first
+    reachable one.
+
+    Results are memoized in ``memo``; passing the query_memo scope of the
+    request lets every handler of that request share one fetch.
+    """
+
+    def __init__(self, backends, memo=None):
+        self.backends = backends
+        self.memo = {} if memo is None else memo
+
+    def _failed(self):
+        return self.memo.setdefault(('campaigns', 'failed'), set())
+
+    @property
+    def backend(self):
+        """Backend answering this request, None when every backend is down"""
+        key = ('campaigns', 'backend')
+        if key not in self.memo:
+            failed = self._failed()
+            chosen = None
+            for backend in self.backends:
+                if backend.name in failed:
+                    continue
+                found = self._call(backend, 'has_campaigns')
+                if found is None:
+                    continue
+                if found:
+                    chosen = backend
+                    break
+                if chosen is None:
+                    chosen = backend
+            self.memo[key] = chosen
+        return self.memo[key]
+
+    @property
+    def source(self):
+        backend = self.backend
+        return backend.label if backend else None
+
+    def _call(self, backend, method, *args):
+        key = ('campaigns', backend.name, method) + args
+        if key in self.memo:
+            return self.memo[key]
+        result = getattr(backend, method)(*args)
+        if result is None:
+            _logger.warning(f"{backend.label} campaigns unavailable, trying the next source")
+            self._failed().add(backend.name)
+            return None
+        self.memo[key] = result
+        return result
+
+    def _read(self, method, *args):
+        while True:
+            backend = self.backend
+            if backend is None:
+                return None
+            result = self._call(backend, method, *args)
+            if result is not None:
+                return result
+            # Failed mid-request: pick the next source
+            del self.memo[('campaigns', 'backend')]
+
+    def top_n(self, ranking, limit=5, filters=NO_FILTERS):
+        """``limit`` campaigns matching ``filters`` in ``ranking`` order (one of RANKINGS)"""
+        if ranking not in RANKINGS:
+            raise ValueError(f"Unknown campaign ranking: {ranking}")
+        return self._read('top_n', ranking, limit, filters)
+
+    def group_by(self, field, limit=None, filters=NO_FILTERS):
+        """Aggregates per ``field`` (one of GROUPINGS), best average ROI first"""
+        if field not in GROUPINGS:
+            raise ValueError(f"Cannot group campaigns by {field}")
+        return self._read('group_by', field, limit, filters)
+
+    def group_by_channel(self, limit=None, filters=NO_FILTERS):
+        return self.group_by('channel', limit, filters)
+
+    def group_by_status(self, filters=NO_FILTERS):
+        return self.group_by('status', None, filters)
+
+    def totals(self, filters=NO_FILTERS):
+        """Campaign statistics, global unless ``filters`` restrict them"""
+        return self._read('totals', filters)
+
+    def channels(self):
+        """Channel names of the answering backend, to recognize them in questions"""
+        return self._read('channels')
@@ -0,0 +1,154 @@
+import atexit
+import logging
+import os
+import threading
+from collections import deque
+
+from odoo.tools import config
+
+_logger = logging.getLogger(__name__)
+
+
+class ChatLogBuffer:
+    """Bounded in-memory queue of chat exchanges, written in batches.
+
+    ``append`` only queues the values; a daemon thread hands them to
+    ``writer(dbname, values_list)`` once ``batch_size`` entries are waiting or
+    every ``flush_interval`` seconds. When a database already has ``max_size``
+    pending entries the caller writes the backlog itself (back-pressure)
+    instead of letting the queue grow.
+    """
+
+    def __init__(self, writer, max_size=1000, batch_size=100, flush_interval=5.0):
+        if batch_size < 1 or max_size < batch_size:
+            raise ValueError("Invalid chat log buffer: max_size=%s batch_size=%s" % (max_size, batch_size))
+        self.writer = writer
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._lock = threading.Condition()
+        self._pending = {}  # dbname -> deque of values
+        self._thread = None
+        self._closed = False
+        self.written = 0
+        self.failed = 0
+
+    def append(self, dbname, values):
+        """Queue one exchange; returns False when the caller had to flush inline"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Chat log buffer is closed")
+            queue = self._pending.setdefault(dbname, deque())
+            if len(queue) >= self.max_size:
+                backlog = list(queue)
+                queue.clear()
+            else:
+                queue.append(values)
+                if len(queue) >= self.batch_size:
+                    self._lock.notify()
+                self._ensure_thread()
+                return True
+        self._write(dbname, backlog + [values])
+        return False
+
+    def _ensure_thread(self):
+        """Start the flusher thread; caller holds the lock"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='ai_marketing.chat_log', daemon=True)
+            self._thread.start()
+
+    def _take(self, dbname, limit=None):
+        """Pop up to ``limit`` pending entries of one database; caller holds the lock"""
+        queue = self._pending.get(dbname)
+        if not queue:
+            return []
+        count = len(queue) if limit is None else min(limit, len(queue))
+        return [queue.popleft() for _i in range(count)]
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._closed and not any(len(queue) >= self.batch_size for queue in self._pending.values()):
+                    self._lock.wait(self.flush_interval)
+                if self._closed:
+                    return
+                batches = [(dbname, self._take(dbname, self.batch_size)) for dbname in list(self._pending)]
+            for dbname, entries in batches:
+                if entries:
+                    self._write(dbname, entries)
+
+    def _write(self, dbname, entries):
+        try:
+            self.writer(dbname, entries)
+        except Exception as e:
+            with self._lock:
+                self.failed += len(entries)
+            _logger.error(f"Failed to write {len(entries)} chat log entries to {dbname}: {str(e)}")
+            return
+        with self._lock:
+            self.written += len(entries)
+
+    def flush(self, dbname=None):
+        """Write everything pending now, for one database or all of them"""
+        with self._lock:
+            dbnames = [dbname] if dbname else list(self._pending)
+            batches = [(name, self._take(name)) for name in dbnames]
+        for name, entries in batches:
+            for start in range(0, len(entries), self.batch_size):
+                self._write(name, entries[start:start + self.batch_size])
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._lock.notify_all()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(self.flush_interval)
+        self.flush()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'pending': sum(len(queue) for queue in self._pending.values()),
+                'written': self.written,
+                'failed': self.failed,
+                'max_size': self.max_size,
+                'batch_size': self.batch_size,
+            }
+
+
+_buffer = None
+_buffer_pid = None
+_buffer_lock = threading.Lock()
+
+
+def buffer_settings():
+    """Buffer sizing, overridable from the Odoo configuration file"""
+    return {
+        'max_size': int(config.get('ai_marketing_chat_log_max_size') or 1000),
+        'batch_size': int(config.get('ai_marketing_chat_log_batch_size') or 100),
+        'flush_interval': float(config.get('ai_marketing_chat_log_flush_interval') or 5),
+    }
+
+
+def get_chat_log(writer):
+    """Process-wide buffer; recreated after a fork since threads do not survive it"""
+    global _buffer, _buffer_pid
+    pid = os.getpid()
+    if _buffer is not None and _buffer_pid == pid:
+        return _buffer
+    with _buffer_lock:
+        if _buffer is None or _buffer_pid != pid:
+            _buffer = ChatLogBuffer(writer, **buffer_settings())
+            _buffer_pid = pid
+        return _buffer
+
+
+@atexit.register
+def close_chat_log():
+    """Write the remaining entries before the process exits"""
+    global _buffer
+    with _buffer_lock:
+        if _buffer is not None and _buffer_pid == os.getpid():
+            _buffer.close()
+        _buffer = None
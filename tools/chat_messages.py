@@ -0,0 +1,298 @@
+from .message_catalog import MessageCatalog
+
+# Chat report templates, keyed by message then language. Placeholders use
+# str.format syntax; {index} is the 1-based position of a report row.
+CHAT_MESSAGES = {
+    # Greeting
+    'greeting.hello': {
+        'fr': "Bonjour ! Je suis votre assistant marketing IA. 👋\n\n",
+        'en': "Hello! I'm your AI Marketing Assistant. 👋\n\n",
+        'ar': "مرحباً! أنا مساعد التسويق الذكي. 👋\n\n",
+    },
+    'greeting.overview': {
+        'fr': ("📊 Aperçu rapide :\n"
+               "• {active_campaigns}/{total_campaigns} campagnes actives\n"
+               "• ${total_revenue:,.0f} revenus totaux\n"
+               "• {total_conversions:,} conversions totales\n"
+               "• {avg_roi:.1f}% ROI moyen\n"
+               "• Source: {source}\n\n"),
+        'en': ("📊 Quick Overview:\n"
+               "• {active_campaigns}/{total_campaigns} campaigns active\n"
+               "• ${total_revenue:,.0f} total revenue\n"
+               "• {total_conversions:,} total conversions\n"
+               "• {avg_roi:.1f}% average ROI\n"
+               "• Source: {source}\n\n"),
+        'ar': ("📊 نظرة سريعة:\n"
+               "• {active_campaigns}/{total_campaigns} حملة نشطة\n"
+               "• ${total_revenue:,.0f} إجمالي الإيرادات\n"
+               "• {total_conversions:,} إجمالي التحويلات\n"
+               "• {avg_roi:.1f}% متوسط عائد الاستثمار\n"
+               "• المصدر: {source}\n\n"),
+    },
+    'greeting.question': {
+        'fr': "Comment puis-je vous aider aujourd'hui ?",
+        'en': "How can I help you today?",
+        'ar': "كيف يمكنني مساعدتك اليوم؟",
+    },
+
+    # Filters taken from the question, shown above the report they restrict
+    'filters.window': {
+        'fr': "📅 Période : {date_from} → {date_to}\n",
+        'en': "📅 Period: {date_from} → {date_to}\n",
+        'ar': "📅 الفترة: {date_from} → {date_to}\n",
+    },
+    'filters.channel': {
+        'fr': "📡 Canal : {channel}\n",
+        'en': "📡 Channel: {channel}\n",
+        'ar': "📡 القناة: {channel}\n",
+    },
+
+    # Best channel
+    'best_channel.empty': {
+        'fr': "Aucune donnée de canal trouvée.",
+        'en': "No channel data found.",
+        'ar': "لم يتم العثور على بيانات القنوات.",
+    },
+    'best_channel.header': {
+        'fr': ("🏆 **Meilleur Canal de Performance** :\n\n"
+               "📊 **{channel}**\n"
+               "• ROI Moyen: {avg_roi:.1f}%\n"
+               "• Nombre de campagnes: {campaign_count}\n"
+               "• Revenus totaux: ${total_revenue:,.0f}\n"
+               "• Conversions totales: {total_conversions:,}\n\n"),
+        'en': ("🏆 **Best Performing Channel** :\n\n"
+               "📊 **{channel}**\n"
+               "• Average ROI: {avg_roi:.1f}%\n"
+               "• Campaign count: {campaign_count}\n"
+               "• Total revenue: ${total_revenue:,.0f}\n"
+               "• Total conversions: {total_conversions:,}\n\n"),
+        'ar': ("🏆 **أفضل قناة أداء** :\n\n"
+               "📊 **{channel}**\n"
+               "• متوسط عائد الاستثمار: {avg_roi:.1f}%\n"
+               "• عدد الحملات: {campaign_count}\n"
+               "• إجمالي الإيرادات: ${total_revenue:,.0f}\n"
+               "• إجمالي التحويلات: {total_conversions:,}\n\n"),
+    },
+    'best_channel.top_header': {
+        'fr': "📈 **Top {count} canaux** :\n",
+        'en': "📈 **Top {count} channels** :\n",
+        'ar': "📈 **أفضل {count} قنوات** :\n",
+    },
+    'best_channel.top_row': {
+        'fr': "{index}. {channel}: {avg_roi:.1f}% ROI\n",
+        'en': "{index}. {channel}: {avg_roi:.1f}% ROI\n",
+        'ar': "{index}. {channel}: {avg_roi:.1f}% عائد\n",
+    },
+
+    # Worst campaigns
+    'worst_campaigns.empty': {
+        'fr': "Aucune donnée de campagne trouvée.",
+        'en': "No campaign data found.",
+        'ar': "لم يتم العثور على بيانات حملات.",
+    },
+    'worst_campaigns.header': {
+        'fr': "📉 **Campagnes les Moins Performantes** :\n\n",
+        'en': "📉 **Worst Performing Campaigns** :\n\n",
+        'ar': "📉 **أسوأ الحملات أداءً** :\n\n",
+    },
+    'worst_campaigns.row': {
+        'fr': ("{index}. **{name}**\n"
+               "   • ROI: {roi:.1f}%\n"
+               "   • Revenus: ${revenue:,.0f}\n"
+               "   • Coût: ${cost:,.0f}\n"
+               "   • Statut: {status}\n\n"),
+        'en': ("{index}. **{name}**\n"
+               "   • ROI: {roi:.1f}%\n"
+               "   • Revenue: ${revenue:,.0f}\n"
+               "   • Cost: ${cost:,.0f}\n"
+               "   • Status: {status}\n\n"),
+        'ar': ("{index}. **{name}**\n"
+               "   • عائد الاستثمار: {roi:.1f}%\n"
+               "   • الإيرادات: ${revenue:,.0f}\n"
+               "   • التكلفة: ${cost:,.0f}\n"
+               "   • الحالة: {status}\n\n"),
+    },
+
+    # Top campaigns
+    'campaigns.empty': {
+        'fr': "Aucune donnée de campagne trouvée. Créez quelques campagnes pour commencer !",
+        'en': "No campaign data found. Create some campaigns to get started!",
+        'ar': "لم يتم العثور على بيانات حملات. أنشئ بعض الحملات للبدء!",
+    },
+    'campaigns.header': {
+        'fr': "📊 **Vos Meilleures Campagnes** ({source}):\n\n",
+        'en': "📊 **Your Top Campaigns** ({source}):\n\n",
+        'ar': "📊 **أفضل حملاتك** ({source}):\n\n",
+    },
+    'campaigns.row': {
+        'fr': ("{index}. **{name}**\n"
+               "   💰 ROI: {roi:.1f}%\n"
+               "   💵 Revenus: ${revenue:,.0f}\n"
+               "   🎯 Conversions: {conversions}\n"
+               "   📊 Statut: {status}\n\n"),
+        'en': ("{index}. **{name}**\n"
+               "   💰 ROI: {roi:.1f}%\n"
+               "   💵 Revenue: ${revenue:,.0f}\n"
+               "   🎯 Conversions: {conversions}\n"
+               "   📊 Status: {status}\n\n"),
+        'ar': ("{index}. **{name}**\n"
+               "   💰 عائد الاستثمار: {roi:.1f}%\n"
+               "   💵 الإيرادات: ${revenue:,.0f}\n"
+               "   🎯 التحويلات: {conversions}\n"
+               "   📊 الحالة: {status}\n\n"),
+    },
+
+    # ROI
+    'roi.empty': {
+        'fr': "Aucune donnée de ROI disponible.",
+        'en': "No ROI data available.",
+        'ar': "لا توجد بيانات عائد استثمار متاحة.",
+    },
+    'roi.report': {
+        'fr': ("💰 **Analyse du ROI** :\n\n"
+               "📊 ROI moyen: **{avg_roi:.1f}%**\n"
+               "🎯 Campagnes rentables: **{profitable_campaigns}/{total_campaigns}**\n"
+               "🏆 Meilleur ROI: **{best_roi:.1f}%**\n"
+               "📉 Plus faible ROI: **{worst_roi:.1f}%**\n"
+               "📈 ROI global: **{overall_roi:.1f}%**\n\n"),
+        'en': ("💰 **ROI Analysis** :\n\n"
+               "📊 Average ROI: **{avg_roi:.1f}%**\n"
+               "🎯 Profitable campaigns: **{profitable_campaigns}/{total_campaigns}**\n"
+               "🏆 Best ROI: **{best_roi:.1f}%**\n"
+               "📉 Worst ROI: **{worst_roi:.1f}%**\n"
+               "📈 Overall ROI: **{overall_roi:.1f}%**\n\n"),
+        'ar': ("💰 **تحليل عائد الاستثمار** :\n\n"
+               "📊 متوسط عائد الاستثمار: **{avg_roi:.1f}%**\n"
+               "🎯 حملات مربحة: **{profitable_campaigns}/{total_campaigns}**\n"
+               "🏆 أفضل عائد: **{best_roi:.1f}%**\n"
+               "📉 أقل عائد: **{worst_roi:.1f}%**\n"
+               "📈 العائد الإجمالي: **{overall_roi:.1f}%**\n\n"),
+    },
+    'roi.outstanding': {
+        'fr': "🚀 **Exceptionnel !** Vos campagnes génèrent des profits extraordinaires !",
+        'en': "🚀 **Outstanding!** Your campaigns are generating exceptional profits!",
+        'ar': "🚀 **استثنائي !** حملاتك تحقق أرباحاً مذهلة !",
+    },
+    'roi.excellent': {
+        'fr': "✅ **Excellent !** Vos campagnes sont très rentables.",
+        'en': "✅ **Excellent!** Your campaigns are highly profitable.",
+        'ar': "✅ **ممتاز !** حملاتك مربحة جداً.",
+    },
+    'roi.good': {
+        'fr': "👍 **Bon !** Performance solide, vous pouvez optimiser davantage.",
+        'en': "👍 **Good!** Solid performance, room for optimization.",
+        'ar': "👍 **جيد !** أداء قوي، يمكنك التحسين أكثر.",
+    },
+    'roi.attention': {
+        'fr': "⚠️ **Attention !** Le ROI pourrait être amélioré.",
+        'en': "⚠️ **Attention!** ROI could be improved.",
+        'ar': "⚠️ **تنبيه !** عائد الاستثمار يحتاج تحسين.",
+    },
+
+    # Conversions
+    'conversion.empty': {
+        'fr': "Aucune donnée de conversion disponible.",
+        'en': "No conversion data available.",
+        'ar': "لا توجد بيانات تحويل متاحة.",
+    },
+    'conversion.header': {
+        'fr': ("🎯 **Analyse des Conversions** :\n\n"
+               "📈 Total des conversions: **{total_conversions:,}**\n"
+               "📊 Taux de conversion moyen: **{avg_rate:.2f}%**\n\n"
+               "🏆 **Top performers** :\n"),
+        'en': ("🎯 **Conversion Analysis** :\n\n"
+               "📈 Total conversions: **{total_conversions:,}**\n"
+               "📊 Average conversion rate: **{avg_rate:.2f}%**\n\n"
+               "🏆 **Top performers** :\n"),
+        'ar': ("🎯 **تحليل التحويلات** :\n\n"
+               "📈 إجمالي التحويلات: **{total_conversions:,}**\n"
+               "📊 متوسط معدل التحويل: **{avg_rate:.2f}%**\n\n"
+               "🏆 **الأفضل أداءً** :\n"),
+    },
+    'conversion.row': {
+        'fr': ("{index}. **{name}**\n"
+               "   • {conversions} conversions\n"
+               "   • Taux: {conversion_rate:.2f}%\n\n"),
+        'en': ("{index}. **{name}**\n"
+               "   • {conversions} conversions\n"
+               "   • Rate: {conversion_rate:.2f}%\n\n"),
+        'ar': ("{index}. **{name}**\n"
+               "   • {conversions} تحويل\n"
+               "   • المعدل: {conversion_rate:.2f}%\n\n"),
+    },
+
+    # Performance by status
+    'performance.empty': {
+        'fr': "Aucune donnée de performance disponible.",
+        'en': "No performance data available.",
+        'ar': "لا توجد بيانات أداء متاحة.",
+    },
+    'performance.header': {
+        'fr': "📊 **Rapport de Performance des Campagnes** :\n\n",
+        'en': "📊 **Campaign Performance Report** :\n\n",
+        'ar': "📊 **تقرير أداء الحملات** :\n\n",
+    },
+    'performance.row': {
+        'fr': ("🔴 **Campagnes {status_label}** :\n"
+               "   • Nombre: {campaign_count}\n"
+               "   • ROI moyen: {avg_roi:.1f}%\n"
+               "   • Revenus: ${total_revenue:,.0f}\n"
+               "   • Conversions: {total_conversions:,}\n\n"),
+        'en': ("🔴 **{status_label} Campaigns** :\n"
+               "   • Count: {campaign_count}\n"
+               "   • Avg ROI: {avg_roi:.1f}%\n"
+               "   • Revenue: ${total_revenue:,.0f}\n"
+               "   • Conversions: {total_conversions:,}\n\n"),
+        'ar': ("🔴 **الحملات ال{status_label}** :\n"
+               "   • العدد: {campaign_count}\n"
+               "   • متوسط عائد الاستثمار: {avg_roi:.1f}%\n"
+               "   • الإيرادات: ${total_revenue:,.0f}\n"
+               "   • التحويلات: {total_conversions:,}\n\n"),
+    },
+
+    # Budget
+    'budget.empty': {
+        'fr': "Aucune donnée de budget disponible.",
+        'en': "No budget data available.",
+        'ar': "لا توجد بيانات ميزانية متاحة.",
+    },
+    'budget.header': {
+        'fr': ("💰 **Analyse du Budget** :\n\n"
+               "📊 Budget total actif: **${total_cost:,.0f}**\n"
+               "💵 Revenus générés: **${total_revenue:,.0f}**\n"
+               "📈 Efficacité globale: **{efficiency:.1f}% ROI**\n\n"
+               "🏆 **Campagnes à plus gros budget** :\n"),
+        'en': ("💰 **Budget Analysis** :\n\n"
+               "📊 Total active budget: **${total_cost:,.0f}**\n"
+               "💵 Revenue generated: **${total_revenue:,.0f}**\n"
+               "📈 Overall efficiency: **{efficiency:.1f}% ROI**\n\n"
+               "🏆 **Highest budget campaigns** :\n"),
+        'ar': ("💰 **تحليل الميزانية** :\n\n"
+               "📊 إجمالي الميزانية النشطة: **${total_cost:,.0f}**\n"
+               "💵 الإيرادات المحققة: **${total_revenue:,.0f}**\n"
+               "📈 الكفاءة الإجمالية: **{efficiency:.1f}% عائد استثمار**\n\n"
+               "🏆 **الحملات الأعلى ميزانية** :\n"),
+    },
+    'budget.row': {
+        'fr': ("{index}. **{name}**\n"
+               "   • Budget: ${cost:,.0f}\n"
+               "   • Revenus: ${revenue:,.0f}\n"
+               "   • ROI: {roi:.1f}%\n\n"),
+        'en': ("{index}. **{name}**\n"
+               "   • Budget: ${cost:,.0f}\n"
+               "   • Revenue: ${revenue:,.0f}\n"
+               "   • ROI: {roi:.1f}%\n\n"),
+        'ar': ("{index}. **{name}**\n"
+               "   • الميزانية: ${cost:,.0f}\n"
+               "   • الإيرادات: ${revenue:,.0f}\n"
+               "   • عائد الاستثمار: {roi:.1f}%\n\n"),
+    },
+}
+
+# Campaign status labels in the performance report (English uses str.title())
+STATUS_LABELS = {
+    'fr': {'active': 'Actives', 'paused': 'En pause', 'completed': 'Terminées'},
+    'ar': {'active': 'نشطة', 'paused': 'متوقفة', 'completed': 'مكتملة'},
+}
+
+chat_catalog = MessageCatalog(CHAT_MESSAGES)
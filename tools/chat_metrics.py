@@ -0,0 +1,243 @@
+import functools
+import inspect
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from odoo.tools import config
+
+# Upper bounds (ms) of the latency histogram buckets; the last one is open
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+_TRACED = ('round_trips', 'rows', 'db_ms', 'connect_ms')
+_COUNTERS = _TRACED + ('odoo_queries',)
+
+
+class _Trace(threading.local):
+    """Per-thread running totals; spans read their deltas from them"""
+
+    def __init__(self):
+        self.round_trips = 0
+        self.rows = 0
+        self.db_ms = 0.0
+        self.connect_ms = 0.0
+        self.sources = set()
+
+
+class _Series:
+    """Aggregates of one operation over one time slot"""
+
+    __slots__ = ('count', 'errors', 'buckets', 'totals', 'sources')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.totals = dict.fromkeys(('wall_ms',) + _COUNTERS, 0)
+        self.sources = {}
+
+    def merge(self, other):
+        self.count += other.count
+        self.errors += other.errors
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+        for key, value in other.totals.items():
+            self.totals[key] += value
+        for source, count in other.sources.items():
+            self.sources[source] = self.sources.get(source, 0) + count
+
+
+def _bucket_percentile(buckets, count, pct):
+    """Upper bound of the bucket holding the ``pct`` percentile (None past the last bound)"""
+    rank = pct / 100.0 * count
+    seen = 0
+    for index, bucket in enumerate(buckets):
+        seen += bucket
+        if seen >= rank and bucket:
+            return LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else None
+    return None
+
+
+class ChatMetrics:
+    """Rolling per-operation latency histograms and data-access counters.
+
+    Samples go to one-minute slots kept for ``window`` minutes, so the
+    snapshot always covers the recent past. When ``enabled`` is false the
+    instrumented methods only pay for one attribute check.
+    """
+
+    def __init__(self, enabled=False, window=15, slot_seconds=60):
+        self.enabled = enabled
+        self.window = window
+        self.slot_seconds = slot_seconds
+        self._lock = threading.Lock()
+        self._slots = {}  # slot number -> {operation: _Series}
+        self._trace = _Trace()
+
+    # Data access hooks, called from the service while a span is open
+
+    def note_query(self, rows, db_seconds, connect_seconds=0.0):
+        trace = self._trace
+        trace.round_trips += 1
+        trace.rows += rows
+        trace.db_ms += db_seconds * 1000
+        trace.connect_ms += connect_seconds * 1000
+        trace.sources.add('postgresql')
+
+    def note_source(self, source):
+        self._trace.sources.add(source)
+
+    # Work handed to another thread records on that thread's trace: run it
+    # with ``run_traced`` there and ``merge_trace`` the counters back here
+
+    def run_traced(self, func, *args, **kwargs):
+        """Call ``func`` and return (result, data access it recorded on this thread)"""
+        trace = self._trace
+        before = [getattr(trace, key) for key in _TRACED]
+        sources = trace.sources
+        trace.sources = set()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            counters = {key: getattr(trace, key) - value for key, value in zip(_TRACED, before)}
+            counters['sources'] = trace.sources
+            trace.sources = sources | counters['sources']
+        return result, counters
+
+    def merge_trace(self, counters):
+        """Add counters returned by ``run_traced`` on another thread to this thread's trace"""
+        trace = self._trace
+        for key in _TRACED:
+            setattr(trace, key, getattr(trace, key) + counters[key])
+        trace.sources |= counters['sources']
+
+    # Recording
+
+    def _record(self, operation, wall_ms, deltas, sources, failed):
+        slot = int(time.time() // self.slot_seconds)
+        with self._lock:
+            series = self._slots.setdefault(slot, {}).get(operation)
+            if series is None:
+                series = self._slots[slot][operation] = _Series()
+                for old in [key for key in self._slots if key <= slot - self.window]:
+                    del self._slots[old]
+            series.count += 1
+            series.errors += failed
+            series.buckets[bisect_left(LATENCY_BUCKETS_MS, wall_ms)] += 1
+            series.totals['wall_ms'] += wall_ms
+            for key, value in deltas.items():
+                series.totals[key] += value
+            source = '+'.join(sorted(sources)) or 'none'
+            series.sources[source] = series.sources.get(source, 0) + 1
+
+    @contextmanager
+    def span(self, operation, env):
+        """Record the wall time and data access of the enclosed block under ``operation``"""
+        trace = self._trace
+        before = [getattr(trace, key) for key in _TRACED]
+        sources = trace.sources
+        trace.sources = set()
+        odoo_before = env.cr.sql_log_count
+        start = time.perf_counter()
+        failed = True
+        try:
+            yield
+            failed = False
+        except GeneratorExit:
+            # A stream closed early by its consumer did not fail
+            failed = False
+            raise
+        finally:
+            wall_ms = (time.perf_counter() - start) * 1000
+            deltas = {key: getattr(trace, key) - value for key, value in zip(_TRACED, before)}
+            deltas['odoo_queries'] = env.cr.sql_log_count - odoo_before
+            if deltas['odoo_queries']:
+                trace.sources.add('odoo')
+            own_sources = trace.sources
+            trace.sources = sources | own_sources
+            self._record(operation, wall_ms, deltas, own_sources, failed)
+
+    def measure(self, operation, func, env, *args, **kwargs):
+        """Call ``func`` and record its wall time and data access under ``operation``"""
+        with self.span(operation, env):
+            return func(*args, **kwargs)
+
+    def measure_iter(self, operation, iterator, env):
+        """Yield from ``iterator``, recording the whole consumption under ``operation``"""
+        with self.span(operation, env):
+            yield from iterator
+
+    def snapshot(self):
+        """Aggregated view of the current window, per operation"""
+        oldest = int(time.time() // self.slot_seconds) - self.window
+        merged = {}
+        with self._lock:
+            for slot, series_by_operation in self._slots.items():
+                if slot <= oldest:
+                    continue
+                for operation, series in series_by_operation.items():
+                    merged.setdefault(operation, _Series()).merge(series)
+
+        operations = {}
+        for operation, series in sorted(merged.items()):
+            count = series.count
+            operations[operation] = {
+                'count': count,
+                'errors': series.errors,
+                'wall_ms': {
+                    'mean': series.totals['wall_ms'] / count,
+                    'p50': _bucket_percentile(series.buckets, count, 50),
+                    'p95': _bucket_percentile(series.buckets, count, 95),
+                    'p99': _bucket_percentile(series.buckets, count, 99),
+                },
+                'histogram': dict(zip([f"le_{bound}" for bound in LATENCY_BUCKETS_MS] + ['inf'], series.buckets)),
+                'per_call': {key: series.totals[key] / count for key in _COUNTERS},
+                'sources': series.sources,
+            }
+        return {
+            'enabled': self.enabled,
+            'pid': os.getpid(),
+            'window_seconds': self.window * self.slot_seconds,
+            'operations': operations,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._slots.clear()
+
+
+chat_metrics = ChatMetrics(enabled=bool(config.get('ai_marketing_metrics')))
+
+
+def instrumented(operation=None):
+    """Decorator recording a model method in ``chat_metrics`` when enabled.
+
+    A generator method is recorded from its first chunk to its last.
+    """
+    def decorate(method):
+        name = operation or method.__name__
+
+        if inspect.isgeneratorfunction(method):
+            @functools.wraps(method)
+            def stream_wrapper(self, *args, **kwargs):
+                if not chat_metrics.enabled:
+                    return method(self, *args, **kwargs)
+                return chat_metrics.measure_iter(name, method(self, *args, **kwargs), self.env)
+            return stream_wrapper
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not chat_metrics.enabled:
+                return method(self, *args, **kwargs)
+            return chat_metrics.measure(name, method, self.env, self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def instrument_methods(cls, prefix):
+    """Wrap every method of ``cls`` whose name starts with ``prefix``"""
+    for name, member in list(vars(cls).items()):
+        if name.startswith(prefix) and callable(member):
+            setattr(cls, name, instrumented(name)(member))
+    return cls
@@ -0,0 +1,93 @@
+import threading
+import time
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Stop calling a failing dependency until it had time to recover.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    ``allow`` refuses every call for ``reset_timeout`` seconds. It then lets
+    a single probe through (half-open): its success closes the circuit, its
+    failure opens it for another ``reset_timeout``.
+    """
+
+    def __init__(self, name, failure_threshold=3, reset_timeout=30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self.total_failures = 0
+        self.rejected = 0
+        self.last_error = None
+
+    def _probe_due(self):
+        return time.monotonic() - self._opened_at >= self.reset_timeout
+
+    def allow(self):
+        """True if a call may go through; claims the probe when half-open"""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN and self._probe_due():
+                self._state = HALF_OPEN
+            if self._state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def is_open(self):
+        """True while calls are refused and no probe is due yet"""
+        with self._lock:
+            if self._state == CLOSED:
+                return False
+            if self._state == OPEN:
+                return not self._probe_due()
+            return self._probing
+
+    def record_success(self):
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self, error=None):
+        with self._lock:
+            self._failures += 1
+            self.total_failures += 1
+            self.last_error = str(error) if error is not None else None
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+    def release(self):
+        """Give back a claimed probe that neither succeeded nor failed"""
+        with self._lock:
+            self._probing = False
+
+    def stats(self):
+        with self._lock:
+            retry_in = None
+            if self._state == OPEN:
+                retry_in = max(self.reset_timeout - (time.monotonic() - self._opened_at), 0.0)
+            return {
+                'name': self.name,
+                'state': self._state,
+                'consecutive_failures': self._failures,
+                'failure_threshold': self.failure_threshold,
+                'reset_timeout': self.reset_timeout,
+                'retry_in': retry_in,
+                'total_failures': self.total_failures,
+                'rejected': self.rejected,
+                'last_error': self.last_error,
+            }
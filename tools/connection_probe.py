@@ -0,0 +1,97 @@
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import psycopg2
+
+_logger = logging.getLogger(__name__)
+
+
+def _connect(params):
+    """Open a connection and return it with the time it took"""
+    start = time.monotonic()
+    try:
+        connection = psycopg2.connect(**params)
+    except Exception as e:
+        return None, time.monotonic() - start, e
+    return connection, time.monotonic() - start, None
+
+
+def _close_late(future):
+    """Close a connection that succeeded after another profile already won"""
+    connection, _elapsed, _error = future.result()
+    if connection is not None:
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+def probe_profiles(profiles, connect_params, timeout):
+    """Try every credential profile concurrently; the first to connect wins.
+
+    ``profiles`` are dicts with ``user``, ``password`` and ``desc`` overlaid
+    on ``connect_params``. Returns ``(connection, profile, attempts)`` where
+    ``connection`` is None if every profile failed and ``attempts`` lists,
+    in profile order, the outcome and latency of each probe. Probes still
+    running when a winner is found are abandoned and their connection closed
+    when they complete.
+    """
+    attempts = [{'desc': profile['desc'], 'user': profile['user'], 'status': 'cancelled',
+                 'latency': None, 'error': None} for profile in profiles]
+    if not profiles:
+        return None, None, attempts
+
+    executor = ThreadPoolExecutor(max_workers=len(profiles), thread_name_prefix='ai_marketing.probe')
+    futures = {}
+    for index, profile in enumerate(profiles):
+        params = dict(connect_params, user=profile['user'], password=profile['password'],
+                      connect_timeout=timeout)
+        futures[executor.submit(_connect, params)] = index
+
+    winner = None
+    pending = set(futures)
+    deadline = time.monotonic() + timeout + 1
+    try:
+        while pending and winner is None:
+            done, pending = wait(pending, timeout=max(deadline - time.monotonic(), 0),
+                                 return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                index = futures[future]
+                connection, elapsed, error = future.result()
+                attempt = attempts[index]
+                attempt['latency'] = elapsed
+                if connection is None:
+                    attempt['status'] = 'failed'
+                    attempt['error'] = str(error).strip()
+                    _logger.warning(f"Connection failed with {attempt['desc']}: {attempt['error']}")
+                elif winner is None:
+                    attempt['status'] = 'ok'
+                    winner = (connection, profiles[index])
+                else:
+                    attempt['status'] = 'ok'
+                    connection.close()
+    finally:
+        for future in pending:
+            if not future.cancel():
+                future.add_done_callback(_close_late)
+        executor.shutdown(wait=False)
+
+    if winner is None:
+        return None, None, attempts
+    return winner[0], winner[1], attempts
+
+
+def format_attempts(attempts):
+    """One line per probe: outcome, latency and error"""
+    icons = {'ok': '✅', 'failed': '❌', 'cancelled': '⏹️'}
+    lines = []
+    for attempt in attempts:
+        latency = f"{attempt['latency'] * 1000:.0f} ms" if attempt['latency'] is not None else '-'
+        line = f"{icons[attempt['status']]} {attempt['desc']}: {attempt['status']} ({latency})"
+        if attempt['error']:
+            line += f" - {attempt['error']}"
+        lines.append(line)
+    return "\n".join(lines)
@@ -0,0 +1,94 @@
+import re
+
+# Keyword tables used to classify chat questions, in tie-break order
+QUESTION_KEYWORDS = {
+    'greeting': ['hello', 'hi', 'hey', 'bonjour', 'salut', 'مرحبا', 'أهلا'],
+    'campaign': ['campaign', 'campaigns', 'campagne', 'campagnes', 'حملة', 'حملات', 'ads', 'advertising'],
+    'roi': ['roi', 'return', 'profit', 'rentabilité', 'bénéfice', 'عائد', 'ربح', 'profitable'],
+    'conversion': ['conversion', 'convert', 'conversions', 'تحويل', 'تحويلات', 'rate', 'taux'],
+    'performance': ['performance', 'performances', 'résultats', 'أداء', 'نتائج', 'results', 'analytics'],
+    'budget': ['budget', 'cost', 'coût', 'coûts', 'ميزانية', 'تكلفة', 'spend', 'spending'],
+    'best_channel': ['best channel', 'top performing', 'meilleur canal', 'أفضل قناة'],
+    'worst_campaigns': ['worst performing', 'low performance', 'pire performance', 'أسوأ أداء'],
+    'help': ['help', 'aide', 'مساعدة', 'how', 'comment', 'كيف'],
+    'time': ['time', 'when', 'date', 'today', 'temps', 'quand', 'وقت', 'متى'],
+    'math': ['calculate', 'computation', 'math', 'calculer', 'حساب'],
+    'personal': ['who are you', 'your name', 'qui es-tu', 'من أنت'],
+}
+
+
+def _trie_pattern(words):
+    """Regex source matching any of ``words``, factored on common prefixes.
+
+    Optional suffixes are greedy, so the longest word starting at the match
+    position wins.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:%s)' % '|'.join(branches)
+        return '(?:%s)?' % body if '' in node else body
+
+    return build(trie)
+
+
+class IntentClassifier:
+    """Multi-pattern keyword matcher compiled once from a keyword table.
+
+    All keywords are folded into a single prefix-factored lookahead, so one
+    ``findall`` pass reports the longest keyword starting at every position.
+    Every other keyword matching at that position is a prefix of it and is
+    credited through a precomputed prefix map, which keeps the results
+    identical to testing each keyword with ``in``.
+    """
+
+    def __init__(self, keyword_table, default='general'):
+        self.default = default
+        self.categories = list(keyword_table)
+        self._categories_by_keyword = {}
+        for category, keywords in keyword_table.items():
+            for keyword in keywords:
+                self._categories_by_keyword.setdefault(keyword, []).append(category)
+
+        keywords = list(self._categories_by_keyword)
+        first_chars = ''.join(sorted({keyword[0] for keyword in keywords}))
+        self._pattern = re.compile('(?=[%s])(?=(%s))' % (re.escape(first_chars), _trie_pattern(keywords)))
+        self._implied = {
+            keyword: [other for other in keywords if keyword.startswith(other)]
+            for keyword in keywords
+        }
+
+    def matched_keywords(self, message_lower):
+        found = set()
+        for keyword in set(self._pattern.findall(message_lower)):
+            found.update(self._implied[keyword])
+        return found
+
+    def scores(self, message_lower):
+        """Number of distinct keywords found per category (categories without hits omitted)"""
+        scores = {}
+        for keyword in self.matched_keywords(message_lower):
+            for category in self._categories_by_keyword[keyword]:
+                scores[category] = scores.get(category, 0) + 1
+        return scores
+
+    def classify(self, message_lower):
+        scores = self.scores(message_lower)
+        if not scores:
+            return self.default
+        # Ties go to the category listed first in the keyword table
+        return max(
+            (category for category in self.categories if category in scores),
+            key=scores.get,
+        )
+
+
+question_classifier = IntentClassifier(QUESTION_KEYWORDS)
@@ -0,0 +1,206 @@
+import json
+import logging
+import threading
+from datetime import date, timedelta
+
+import psycopg2
+
+from .marketing_queries import (DEFAULT_QUERY_PARAMS, MARKETING_QUERIES, TOP_N_QUERIES, WINDOWED_QUERIES,
+                               query_variant)
+from .marketing_summary import _SCHEMA_LOCK_ID
+from .sample_data import GENERATED_COLUMNS, GENERATED_COLUMNS_SQL
+
+_logger = logging.getLogger(__name__)
+
+# (name, definition after "ON marketing_data", queries it serves)
+MARKETING_INDEXES = [
+    ('marketing_data_active_cost_idx', "(cost DESC) WHERE status = 'active'",
+     ('active_cost',)),
+    ('marketing_data_channel_status_idx', "(channel, status)",
+     ('by_channel', 'by_status', 'channels')),
+    ('marketing_data_roi_column_idx', "(roi)",
+     ('best_roi', 'worst_roi', 'roi_bounds')),
+    ('marketing_data_active_conversion_rate_idx', "(conversion_rate DESC) WHERE status = 'active' AND cost > 0",
+     ('active_conversion_rate',)),
+    ('marketing_data_created_date_idx', "(created_date)",
+     tuple(f"{name} (window)" for name in WINDOWED_QUERIES)),
+]
+
+# Expression indexes superseded by the indexes on the generated columns
+RETIRED_INDEXES = ('marketing_data_roi_idx', 'marketing_data_active_conversion_idx')
+
+_columns_ready = set()
+_columns_lock = threading.Lock()
+
+
+def generated_columns_present(connection):
+    """Whether marketing_data has the generated ROI / conversion rate columns.
+
+    Read-only, so it is safe on the chat read path; a positive answer is
+    remembered per process and database.
+    """
+    dsn = connection.dsn
+    if dsn in _columns_ready:
+        return True
+    names = [name for name, _type, _expression in GENERATED_COLUMNS]
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT count(*) FROM information_schema.columns
+            WHERE table_name = 'marketing_data' AND column_name = ANY(%s)
+        """, (names,))
+        present = cursor.fetchone()[0] == len(names)
+    connection.rollback()
+    if present:
+        _columns_ready.add(dsn)
+    return present
+
+
+def ensure_generated_columns(connection):
+    """Add the generated ROI / conversion rate columns when they are missing.
+
+    Adding them to an existing table rewrites it under an exclusive lock, so
+    this only runs from the test wizard, the sample loader and the
+    benchmark, never from a chat request. Returns False when marketing_data
+    does not exist or cannot be upgraded.
+    """
+    with _columns_lock:
+        try:
+            if generated_columns_present(connection):
+                return True
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT to_regclass('marketing_data')")
+                if not cursor.fetchone()[0]:
+                    connection.rollback()
+                    return False
+                _logger.info("Adding the generated roi / conversion_rate columns to marketing_data")
+                cursor.execute("SELECT pg_advisory_xact_lock(%s)", (_SCHEMA_LOCK_ID,))
+                cursor.execute(GENERATED_COLUMNS_SQL)
+            connection.commit()
+        except psycopg2.Error as e:
+            connection.rollback()
+            _logger.warning(f"marketing_data generated columns unavailable: {str(e)}")
+            return False
+        _columns_ready.add(connection.dsn)
+        return True
+
+
+def index_status(connection):
+    """{index name: 'valid' | 'invalid' | 'missing'} for MARKETING_INDEXES.
+
+    The retired indexes still present are listed under the 'retired' key.
+    """
+    names = [name for name, _definition, _queries in MARKETING_INDEXES]
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT c.relname, x.indisvalid
+            FROM pg_class c
+            JOIN pg_index x ON x.indexrelid = c.oid
+            WHERE x.indrelid = 'marketing_data'::regclass AND c.relname = ANY(%s)
+        """, (names + list(RETIRED_INDEXES),))
+        found = dict(cursor.fetchall())
+    status = {name: 'missing' if name not in found else 'valid' if found[name] else 'invalid'
+              for name in names}
+    status['retired'] = [name for name in RETIRED_INDEXES if name in found]
+    return status
+
+
+def ensure_indexes(connection, concurrently=False):
+    """Create the missing MARKETING_INDEXES and rebuild invalid ones.
+
+    With ``concurrently`` the indexes are built with CREATE INDEX
+    CONCURRENTLY in autocommit mode, so writes to marketing_data are not
+    blocked; an interrupted concurrent build leaves an invalid index, which
+    the next call drops and rebuilds. Returns the names of the indexes built.
+    """
+    if not ensure_generated_columns(connection):
+        raise psycopg2.ProgrammingError("marketing_data has no generated roi / conversion_rate columns")
+    status = index_status(connection)
+    connection.rollback()
+    todo = [(name, definition) for name, definition, _queries in MARKETING_INDEXES
+            if status[name] != 'valid']
+    if not todo and not status['retired']:
+        return []
+
+    built = []
+    if concurrently:
+        connection.autocommit = True
+    try:
+        with connection.cursor() as cursor:
+            mode = "CONCURRENTLY " if concurrently else ""
+            for name in status['retired']:
+                cursor.execute(f'DROP INDEX {mode}IF EXISTS "{name}"')
+            for name, definition in todo:
+                if status[name] == 'invalid':
+                    cursor.execute(f'DROP INDEX {mode}IF EXISTS "{name}"')
+                cursor.execute(f'CREATE INDEX {mode}IF NOT EXISTS "{name}" ON marketing_data {definition}')
+                built.append(name)
+            cursor.execute("ANALYZE marketing_data")
+    finally:
+        if concurrently:
+            connection.autocommit = False
+    if not concurrently:
+        connection.commit()
+    _logger.info(f"marketing_data indexes built: {', '.join(built) or 'none'}")
+    return built
+
+
+def _plan_nodes(plan):
+    yield plan
+    for child in plan.get('Plans', ()):
+        yield from _plan_nodes(child)
+
+
+def explain_query(cursor, query, params=None):
+    """Planner summary of ``query``: total cost, scans, indexes used and sorts"""
+    cursor.execute("EXPLAIN (FORMAT JSON) " + query, params)
+    plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    root = plan[0]['Plan']
+    nodes = list(_plan_nodes(root))
+    return {
+        'cost': root['Total Cost'],
+        'seq_scan': any(node['Node Type'] == 'Seq Scan' for node in nodes),
+        'sort': any(node['Node Type'] in ('Sort', 'Incremental Sort') for node in nodes),
+        'indexes': sorted({node['Index Name'] for node in nodes if 'Index Name' in node}),
+    }
+
+
+def advise(connection):
+    """Report lines on the marketing_data indexes and the plans of the handler queries"""
+    lines = []
+    try:
+        if not generated_columns_present(connection):
+            lines.append("   ⚠️ generated roi / conversion_rate columns missing → "
+                         "click 'Optimize Indexes' to add them")
+            return lines
+        status = index_status(connection)
+        for name, _definition, queries in MARKETING_INDEXES:
+            icon = '✅' if status[name] == 'valid' else '⚠️'
+            lines.append(f"   {icon} {name} ({status[name]}) → {', '.join(queries)}")
+        for name in status['retired']:
+            lines.append(f"   ⚠️ {name} (retired, to drop)")
+
+        with connection.cursor() as cursor:
+            lines.append("")
+            for name, query in MARKETING_QUERIES.items():
+                plan = explain_query(cursor, query, DEFAULT_QUERY_PARAMS)
+                access = ', '.join(plan['indexes']) if plan['indexes'] else 'full scan'
+                if plan['sort']:
+                    access += ' + sort'
+                full_sort = plan['seq_scan'] and plan['sort']
+                icon = '⚠️' if name in TOP_N_QUERIES and full_sort else '•'
+                lines.append(f"   {icon} {name}: {access} (cost {plan['cost']:,.0f})")
+            window = dict(DEFAULT_QUERY_PARAMS, date_from=date.today() - timedelta(days=30))
+            for name in WINDOWED_QUERIES:
+                variant, query = query_variant(name, ('date_from',))
+                plan = explain_query(cursor, query, window)
+                access = ', '.join(plan['indexes']) if plan['indexes'] else 'full scan'
+                lines.append(f"   • {variant} (last 30 days): {access} (cost {plan['cost']:,.0f})")
+        if status['retired'] or any(status[name] != 'valid' for name, _d, _q in MARKETING_INDEXES):
+            lines.append("\n   💡 Click 'Optimize Indexes' to build the missing indexes")
+    except psycopg2.Error as e:
+        lines.append(f"   ❌ Error checking indexes: {str(e)}")
+    finally:
+        connection.rollback()
+    return lines
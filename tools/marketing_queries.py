@@ -0,0 +1,119 @@
+import functools
+
+from .marketing_summary import CONVERSION_RATE_SQL, ROI_SQL
+
+# Fixed queries the chat handlers run against the external marketing_data
+# table. They are kept here so the index advisor explains exactly the SQL
+# the handlers send. ROI and conversion rate are the stored generated
+# columns of sample_data.GENERATED_COLUMNS, indexed by marketing_indexes.
+# Campaign rows and groups have the same keys as those of the Odoo backend
+# of campaign_repository. Databases that predate the generated columns are
+# read through inline variants computing them on the fly.
+
+_CAMPAIGN_COLUMNS = "name, channel, status, cost, revenue, conversions, roi, conversion_rate"
+
+_GROUP_AGGREGATES = """
+            COUNT(*) as campaign_count,
+            AVG(roi) as avg_roi,
+            SUM(revenue) as total_revenue,
+            SUM(cost) as total_cost,
+            SUM(conversions) as total_conversions"""
+
+# name -> (select list, conditions, clauses after WHERE)
+_QUERY_SPECS = {
+    'best_roi': (_CAMPAIGN_COLUMNS, (), "ORDER BY roi DESC\n        LIMIT %(limit)s"),
+    'worst_roi': (_CAMPAIGN_COLUMNS, (), "ORDER BY roi ASC\n        LIMIT %(limit)s"),
+    'active_cost': (_CAMPAIGN_COLUMNS, ("status = 'active'",), "ORDER BY cost DESC\n        LIMIT %(limit)s"),
+    'active_conversion_rate': (
+        _CAMPAIGN_COLUMNS, ("status = 'active'", "cost > 0"),
+        "ORDER BY conversion_rate DESC\n        LIMIT %(limit)s"),
+    'by_channel': (
+        "channel," + _GROUP_AGGREGATES, ("channel IS NOT NULL",),
+        "GROUP BY channel\n        ORDER BY avg_roi DESC\n        LIMIT %(limit)s"),
+    'by_status': (
+        "status," + _GROUP_AGGREGATES, (),
+        "GROUP BY status\n        ORDER BY avg_roi DESC\n        LIMIT %(limit)s"),
+    'roi_bounds': ("""
+            MAX(roi) as best_roi,
+            MIN(roi) as worst_roi""", (), ""),
+    'totals': ("""
+            COUNT(*) as total_campaigns,
+            COUNT(CASE WHEN status = 'active' THEN 1 END) as active_campaigns,
+            COUNT(CASE WHEN status = 'paused' THEN 1 END) as paused_campaigns,
+            COUNT(CASE WHEN status = 'completed' THEN 1 END) as completed_campaigns,
+            COUNT(CASE WHEN roi > 100 THEN 1 END) as profitable_campaigns,
+            COALESCE(SUM(cost), 0) as total_cost,
+            COALESCE(SUM(revenue), 0) as total_revenue,
+            COALESCE(SUM(conversions), 0) as total_conversions,
+            COALESCE(AVG(roi), 0) as avg_roi,
+            MAX(roi) as best_roi,
+            MIN(roi) as worst_roi""", (), ""),
+    'channels': ("DISTINCT channel", ("channel IS NOT NULL",), ""),
+    'any_campaign': ("1 AS found", (), "LIMIT 1"),
+}
+
+# Optional filters pushed down from the question (see question_filters),
+# with the one-letter code naming the query variant that uses them
+FILTER_PREDICATES = {
+    'date_from': ('f', "created_date >= %(date_from)s"),
+    'date_to': ('t', "created_date < %(date_to)s"),
+    'channel': ('c', "channel = %(channel)s"),
+}
+
+
+# Stands in for marketing_data when it has no generated roi / conversion_rate columns
+_INLINE_RELATION = (f"(SELECT *, {ROI_SQL} AS roi, {CONVERSION_RATE_SQL} AS conversion_rate "
+                    "FROM marketing_data) AS marketing_data")
+
+
+def _build_query(name, predicates=(), inline=False):
+    select, conditions, tail = _QUERY_SPECS[name]
+    conditions = list(conditions) + [FILTER_PREDICATES[predicate][1] for predicate in predicates]
+    lines = [f"SELECT {select.strip()}", "FROM " + (_INLINE_RELATION if inline else "marketing_data")]
+    if conditions:
+        lines.append("WHERE " + " AND ".join(conditions))
+    if tail:
+        lines.append(tail)
+    return "\n        " + "\n        ".join(lines) + "\n    "
+
+
+MARKETING_QUERIES = {name: _build_query(name) for name in _QUERY_SPECS}
+
+# variant name -> (query name, predicates) of the variants built so far
+_VARIANTS = {name: (name, ()) for name in _QUERY_SPECS}
+
+
+@functools.lru_cache(maxsize=None)
+def query_variant(name, predicates=(), inline=False):
+    """(variant name, SQL) of query ``name`` restricted by the FILTER_PREDICATES in ``predicates``.
+
+    With ``inline`` the variant computes roi and conversion_rate from the
+    other columns instead of reading the generated columns.
+    """
+    if not predicates and not inline:
+        return name, MARKETING_QUERIES[name]
+    predicates = tuple(sorted(predicates))
+    suffix = ''.join(FILTER_PREDICATES[predicate][0] for predicate in predicates)
+    variant = f"{name}_{suffix}" if suffix else name
+    if inline:
+        variant += '_inline'
+    _VARIANTS[variant] = (name, predicates)
+    return variant, _build_query(name, predicates, inline)
+
+
+def inline_variant(variant):
+    """(variant name, SQL) of the inline form of the ``variant`` returned by query_variant"""
+    name, predicates = _VARIANTS[variant]
+    return query_variant(name, predicates, inline=True)
+
+
+# Parameters used when a query is explained on its own
+DEFAULT_QUERY_PARAMS = {'limit': 5}
+
+# Queries returning a handful of rows out of the whole table: an index
+# should serve them without a full scan and sort once the table is large
+TOP_N_QUERIES = ('best_roi', 'worst_roi', 'active_cost', 'active_conversion_rate', 'roi_bounds')
+
+# Aggregates asked for over a recent window ("this month", "last 30 days"):
+# the created_date index should keep them off the rest of the history
+WINDOWED_QUERIES = ('totals', 'by_channel', 'by_status')
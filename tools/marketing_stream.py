@@ -0,0 +1,27 @@
+import itertools
+
+from psycopg2.extras import NamedTupleCursor
+
+from .pg_pool import marketing_connection
+
+# Rows fetched per round trip by server-side cursors
+DEFAULT_ITERSIZE = 2000
+
+_cursor_ids = itertools.count()
+
+
+def iter_marketing_rows(query, params=None, itersize=DEFAULT_ITERSIZE, named=False):
+    """Yield the rows of ``query`` from a server-side cursor.
+
+    Rows arrive ``itersize`` at a time so memory stays constant whatever
+    the size of the result. They are plain tuples, or namedtuples keyed by
+    column name when ``named`` is set. The pooled connection is held until
+    the generator is exhausted or closed.
+    """
+    name = f"ai_marketing_stream_{next(_cursor_ids)}"
+    with marketing_connection() as connection:
+        cursor_factory = NamedTupleCursor if named else None
+        with connection.cursor(name, cursor_factory=cursor_factory) as cursor:
+            cursor.itersize = itersize
+            cursor.execute(query, params or ())
+            yield from cursor
@@ -0,0 +1,214 @@
+import logging
+import threading
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+_logger = logging.getLogger(__name__)
+
+ROI_SQL = "CASE WHEN cost > 0 THEN ((revenue - cost) / cost) * 100 ELSE 0 END"
+CONVERSION_RATE_SQL = "CASE WHEN cost > 0 THEN (conversions::float / cost) * 100 ELSE 0 END"
+
+# marketing_data_summary holds one row for the whole external table, one per
+# channel and one per status. Statement-level triggers fold every INSERT,
+# UPDATE, DELETE and TRUNCATE on marketing_data into it, so statistics are read
+# from a handful of precomputed rows instead of scanning the campaigns.
+SUMMARY_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS marketing_data_summary (
+        scope VARCHAR(16) NOT NULL,
+        key VARCHAR(255) NOT NULL DEFAULT '',
+        campaign_count BIGINT NOT NULL DEFAULT 0,
+        active_count BIGINT NOT NULL DEFAULT 0,
+        profitable_count BIGINT NOT NULL DEFAULT 0,
+        total_cost NUMERIC NOT NULL DEFAULT 0,
+        total_revenue NUMERIC NOT NULL DEFAULT 0,
+        total_conversions BIGINT NOT NULL DEFAULT 0,
+        roi_sum NUMERIC NOT NULL DEFAULT 0,
+        PRIMARY KEY (scope, key)
+    )
+"""
+
+# Aggregates a (sign, channel, status, cost, revenue, conversions) row source
+# into signed deltas for the global, per channel and per status rows.
+_DELTA_SQL = """
+        INSERT INTO marketing_data_summary AS s (
+            scope, key, campaign_count, active_count, profitable_count,
+            total_cost, total_revenue, total_conversions, roi_sum)
+        SELECT g.scope, g.key,
+               SUM(d.sign),
+               SUM(CASE WHEN d.status = 'active' THEN d.sign ELSE 0 END),
+               SUM(CASE WHEN d.roi > 100 THEN d.sign ELSE 0 END),
+               SUM(d.sign * COALESCE(d.cost, 0)),
+               SUM(d.sign * COALESCE(d.revenue, 0)),
+               SUM(d.sign * COALESCE(d.conversions, 0)),
+               SUM(d.sign * d.roi)
+        FROM (%(source)s) d
+        CROSS JOIN LATERAL (VALUES
+            ('global', ''),
+            ('channel', COALESCE(d.channel, '')),
+            ('status', COALESCE(d.status, ''))
+        ) AS g(scope, key)
+        GROUP BY g.scope, g.key
+        ON CONFLICT (scope, key) DO UPDATE SET
+            campaign_count = s.campaign_count + EXCLUDED.campaign_count,
+            active_count = s.active_count + EXCLUDED.active_count,
+            profitable_count = s.profitable_count + EXCLUDED.profitable_count,
+            total_cost = s.total_cost + EXCLUDED.total_cost,
+            total_revenue = s.total_revenue + EXCLUDED.total_revenue,
+            total_conversions = s.total_conversions + EXCLUDED.total_conversions,
+            roi_sum = s.roi_sum + EXCLUDED.roi_sum;
+"""
+
+_ROWS_SQL = ("SELECT %(sign)s AS sign, channel, status, cost, revenue, conversions, "
+             + ROI_SQL + " AS roi FROM %(relation)s")
+
+
+def _delta(sign, relation):
+    return _DELTA_SQL % {'source': _ROWS_SQL % {'sign': sign, 'relation': relation}}
+
+
+SUMMARY_TRIGGER_SQL = """
+    CREATE OR REPLACE FUNCTION marketing_data_summary_apply() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+%(insert)s
+        ELSIF TG_OP = 'DELETE' THEN
+%(delete)s
+        ELSIF TG_OP = 'UPDATE' THEN
+%(delete_old)s
+%(insert_new)s
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    CREATE OR REPLACE FUNCTION marketing_data_summary_truncate() RETURNS trigger AS $$
+    BEGIN
+        DELETE FROM marketing_data_summary;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+    DROP TRIGGER IF EXISTS marketing_data_summary_insert ON marketing_data;
+    DROP TRIGGER IF EXISTS marketing_data_summary_update ON marketing_data;
+    DROP TRIGGER IF EXISTS marketing_data_summary_delete ON marketing_data;
+    DROP TRIGGER IF EXISTS marketing_data_summary_truncate ON marketing_data;
+
+    CREATE TRIGGER marketing_data_summary_insert AFTER INSERT ON marketing_data
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION marketing_data_summary_apply();
+    CREATE TRIGGER marketing_data_summary_update AFTER UPDATE ON marketing_data
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION marketing_data_summary_apply();
+    CREATE TRIGGER marketing_data_summary_delete AFTER DELETE ON marketing_data
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION marketing_data_summary_apply();
+    CREATE TRIGGER marketing_data_summary_truncate AFTER TRUNCATE ON marketing_data
+        FOR EACH STATEMENT EXECUTE FUNCTION marketing_data_summary_truncate();
+""" % {
+    'insert': _delta('1', 'new_rows'),
+    'delete': _delta('-1', 'old_rows'),
+    'delete_old': _delta('-1', 'old_rows'),
+    'insert_new': _delta('1', 'new_rows'),
+}
+
+REBUILD_SQL = "DELETE FROM marketing_data_summary;\n" + _delta('1', 'marketing_data')
+
+# Serializes concurrent installs from several workers
+_SCHEMA_LOCK_ID = 7310142
+
+_installed = set()
+_installed_lock = threading.Lock()
+
+
+def install_summary(connection):
+    """Create the summary table and triggers, then rebuild it from marketing_data.
+
+    Takes DDL locks and scans the whole table: only the test wizard, the
+    sample loader and the benchmark call it, never a chat request.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_xact_lock(%s)", (_SCHEMA_LOCK_ID,))
+        cursor.execute(SUMMARY_TABLE_SQL)
+        cursor.execute(SUMMARY_TRIGGER_SQL)
+        cursor.execute(REBUILD_SQL)
+    connection.commit()
+    _installed.add(connection.dsn)
+
+
+def summary_present(connection):
+    """Whether the summary is installed; read-only, a positive answer is remembered per database"""
+    dsn = connection.dsn
+    if dsn in _installed:
+        return True
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass('marketing_data_summary')")
+        present = bool(cursor.fetchone()[0])
+    connection.rollback()
+    if present:
+        _installed.add(dsn)
+    return present
+
+
+def ensure_summary(connection):
+    """Install the summary unless it already is; False if marketing_data is unavailable"""
+    with _installed_lock:
+        try:
+            if summary_present(connection):
+                return True
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT to_regclass('marketing_data')")
+                table = cursor.fetchone()[0]
+            if not table:
+                connection.rollback()
+                return False
+            install_summary(connection)
+        except psycopg2.Error as e:
+            connection.rollback()
+            _logger.warning(f"marketing_data_summary unavailable: {str(e)}")
+            return False
+        return True
+
+
+def reset_installed():
+    """Forget the install state, e.g. after marketing_data was recreated"""
+    with _installed_lock:
+        _installed.clear()
+
+
+# Keys of the global campaign statistics, whichever source computes them
+SUMMARY_STATS_KEYS = (
+    'total_campaigns', 'active_campaigns', 'paused_campaigns', 'completed_campaigns', 'profitable_campaigns',
+    'total_cost', 'total_revenue', 'total_conversions', 'avg_roi',
+)
+
+SUMMARY_STATS_SQL = """
+    SELECT
+        g.campaign_count AS total_campaigns,
+        g.active_count AS active_campaigns,
+        g.profitable_count AS profitable_campaigns,
+        g.total_cost,
+        g.total_revenue,
+        g.total_conversions,
+        CASE WHEN g.campaign_count > 0 THEN g.roi_sum / g.campaign_count ELSE 0 END AS avg_roi,
+        COALESCE(MAX(CASE WHEN s.key = 'paused' THEN s.campaign_count END), 0) AS paused_campaigns,
+        COALESCE(MAX(CASE WHEN s.key = 'completed' THEN s.campaign_count END), 0) AS completed_campaigns
+    FROM marketing_data_summary g
+    LEFT JOIN marketing_data_summary s ON s.scope = 'status'
+    WHERE g.scope = 'global' AND g.key = ''
+    GROUP BY g.campaign_count, g.active_count, g.profitable_count, g.total_cost,
+             g.total_revenue, g.total_conversions, g.roi_sum
+"""
+
+
+def read_summary_stats(connection):
+    """Global statistics from the summary, or None when it is not installed"""
+    if not summary_present(connection):
+        return None
+    with connection.cursor(cursor_factory=RealDictCursor) as cursor:
+        cursor.execute(SUMMARY_STATS_SQL)
+        row = cursor.fetchone()
+    if row is None:
+        # Installed on an empty table: no global row yet
+        return dict.fromkeys(SUMMARY_STATS_KEYS, 0)
+    return dict(row)
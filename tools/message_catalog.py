@@ -0,0 +1,67 @@
+import re
+from string import Formatter
+
+_FIELD_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+class CompiledTemplate:
+    """A ``str.format`` template parsed once into literal and field segments"""
+
+    __slots__ = ('source', '_segments')
+
+    def __init__(self, source):
+        self.source = source
+        segments = []
+        for literal, field, spec, conversion in Formatter().parse(source):
+            if field is not None and (conversion or not _FIELD_RE.match(field)):
+                raise ValueError(f"Unsupported placeholder {{{field}}} in template {source!r}")
+            segments.append((literal, field, spec or ''))
+        self._segments = tuple(segments)
+
+    def render_into(self, parts, values):
+        """Append the rendered segments to ``parts``"""
+        for literal, field, spec in self._segments:
+            if literal:
+                parts.append(literal)
+            if field is not None:
+                parts.append(format(values[field], spec))
+
+    def render(self, values):
+        parts = []
+        self.render_into(parts, values)
+        return ''.join(parts)
+
+
+class MessageCatalog:
+    """Per-language message templates compiled once at load.
+
+    ``messages`` maps a message key to ``{language: template}``; languages
+    missing for a key fall back to ``default_language``.
+    """
+
+    def __init__(self, messages, default_language='en'):
+        self.default_language = default_language
+        self._templates = {
+            key: {language: CompiledTemplate(source) for language, source in by_language.items()}
+            for key, by_language in messages.items()
+        }
+
+    def template(self, key, language):
+        by_language = self._templates[key]
+        return by_language.get(language) or by_language[self.default_language]
+
+    def render(self, key, language, values=None):
+        return self.template(key, language).render(values or {})
+
+    def render_rows(self, key, language, rows, header=None, footer=None, values=None):
+        """Render an optional header, one template per row and an optional footer in one join"""
+        parts = []
+        if header:
+            self.template(header, language).render_into(parts, values or {})
+        row_template = self.template(key, language)
+        for row in rows:
+            row_template.render_into(parts, row)
+        if footer:
+            self.template(footer, language).render_into(parts, values or {})
+        return ''.join(parts)
+
@@ -0,0 +1,273 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2 import extensions
+
+from odoo.tools import config
+
+from .circuit_breaker import CircuitBreaker
+
+_logger = logging.getLogger(__name__)
+
+
+class PoolError(psycopg2.Error):
+    """Raised when no connection can be handed out before the acquire timeout"""
+
+
+class CircuitOpenError(PoolError):
+    """Raised without trying to connect while the ai_marketing circuit is open"""
+
+
+class MarketingConnectionPool:
+    """Thread-safe connection pool for the external ai_marketing database.
+
+    Connections are created lazily up to ``maxconn``, reused LIFO so hot
+    connections stay warm, health-checked with ``SELECT 1`` when they sat idle
+    longer than ``health_check_interval`` and closed when idle longer than
+    ``idle_timeout`` (never going below ``minconn`` open connections).
+    """
+
+    def __init__(self, connect_params, minconn=1, maxconn=10, idle_timeout=300.0,
+                 health_check_interval=30.0, acquire_timeout=10.0):
+        if minconn < 0 or maxconn < 1 or minconn > maxconn:
+            raise ValueError("Invalid pool size: minconn=%s maxconn=%s" % (minconn, maxconn))
+        self.connect_params = dict(connect_params)
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.acquire_timeout = acquire_timeout
+        self._lock = threading.Condition()
+        self._idle = deque()  # (connection, last_used), oldest on the left
+        self._size = 0
+        self._closed = False
+
+    def _connect(self):
+        return psycopg2.connect(**self.connect_params)
+
+    @staticmethod
+    def _close_quietly(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, connection, last_used):
+        if connection.closed:
+            return False
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            connection.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _evict_idle(self):
+        """Pop expired idle connections; caller holds the lock and closes them"""
+        expired = []
+        now = time.monotonic()
+        while self._idle and self._size > self.minconn and now - self._idle[0][1] > self.idle_timeout:
+            expired.append(self._idle.popleft()[0])
+            self._size -= 1
+        return expired
+
+    def getconn(self):
+        """Borrow a connection, opening a new one if the pool is not full"""
+        deadline = time.monotonic() + self.acquire_timeout
+        expired = []  # evicted on any pass of the wait loop, closed once the lock is released
+        try:
+            with self._lock:
+                while True:
+                    if self._closed:
+                        raise PoolError("Connection pool is closed")
+                    expired.extend(self._evict_idle())
+                    if self._idle:
+                        connection, last_used = self._idle.pop()
+                        break
+                    if self._size < self.maxconn:
+                        self._size += 1
+                        connection, last_used = None, None
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolError("Timed out waiting for an ai_marketing connection")
+                    self._lock.wait(remaining)
+        finally:
+            for stale in expired:
+                self._close_quietly(stale)
+
+        if connection is not None:
+            if self._is_healthy(connection, last_used):
+                return connection
+            _logger.info("Replacing unhealthy ai_marketing connection")
+            self._close_quietly(connection)
+
+        try:
+            return self._connect()
+        except Exception:
+            with self._lock:
+                self._size -= 1
+                self._lock.notify()
+            raise
+
+    def putconn(self, connection, discard=False):
+        """Return a borrowed connection, resetting any open transaction"""
+        if not discard and not connection.closed:
+            try:
+                if connection.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    connection.rollback()
+            except psycopg2.Error:
+                discard = True
+        else:
+            discard = True
+
+        with self._lock:
+            if discard or self._closed:
+                self._size -= 1
+            else:
+                self._idle.append((connection, time.monotonic()))
+            self._lock.notify()
+
+        if discard or self._closed:
+            self._close_quietly(connection)
+
+    @contextmanager
+    def connection(self):
+        """Context manager borrowing a connection for the duration of the block.
+
+        Uncommitted work is rolled back when the block exits; connections that
+        raised a connection-level error are dropped instead of being reused.
+        """
+        connection = self.getconn()
+        discard = False
+        try:
+            yield connection
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            discard = True
+            raise
+        finally:
+            self.putconn(connection, discard=discard)
+
+    def closeall(self):
+        with self._lock:
+            self._closed = True
+            idle = [connection for connection, _last_used in self._idle]
+            self._size -= len(idle)
+            self._idle.clear()
+            self._lock.notify_all()
+        for connection in idle:
+            self._close_quietly(connection)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle),
+                'minconn': self.minconn,
+                'maxconn': self.maxconn,
+            }
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def pool_settings():
+    """Connection settings, overridable from the Odoo configuration file"""
+    return {
+        'connect_params': {
+            'host': config.get('ai_marketing_db_host') or 'localhost',
+            'port': str(config.get('ai_marketing_db_port') or '5432'),
+            'database': config.get('ai_marketing_db_name') or 'ai_marketing',
+            'user': config.get('ai_marketing_db_user') or 'odoo',
+            'password': config.get('ai_marketing_db_password') or 'odoo',
+            'connect_timeout': int(config.get('ai_marketing_db_connect_timeout') or 5),
+        },
+        'minconn': int(config.get('ai_marketing_pool_minconn') or 1),
+        'maxconn': int(config.get('ai_marketing_pool_maxconn') or 10),
+        'idle_timeout': float(config.get('ai_marketing_pool_idle_timeout') or 300),
+        'health_check_interval': float(config.get('ai_marketing_pool_health_check') or 30),
+    }
+
+
+def get_pool():
+    """Process-wide pool; recreated after a fork so prefork workers never share sockets"""
+    global _pool, _pool_pid
+    pid = os.getpid()
+    if _pool is not None and _pool_pid == pid:
+        return _pool
+    with _pool_lock:
+        if _pool is None or _pool_pid != pid:
+            _pool = MarketingConnectionPool(**pool_settings())
+            _pool_pid = pid
+        return _pool
+
+
+def set_pool(pool):
+    """Make ``pool`` the process-wide pool, closing the previous one"""
+    global _pool, _pool_pid
+    with _pool_lock:
+        previous = _pool if _pool_pid == os.getpid() else None
+        _pool, _pool_pid = pool, os.getpid()
+    if previous is not None and previous is not pool:
+        previous.closeall()
+
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.closeall()
+        _pool = None
+
+
+# Trips after repeated connection-level failures so callers fail fast
+# instead of each waiting for the connect timeout
+marketing_circuit = CircuitBreaker(
+    'ai_marketing',
+    failure_threshold=int(config.get('ai_marketing_circuit_threshold') or 3),
+    reset_timeout=float(config.get('ai_marketing_circuit_reset') or 30),
+)
+
+
+@contextmanager
+def marketing_connection():
+    """Borrow a pooled connection to the ai_marketing database.
+
+    Raises CircuitOpenError right away while the circuit is open. Connect
+    failures and connection-level errors in the block count as failures;
+    a block that ran without one counts as a success.
+    """
+    if not marketing_circuit.allow():
+        raise CircuitOpenError("ai_marketing database unavailable (circuit open)")
+    pool = get_pool()
+    try:
+        connection = pool.getconn()
+    except psycopg2.OperationalError as e:
+        marketing_circuit.record_failure(e)
+        raise
+    except BaseException:
+        marketing_circuit.release()
+        raise
+
+    failed = False
+    try:
+        yield connection
+    except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+        failed = True
+        marketing_circuit.record_failure(e)
+        raise
+    finally:
+        pool.putconn(connection, discard=failed)
+        if not failed:
+            marketing_circuit.record_success()
@@ -0,0 +1,123 @@
+import re
+import threading
+import weakref
+
+from psycopg2 import errors
+
+from odoo.tools import config
+
+from .marketing_queries import MARKETING_QUERIES
+
+_PARAM_RE = re.compile(r'%\((\w+)\)s')
+
+
+class PreparedStatement:
+    """Server-side prepared form of a query written with %(name)s placeholders"""
+
+    def __init__(self, name, query):
+        self.name = name
+        self.params = []
+
+        def number(match):
+            if match.group(1) not in self.params:
+                self.params.append(match.group(1))
+            return f"${self.params.index(match.group(1)) + 1}"
+
+        body = _PARAM_RE.sub(number, query).strip()
+        self.prepare_sql = f"PREPARE {name} AS {body}"
+        self.execute_sql = f"EXECUTE {name}"
+        if self.params:
+            self.execute_sql += f" ({', '.join(['%s'] * len(self.params))})"
+
+    def args(self, params):
+        params = params or {}
+        return tuple(params.get(param) for param in self.params)
+
+
+class StatementRegistry:
+    """Prepares the fixed queries once per connection and runs them with EXECUTE.
+
+    The statements prepared on a connection are remembered as long as the
+    connection lives, so a pooled connection parses and plans each query
+    once. A statement that vanished or whose plan became invalid after a
+    schema change is prepared again. When disabled (e.g. behind a PgBouncer
+    in transaction mode) the queries are sent as plain SQL.
+    """
+
+    def __init__(self, queries, prefix='ai_marketing_', enabled=True):
+        self.queries = queries
+        self.prefix = prefix
+        self.statements = {name: PreparedStatement(prefix + name, query) for name, query in queries.items()}
+        self.enabled = enabled
+        self._prepared = weakref.WeakKeyDictionary()  # connection -> names prepared on it
+        self._lock = threading.Lock()
+        self.prepares = 0
+        self.executions = 0
+
+    def _prepared_on(self, connection):
+        with self._lock:
+            prepared = self._prepared.get(connection)
+            if prepared is None:
+                prepared = self._prepared[connection] = set()
+            return prepared
+
+    def _prepare(self, cursor, statement, prepared):
+        cursor.execute(statement.prepare_sql)
+        prepared.add(statement.name)
+        with self._lock:
+            self.prepares += 1
+
+    def _statement(self, name, query):
+        statement = self.statements.get(name)
+        if statement is None:
+            with self._lock:
+                statement = self.statements.get(name)
+                if statement is None:
+                    statement = self.statements[name] = PreparedStatement(self.prefix + name, query)
+        return statement
+
+    def execute(self, cursor, name, params=None, query=None):
+        """Run the query ``name`` on ``cursor`` with its %(name)s ``params``.
+
+        ``query`` gives the SQL of a variant that is not in ``queries``; it is
+        registered under ``name`` on first use.
+        """
+        if query is None:
+            query = self.queries[name]
+        if not self.enabled:
+            cursor.execute(query, params or {})
+            return
+        statement = self._statement(name, query)
+        prepared = self._prepared_on(cursor.connection)
+        if statement.name not in prepared:
+            self._prepare(cursor, statement, prepared)
+        with self._lock:
+            self.executions += 1
+        try:
+            cursor.execute(statement.execute_sql, statement.args(params))
+        except (errors.InvalidSqlStatementName, errors.FeatureNotSupported):
+            # Deallocated, or "cached plan must not change result type" after
+            # marketing_data was altered: prepare it again once
+            cursor.connection.rollback()
+            cursor.execute("DEALLOCATE ALL")
+            prepared.clear()
+            self._prepare(cursor, statement, prepared)
+            cursor.execute(statement.execute_sql, statement.args(params))
+
+    def stats(self):
+        with self._lock:
+            connections = len(self._prepared)
+            statements = len(self.statements)
+        return {
+            'enabled': self.enabled,
+            'statements': statements,
+            'connections': connections,
+            'prepares': self.prepares,
+            'executions': self.executions,
+        }
+
+
+marketing_statements = StatementRegistry(
+    MARKETING_QUERIES,
+    enabled=str(config.get('ai_marketing_prepared_statements', True)).lower() not in ('0', 'false', 'no'),
+)
@@ -0,0 +1,115 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from odoo.tools import config
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_sql(query):
+    """Collapse whitespace so differently indented copies of a query share an entry"""
+    return _WHITESPACE_RE.sub(' ', query).strip()
+
+
+class QueryCache:
+    """Thread-safe LRU cache of query results with per-entry TTL.
+
+    Cached results are shared between callers and must be treated as
+    read-only. The cache lives in the worker process: ``invalidate`` only
+    clears the local copy, other workers catch up when their entries expire.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(query, params=None):
+        if isinstance(params, dict):
+            return normalize_sql(query), tuple(sorted(params.items()))
+        return normalize_sql(query), tuple(params or ())
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, query, params, ttl, compute):
+        """Return the cached result or run ``compute()``; ``None`` results are not cached"""
+        key = self.make_key(query, params)
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.set(key, value, ttl)
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+            }
+
+
+query_cache = QueryCache(max_entries=int(config.get('ai_marketing_cache_size') or 256))
+
+
+def invalidate_marketing_cache():
+    """Drop cached marketing aggregates after campaign data changed"""
+    query_cache.invalidate()
+
+
+_scope = threading.local()
+
+
+@contextmanager
+def query_memo():
+    """Memoize every ai_marketing query run by this thread inside the block.
+
+    Used to share one fetch between several handlers answering the same
+    request; nested scopes reuse the outermost memo.
+    """
+    if getattr(_scope, 'memo', None) is not None:
+        yield _scope.memo
+        return
+    _scope.memo = {}
+    try:
+        yield _scope.memo
+    finally:
+        _scope.memo = None
+
+
+def current_memo():
+    return getattr(_scope, 'memo', None)
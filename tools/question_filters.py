@@ -0,0 +1,144 @@
+import calendar
+import re
+from collections import namedtuple
+from datetime import date, timedelta
+
+# Upper bound of a "top N" asked in a question
+MAX_LIMIT = 50
+# Upper bound of a rolling window per unit ("last 9999 years" covers ten years)
+MAX_WINDOW = {'day': 3660, 'week': 520, 'month': 120, 'year': 10}
+
+_UNITS = {
+    'day': 'day', 'days': 'day', 'jour': 'day', 'jours': 'day', 'يوم': 'day', 'أيام': 'day', 'ايام': 'day',
+    'week': 'week', 'weeks': 'week', 'semaine': 'week', 'semaines': 'week', 'أسبوع': 'week', 'أسابيع': 'week',
+    'month': 'month', 'months': 'month', 'mois': 'month', 'شهر': 'month', 'أشهر': 'month', 'شهور': 'month',
+    'year': 'year', 'years': 'year', 'an': 'year', 'ans': 'year', 'année': 'year', 'années': 'year',
+    'سنة': 'year', 'سنوات': 'year', 'عام': 'year', 'أعوام': 'year',
+}
+_UNIT = '(' + '|'.join(sorted(map(re.escape, _UNITS), key=len, reverse=True)) + ')'
+
+_LIMIT_PATTERNS = [re.compile(pattern) for pattern in (
+    r'\b(?:top|best|worst|first|premi[eè]res?|meilleur(?:e|s|es)?|pires?)\s+(\d{1,3})\b',
+    r'\b(\d{1,3})\s+(?:best|worst|top|campaigns?|channels?|meilleur(?:e|s|es)?|pires?|premi[eè]res?|campagnes?|canaux)\b',
+    r'(?:أفضل|أسوأ|أول)\s+(\d{1,3})',
+    r'(\d{1,3})\s+(?:حملات|حملة|قنوات)',
+)]
+
+# "last 30 days", "30 derniers jours", "derniers 30 jours", "آخر 30 يوم"
+_ROLLING_PATTERNS = [re.compile(pattern) for pattern in (
+    r'\b(?:last|past|previous)\s+(\d{1,4})\s+' + _UNIT + r'\b',
+    r'\b(\d{1,4})\s+derni[eè]re?s?\s+' + _UNIT + r'\b',
+    r'\bderni[eè]re?s?\s+(\d{1,4})\s+' + _UNIT + r'\b',
+    r'(?:آخر|اخر|الماضية)\s+(\d{1,4})\s+' + _UNIT,
+)]
+
+# Calendar periods: (pattern, unit, periods back; 0 is the current one)
+_CALENDAR_PATTERNS = [(re.compile(pattern), unit, back) for pattern, unit, back in (
+    (r"\btoday\b|\baujourd'hui\b|اليوم", 'day', 0),
+    (r'\byesterday\b|\bhier\b|أمس', 'day', 1),
+    (r'\bthis week\b|\bcette semaine\b|هذا الأسبوع', 'week', 0),
+    (r'\blast week\b|\bla semaine derni[eè]re\b|الأسبوع الماضي', 'week', 1),
+    (r'\bthis month\b|\bce mois\b|هذا الشهر', 'month', 0),
+    (r'\blast month\b|\ble mois dernier\b|الشهر الماضي', 'month', 1),
+    (r"\bthis year\b|\bcette ann[ée]e\b|هذه السنة|هذا العام", 'year', 0),
+    (r"\blast year\b|\bl'ann[ée]e derni[eè]re\b|السنة الماضية|العام الماضي", 'year', 1),
+)]
+
+
+class QuestionFilters(namedtuple('QuestionFilters', ('limit', 'date_from', 'date_to', 'channel'))):
+    """Row limit, creation window [date_from, date_to) and channel asked for in a question.
+
+    Unset filters are None; an open window has no date_to.
+    """
+
+    __slots__ = ()
+
+    @property
+    def predicates(self):
+        """Names of the FILTER_PREDICATES to apply, in a stable order"""
+        return tuple(name for name in ('channel', 'date_from', 'date_to') if getattr(self, name) is not None)
+
+    def params(self, **extra):
+        """Query parameters of the set predicates, plus ``extra``"""
+        return dict({name: getattr(self, name) for name in self.predicates}, **extra)
+
+
+NO_FILTERS = QuestionFilters(None, None, None, None)
+
+
+def _months_before(day, months):
+    month = day.year * 12 + day.month - 1 - months
+    return date(month // 12, month % 12 + 1, 1)
+
+
+def _period_start(today, unit, back):
+    if unit == 'day':
+        return today - timedelta(days=back)
+    if unit == 'week':
+        return today - timedelta(days=today.weekday() + 7 * back)
+    if unit == 'month':
+        return _months_before(today.replace(day=1), back)
+    return date(today.year - back, 1, 1)
+
+
+def _rolling_start(today, count, unit):
+    if unit == 'day':
+        return today - timedelta(days=count - 1)
+    if unit == 'week':
+        return today - timedelta(days=7 * count - 1)
+    if unit == 'month':
+        start = _months_before(today.replace(day=1), count)
+        # Same day of the month, clamped to the length of that month
+        day = min(today.day, calendar.monthrange(start.year, start.month)[1])
+        return start.replace(day=day) + timedelta(days=1)
+    return _rolling_start(today, count * 12, 'month')
+
+
+def _parse_window(message, today):
+    for pattern in _ROLLING_PATTERNS:
+        match = pattern.search(message)
+        if match:
+            count = int(match.group(1))
+            if count:
+                unit = _UNITS[match.group(2)]
+                return _rolling_start(today, min(count, MAX_WINDOW[unit]), unit), None
+    for pattern, unit, back in _CALENDAR_PATTERNS:
+        if pattern.search(message):
+            start = _period_start(today, unit, back)
+            if not back:
+                return start, None
+            return start, _period_start(today, unit, back - 1)
+    return None, None
+
+
+def _parse_limit(message):
+    for pattern in _LIMIT_PATTERNS:
+        match = pattern.search(message)
+        if match and int(match.group(1)):
+            return min(int(match.group(1)), MAX_LIMIT)
+    return None
+
+
+def _parse_channel(message, channels):
+    """Longest known channel name mentioned in ``message``"""
+    for channel in sorted(channels, key=len, reverse=True):
+        if re.search(r'(?<!\w)' + re.escape(channel.lower()) + r'(?!\w)', message):
+            return channel
+    return None
+
+
+def parse_filters(message, channels=(), today=None):
+    """Filters asked for in the lowercased ``message``.
+
+    Understands "top 10" / "10 best campaigns", rolling windows ("last 30
+    days", "3 derniers mois", "آخر 7 أيام"), calendar periods ("this month",
+    "la semaine dernière", "العام الماضي") and any of the known ``channels``,
+    in English, French and Arabic.
+    """
+    date_from, date_to = _parse_window(message, today or date.today())
+    return QuestionFilters(
+        limit=_parse_limit(message),
+        date_from=date_from,
+        date_to=date_to,
+        channel=_parse_channel(message, channels),
+    )
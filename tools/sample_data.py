@@ -0,0 +1,182 @@
+import random
+from itertools import accumulate
+from datetime import datetime, timedelta
+
+from .marketing_summary import CONVERSION_RATE_SQL, ROI_SQL
+
+# Stored like the computed fields of marketing.data, so handlers sort and
+# filter on plain indexed columns instead of recomputing the ratios per row
+GENERATED_COLUMNS = (
+    ('roi', 'NUMERIC', ROI_SQL),
+    ('conversion_rate', 'DOUBLE PRECISION', CONVERSION_RATE_SQL),
+)
+
+MARKETING_DATA_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS marketing_data (
+        id SERIAL PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        cost DECIMAL(10,2) DEFAULT 0,
+        revenue DECIMAL(10,2) DEFAULT 0,
+        conversions INTEGER DEFAULT 0,
+        status VARCHAR(50) DEFAULT 'active',
+        created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        channel VARCHAR(100),
+        campaign_type VARCHAR(100),
+%s
+    );
+""" % ',\n'.join(f"        {name} {type_} GENERATED ALWAYS AS ({expression}) STORED"
+                 for name, type_, expression in GENERATED_COLUMNS)
+
+# Upgrades a marketing_data created before the generated columns (PostgreSQL 12+)
+GENERATED_COLUMNS_SQL = "ALTER TABLE marketing_data " + ', '.join(
+    f"ADD COLUMN IF NOT EXISTS {name} {type_} GENERATED ALWAYS AS ({expression}) STORED"
+    for name, type_, expression in GENERATED_COLUMNS)
+
+COPY_COLUMNS = ('name', 'cost', 'revenue', 'conversions', 'status', 'created_date', 'channel', 'campaign_type')
+
+# (channel, campaign types, typical cost, revenue/cost ratio, revenue per conversion, weight)
+CHANNEL_PROFILES = [
+    ('Google Ads', ('Search', 'Display', 'Performance'), 2500, 3.4, 100, 12),
+    ('Facebook', ('Social Media', 'Retargeting'), 1800, 3.0, 100, 10),
+    ('Instagram', ('Influencer', 'Stories', 'Shopping'), 3200, 3.0, 100, 9),
+    ('LinkedIn', ('B2B', 'Lead Generation'), 4500, 3.0, 100, 5),
+    ('YouTube', ('Video', 'Pre-roll'), 2200, 3.0, 100, 6),
+    ('Email', ('Newsletter', 'Promotion'), 500, 4.0, 20, 8),
+    ('TikTok', ('Social Media', 'Brand'), 1500, 2.0, 100, 6),
+    ('Pinterest', ('Shopping',), 800, 3.0, 50, 3),
+    ('Twitter', ('Social Media',), 1200, 2.0, 100, 3),
+    ('Snapchat', ('Stories',), 900, 2.0, 100, 2),
+    ('Amazon', ('PPC',), 3500, 3.0, 100, 6),
+    ('Reddit', ('Community',), 600, 2.0, 100, 2),
+    ('WhatsApp', ('Messaging',), 750, 3.0, 50, 2),
+    ('Telegram', ('Messaging',), 400, 2.0, 100, 1),
+    ('Google Shopping', ('E-commerce',), 2800, 3.0, 100, 6),
+    ('Bing', ('Search',), 1600, 3.0, 100, 4),
+    ('Spotify', ('Audio',), 1100, 2.0, 100, 2),
+    ('Twitch', ('Gaming',), 1300, 2.0, 100, 2),
+    ('Discord', ('Gaming',), 500, 2.0, 100, 1),
+]
+
+STATUS_WEIGHTS = (('active', 12), ('paused', 4), ('completed', 4))
+
+# Campaigns are dated over the two years before this day, so a seed always
+# produces the same rows
+SAMPLE_EPOCH = datetime(2025, 1, 1)
+SAMPLE_DAYS = 730
+
+
+def generate_campaigns(count, seed=42):
+    """Yield ``count`` realistic campaign tuples in COPY_COLUMNS order.
+
+    Costs are log-normally spread around the channel's typical budget and
+    returns around its usual revenue/cost ratio, so a few campaigns lose
+    money and a few are outliers. The same seed yields the same rows.
+    """
+    rng = random.Random(seed)
+    profiles = [profile[:5] for profile in CHANNEL_PROFILES]
+    profile_weights = list(accumulate(profile[5] for profile in CHANNEL_PROFILES))
+    statuses = [status for status, _weight in STATUS_WEIGHTS]
+    status_weights = list(accumulate(weight for _status, weight in STATUS_WEIGHTS))
+    span = SAMPLE_DAYS * 86400
+
+    for index in range(count):
+        channel, types, base_cost, ratio, per_conversion = rng.choices(profiles, cum_weights=profile_weights)[0]
+        campaign_type = rng.choice(types)
+        cost = round(base_cost * rng.lognormvariate(0, 0.5), 2)
+        revenue = round(cost * max(ratio * rng.gauss(1, 0.35), 0), 2)
+        conversions = int(revenue / (per_conversion * rng.uniform(0.6, 1.4)))
+        yield (
+            f"{channel} - {campaign_type} #{index + 1}",
+            cost,
+            revenue,
+            conversions,
+            rng.choices(statuses, cum_weights=status_weights)[0],
+            SAMPLE_EPOCH - timedelta(seconds=rng.randrange(span)),
+            channel,
+            campaign_type,
+        )
+
+
+def _copy_field(value):
+    """COPY text format: backslash, tab and newlines are escaped"""
+    if value is None:
+        return '\\N'
+    text = value.isoformat(' ') if isinstance(value, datetime) else str(value)
+    if '\\' in text or '\t' in text or '\n' in text or '\r' in text:
+        text = text.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+    return text
+
+
+class CopyStream:
+    """Read-only file object rendering rows as COPY text lazily.
+
+    Only about ``size`` bytes are held in memory at once, whatever the
+    number of rows.
+    """
+
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self._buffer = b''
+        self.rows = 0
+
+    def read(self, size=-1):
+        chunks = [self._buffer]
+        length = len(self._buffer)
+        while size < 0 or length < size:
+            lines = []
+            for row in self._rows:
+                lines.append('\t'.join(map(_copy_field, row)))
+                if len(lines) == 1000:
+                    break
+            if not lines:
+                break
+            self.rows += len(lines)
+            chunk = ('\n'.join(lines) + '\n').encode()
+            chunks.append(chunk)
+            length += len(chunk)
+        data = b''.join(chunks)
+        if size < 0:
+            self._buffer = b''
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def _secondary_indexes(cursor):
+    """(name, definition) of the marketing_data indexes not backing a constraint"""
+    cursor.execute("""
+        SELECT i.relname, pg_get_indexdef(i.oid)
+        FROM pg_index x
+        JOIN pg_class i ON i.oid = x.indexrelid
+        WHERE x.indrelid = 'marketing_data'::regclass
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid)
+    """)
+    return cursor.fetchall()
+
+
+def load_sample_data(connection, count, seed=42):
+    """Replace marketing_data with ``count`` generated campaigns using COPY.
+
+    The table is truncated, secondary indexes are dropped for the load and
+    rebuilt in one pass afterwards, then the table is analyzed. Returns the
+    number of rows loaded.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(MARKETING_DATA_TABLE_SQL)
+        cursor.execute("TRUNCATE marketing_data RESTART IDENTITY")
+        # Cheap on the empty table, instead of a rewrite once loaded
+        cursor.execute(GENERATED_COLUMNS_SQL)
+        indexes = _secondary_indexes(cursor)
+        for name, _definition in indexes:
+            cursor.execute(f'DROP INDEX "{name}"')
+
+        stream = CopyStream(generate_campaigns(count, seed))
+        cursor.copy_expert(
+            f"COPY marketing_data ({', '.join(COPY_COLUMNS)}) FROM STDIN",
+            stream, size=1 << 16)
+
+        for _name, definition in indexes:
+            cursor.execute(definition)
+        cursor.execute("ANALYZE marketing_data")
+    connection.commit()
+    return stream.rows
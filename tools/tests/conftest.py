@@ -0,0 +1,9 @@
+import os
+
+import odoo.addons
+
+# The tools are plain Python: make the addon importable as odoo.addons.<name>
+# when pytest runs outside odoo-bin, without needing a database
+_ADDONS_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+if _ADDONS_DIR not in odoo.addons.__path__:
+    odoo.addons.__path__.append(_ADDONS_DIR)
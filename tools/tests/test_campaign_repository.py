@@ -0,0 +1,111 @@
+import pytest
+
+from odoo.addons.ai_marketing_assistant.tools.campaign_repository import (
+    CampaignBackend, CampaignRepository, OdooCampaigns,
+)
+from odoo.addons.ai_marketing_assistant.tools.question_filters import NO_FILTERS, QuestionFilters
+
+
+class FakeBackend(CampaignBackend):
+    def __init__(self, name, campaigns, available=True):
+        self.name = self.label = name
+        self.campaigns = campaigns
+        self.available = available
+        self.calls = []
+
+    def _answer(self, method, value):
+        self.calls.append(method)
+        return value if self.available else None
+
+    def has_campaigns(self):
+        return self._answer('has_campaigns', bool(self.campaigns))
+
+    def top_n(self, ranking, limit=5, filters=NO_FILTERS):
+        return self._answer('top_n', self.campaigns[:limit])
+
+    def group_by(self, field, limit=None, filters=NO_FILTERS):
+        return self._answer('group_by', [])
+
+    def totals(self, filters=NO_FILTERS):
+        return self._answer('totals', {'total_campaigns': len(self.campaigns)})
+
+    def channels(self):
+        return self._answer('channels', ['Google'])
+
+
+def test_first_backend_with_campaigns_answers():
+    postgres = FakeBackend('postgresql', [{'name': 'A'}])
+    odoo = FakeBackend('odoo', [{'name': 'B'}])
+    repository = CampaignRepository([postgres, odoo])
+    assert repository.top_n('best_roi') == [{'name': 'A'}]
+    assert repository.source == 'postgresql'
+    assert odoo.calls == []
+
+
+def test_backend_is_chosen_with_one_probe():
+    postgres = FakeBackend('postgresql', [{'name': 'A'}])
+    repository = CampaignRepository([postgres])
+    repository.totals()
+    repository.channels()
+    assert postgres.calls == ['has_campaigns', 'totals', 'channels']
+
+
+def test_empty_backend_yields_to_one_with_campaigns():
+    postgres = FakeBackend('postgresql', [])
+    odoo = FakeBackend('odoo', [{'name': 'B'}])
+    assert CampaignRepository([postgres, odoo]).source == 'odoo'
+
+
+def test_empty_results_of_first_reachable_backend():
+    postgres = FakeBackend('postgresql', [], available=False)
+    odoo = FakeBackend('odoo', [])
+    repository = CampaignRepository([postgres, odoo])
+    assert repository.top_n('best_roi') == []
+    assert repository.source == 'odoo'
+
+
+def test_backend_failing_mid_request_is_skipped():
+    postgres = FakeBackend('postgresql', [{'name': 'A'}])
+    odoo = FakeBackend('odoo', [{'name': 'B'}])
+    repository = CampaignRepository([postgres, odoo])
+    assert repository.source == 'postgresql'
+    postgres.available = False
+    assert repository.top_n('best_roi') == [{'name': 'B'}]
+    assert repository.source == 'odoo'
+
+
+def test_every_backend_down():
+    repository = CampaignRepository([FakeBackend('postgresql', [], available=False)])
+    assert repository.backend is None
+    assert repository.totals() is None
+
+
+def test_reads_are_memoized_per_filters():
+    postgres = FakeBackend('postgresql', [{'name': 'A'}])
+    memo = {}
+    filters = QuestionFilters(3, None, None, 'Google')
+    CampaignRepository([postgres], memo).top_n('best_roi', 3, filters)
+    CampaignRepository([postgres], memo).top_n('best_roi', 3, filters)
+    CampaignRepository([postgres], memo).top_n('best_roi', 3)
+    assert postgres.calls == ['has_campaigns', 'top_n', 'top_n']
+
+
+def test_unknown_ranking_and_grouping():
+    repository = CampaignRepository([FakeBackend('postgresql', [])])
+    with pytest.raises(ValueError):
+        repository.top_n('cheapest')
+    with pytest.raises(ValueError):
+        repository.group_by('name')
+
+
+def test_backends_must_implement_every_read():
+    class Partial(CampaignBackend):
+        def has_campaigns(self):
+            return True
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_odoo_channel_filter_is_not_a_pattern():
+    domain = OdooCampaigns._domain(QuestionFilters(None, None, None, 'my_ads%'))
+    assert domain == [('channel_id.name', '=ilike', 'my\\_ads\\%')]
@@ -0,0 +1,74 @@
+import threading
+
+import pytest
+
+from odoo.addons.ai_marketing_assistant.tools.chat_log import ChatLogBuffer
+
+
+class Recorder:
+    def __init__(self):
+        self.batches = []
+        self.event = threading.Event()
+
+    def __call__(self, dbname, values_list):
+        self.batches.append((dbname, list(values_list)))
+        self.event.set()
+
+
+@pytest.fixture
+def recorder():
+    return Recorder()
+
+
+def test_invalid_sizes(recorder):
+    with pytest.raises(ValueError):
+        ChatLogBuffer(recorder, max_size=5, batch_size=10)
+
+
+def test_flush_writes_in_batches(recorder):
+    buffer = ChatLogBuffer(recorder, max_size=100, batch_size=50, flush_interval=60)
+    for i in range(3):
+        assert buffer.append('db', {'i': i})
+    buffer.flush('db')
+    assert recorder.batches == [('db', [{'i': 0}, {'i': 1}, {'i': 2}])]
+    assert buffer.stats()['pending'] == 0
+    assert buffer.stats()['written'] == 3
+    buffer.close()
+
+
+def test_full_batch_is_written_by_the_thread(recorder):
+    buffer = ChatLogBuffer(recorder, max_size=10, batch_size=2, flush_interval=60)
+    buffer.append('db', {'i': 0})
+    buffer.append('db', {'i': 1})
+    assert recorder.event.wait(5)
+    assert recorder.batches[0] == ('db', [{'i': 0}, {'i': 1}])
+    buffer.close()
+
+
+def test_back_pressure_writes_inline(recorder):
+    buffer = ChatLogBuffer(recorder, max_size=2, batch_size=2, flush_interval=60)
+    buffer._ensure_thread = lambda: None  # keep the queue full
+    assert buffer.append('db', {'i': 0})
+    assert buffer.append('db', {'i': 1})
+    assert not buffer.append('db', {'i': 2})
+    assert recorder.batches == [('db', [{'i': 0}, {'i': 1}, {'i': 2}])]
+    assert buffer.stats()['pending'] == 0
+
+
+def test_failed_writes_are_counted(recorder):
+    def failing(dbname, values_list):
+        raise RuntimeError("db down")
+    buffer = ChatLogBuffer(failing, max_size=10, batch_size=5, flush_interval=60)
+    buffer._ensure_thread = lambda: None
+    buffer.append('db', {'i': 0})
+    buffer.flush()
+    assert buffer.stats()['failed'] == 1
+
+
+def test_closed_buffer_rejects_entries(recorder):
+    buffer = ChatLogBuffer(recorder, flush_interval=60)
+    buffer.append('db', {'i': 0})
+    buffer.close()
+    assert recorder.batches == [('db', [{'i': 0}])]
+    with pytest.raises(RuntimeError):
+        buffer.append('db', {'i': 1})
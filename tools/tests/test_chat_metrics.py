@@ -0,0 +1,96 @@
+import threading
+from types import SimpleNamespace
+
+from odoo.addons.ai_marketing_assistant.tools.chat_metrics import ChatMetrics, LATENCY_BUCKETS_MS
+
+
+def make_env():
+    return SimpleNamespace(cr=SimpleNamespace(sql_log_count=0))
+
+
+def test_measure_records_latency_and_queries():
+    metrics = ChatMetrics(enabled=True)
+    env = make_env()
+
+    def handler():
+        metrics.note_query(3, 0.002, 0.001)
+        env.cr.sql_log_count += 2
+        return 'ok'
+    assert metrics.measure('handler', handler, env) == 'ok'
+    operation = metrics.snapshot()['operations']['handler']
+    assert operation['count'] == 1
+    assert operation['per_call']['round_trips'] == 1
+    assert operation['per_call']['rows'] == 3
+    assert operation['per_call']['odoo_queries'] == 2
+    assert operation['sources'] == {'odoo+postgresql': 1}
+    assert sum(operation['histogram'].values()) == 1
+
+
+def test_failures_are_counted():
+    metrics = ChatMetrics(enabled=True)
+
+    def handler():
+        raise RuntimeError
+    try:
+        metrics.measure('handler', handler, make_env())
+    except RuntimeError:
+        pass
+    assert metrics.snapshot()['operations']['handler']['errors'] == 1
+
+
+def test_worker_thread_queries_are_merged_into_the_span():
+    metrics = ChatMetrics(enabled=True)
+    outcome = {}
+
+    def worker_task():
+        metrics.note_query(5, 0.01)
+        return 'stats'
+
+    def handler():
+        worker = threading.Thread(target=lambda: outcome.update(value=metrics.run_traced(worker_task)))
+        worker.start()
+        worker.join()
+        result, counters = outcome['value']
+        metrics.merge_trace(counters)
+        return result
+    assert metrics.measure('greeting', handler, make_env()) == 'stats'
+    operation = metrics.snapshot()['operations']['greeting']
+    assert operation['per_call']['round_trips'] == 1
+    assert operation['per_call']['rows'] == 5
+    assert operation['sources'] == {'postgresql': 1}
+
+
+def test_slow_samples_land_in_the_open_bucket():
+    metrics = ChatMetrics(enabled=True)
+    metrics._record('slow', LATENCY_BUCKETS_MS[-1] + 1, {}, set(), False)
+    operation = metrics.snapshot()['operations']['slow']
+    assert operation['histogram']['inf'] == 1
+    assert operation['wall_ms']['p99'] is None
+
+
+def test_measure_iter_records_the_whole_stream():
+    metrics = ChatMetrics(enabled=True)
+    env = make_env()
+
+    def chunks():
+        metrics.note_query(2, 0.001)
+        yield 'header'
+        env.cr.sql_log_count += 1
+        yield 'row'
+    stream = metrics.measure_iter('stream', chunks(), env)
+    assert metrics.snapshot()['operations'] == {}
+    assert list(stream) == ['header', 'row']
+    operation = metrics.snapshot()['operations']['stream']
+    assert operation['count'] == 1
+    assert operation['per_call']['round_trips'] == 1
+    assert operation['per_call']['odoo_queries'] == 1
+
+
+def test_stream_closed_early_is_not_an_error():
+    metrics = ChatMetrics(enabled=True)
+    stream = metrics.measure_iter('stream', iter(['a', 'b']), make_env())
+    assert next(stream) == 'a'
+    stream.close()
+    operation = metrics.snapshot()['operations']['stream']
+    assert operation['count'] == 1
+    assert operation['errors'] == 0
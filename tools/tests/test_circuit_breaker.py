@@ -0,0 +1,80 @@
+import pytest
+
+from odoo.addons.ai_marketing_assistant.tools import circuit_breaker as circuit_breaker_module
+from odoo.addons.ai_marketing_assistant.tools.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker_module.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def open_breaker(breaker):
+    for _ in range(breaker.failure_threshold):
+        assert breaker.allow()
+        breaker.record_failure(RuntimeError("down"))
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker('db', failure_threshold=3, reset_timeout=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.stats()['state'] == CLOSED
+    breaker.record_failure(RuntimeError("down"))
+    assert breaker.stats()['state'] == OPEN
+    assert breaker.is_open()
+    assert not breaker.allow()
+    stats = breaker.stats()
+    assert stats['rejected'] == 1
+    assert stats['retry_in'] == 30
+    assert stats['last_error'] == "down"
+    assert stats['total_failures'] == 5
+
+
+def test_single_probe_when_half_open(clock):
+    breaker = CircuitBreaker('db', failure_threshold=1, reset_timeout=30)
+    open_breaker(breaker)
+    clock[0] += 30
+    assert not breaker.is_open()
+    assert breaker.allow()
+    assert breaker.stats()['state'] == HALF_OPEN
+    assert breaker.is_open()
+    assert not breaker.allow()
+
+
+def test_successful_probe_closes(clock):
+    breaker = CircuitBreaker('db', failure_threshold=2, reset_timeout=30)
+    open_breaker(breaker)
+    clock[0] += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.stats()['state'] == CLOSED
+    assert breaker.stats()['consecutive_failures'] == 0
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens(clock):
+    breaker = CircuitBreaker('db', failure_threshold=3, reset_timeout=30)
+    open_breaker(breaker)
+    clock[0] += 30
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.stats()['state'] == OPEN
+    assert not breaker.allow()
+    clock[0] += 30
+    assert breaker.allow()
+
+
+def test_released_probe_can_be_claimed_again(clock):
+    breaker = CircuitBreaker('db', failure_threshold=1, reset_timeout=30)
+    open_breaker(breaker)
+    clock[0] += 30
+    assert breaker.allow()
+    breaker.release()
+    assert breaker.allow()
+    assert breaker.stats()['state'] == HALF_OPEN
@@ -0,0 +1,68 @@
+import re
+
+import pytest
+
+from odoo.addons.ai_marketing_assistant.tools.intent_classifier import (
+    QUESTION_KEYWORDS, IntentClassifier, _trie_pattern, question_classifier,
+)
+
+MESSAGES = [
+    "hello",
+    "show me the roi of my campaigns",
+    "quel est le taux de conversion ?",
+    "what is the best channel by performance",
+    "which are the worst performing campaigns this month",
+    "how much did we spend on ads",
+    "ما هي أفضل قناة",
+    "who are you",
+    "this is a thing",
+    "profitable campaign returns",
+    "coûts et budget",
+    "",
+]
+
+
+def naive_scores(message_lower):
+    """Reference implementation: test each keyword with ``in``"""
+    scores = {}
+    for category, keywords in QUESTION_KEYWORDS.items():
+        hits = sum(1 for keyword in set(keywords) if keyword in message_lower)
+        if hits:
+            scores[category] = hits
+    return scores
+
+
+@pytest.mark.parametrize('message', MESSAGES)
+def test_scores_match_substring_search(message):
+    assert question_classifier.scores(message) == naive_scores(message)
+
+
+@pytest.mark.parametrize('message, category', [
+    ("hello", 'greeting'),
+    ("show me the roi of my campaigns", 'campaign'),
+    ("what is the return on investment", 'roi'),
+    ("quel est le taux de conversion", 'conversion'),
+    ("how much did we spend", 'budget'),
+    ("who are you", 'personal'),
+    ("xyz", 'general'),
+])
+def test_classify(message, category):
+    assert question_classifier.classify(message) == category
+
+
+def test_ties_go_to_the_first_category():
+    classifier = IntentClassifier({'first': ['alpha'], 'second': ['beta']})
+    assert classifier.classify("beta alpha") == 'first'
+    assert classifier.classify("nothing") == 'general'
+
+
+def test_overlapping_keywords_are_all_found():
+    classifier = IntentClassifier({'short': ['con'], 'long': ['conversion'], 'inner': ['version']})
+    assert classifier.matched_keywords("conversion") == {'con', 'conversion', 'version'}
+
+
+def test_trie_pattern_prefers_the_longest_word():
+    pattern = re.compile(_trie_pattern(['rate', 'rat', 'ra']))
+    assert pattern.match('rates').group() == 'rate'
+    assert pattern.match('rats').group() == 'rat'
+    assert pattern.match('ran').group() == 'ra'
@@ -0,0 +1,75 @@
+import pytest
+
+from odoo.addons.ai_marketing_assistant.tools import marketing_indexes
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.connection.executed.append(' '.join(sql.split()))
+
+    def fetchone(self):
+        last = self.connection.executed[-1]
+        if 'information_schema.columns' in last:
+            return (self.connection.columns,)
+        if 'to_regclass' in last:
+            return ('marketing_data',)
+        return (None,)
+
+
+class FakeConnection:
+    def __init__(self, dsn, columns):
+        self.dsn = dsn
+        self.columns = columns
+        self.executed = []
+        self.commits = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        pass
+
+    def commit(self):
+        self.commits += 1
+
+
+@pytest.fixture(autouse=True)
+def forget_checked_databases(monkeypatch):
+    monkeypatch.setattr(marketing_indexes, '_columns_ready', set())
+
+
+def test_presence_check_never_alters_the_table():
+    connection = FakeConnection('dbname=old', columns=0)
+    assert not marketing_indexes.generated_columns_present(connection)
+    assert not any('ALTER' in sql for sql in connection.executed)
+
+
+def test_presence_is_remembered_per_database():
+    connection = FakeConnection('dbname=new', columns=2)
+    assert marketing_indexes.generated_columns_present(connection)
+    connection.executed.clear()
+    assert marketing_indexes.generated_columns_present(connection)
+    assert connection.executed == []
+
+
+def test_ensure_adds_missing_columns():
+    connection = FakeConnection('dbname=old', columns=0)
+    assert marketing_indexes.ensure_generated_columns(connection)
+    assert any(sql.startswith('ALTER TABLE marketing_data ADD COLUMN IF NOT EXISTS roi')
+               for sql in connection.executed)
+    assert connection.commits == 1
+
+
+def test_ensure_skips_present_columns():
+    connection = FakeConnection('dbname=new', columns=2)
+    assert marketing_indexes.ensure_generated_columns(connection)
+    assert not any('ALTER' in sql for sql in connection.executed)
@@ -0,0 +1,31 @@
+import pytest
+
+from odoo.addons.ai_marketing_assistant.tools.marketing_queries import (
+    MARKETING_QUERIES, inline_variant, query_variant,
+)
+from odoo.addons.ai_marketing_assistant.tools.marketing_summary import ROI_SQL
+
+
+def test_unfiltered_variant_is_the_named_query():
+    assert query_variant('totals') == ('totals', MARKETING_QUERIES['totals'])
+
+
+def test_filtered_variant_names_its_predicates():
+    name, query = query_variant('best_roi', ('date_from', 'channel'))
+    assert name == 'best_roi_cf'
+    assert "channel = %(channel)s AND created_date >= %(date_from)s" in query
+
+
+@pytest.mark.parametrize('name', sorted(MARKETING_QUERIES))
+def test_inline_variant_computes_the_generated_columns(name):
+    variant, query = inline_variant(name)
+    assert variant == f"{name}_inline"
+    assert ROI_SQL + " AS roi" in query
+    # Same select list and clauses, only the relation differs
+    assert query.replace(query.split('FROM ', 1)[1].split('\n')[0], 'marketing_data') == MARKETING_QUERIES[name]
+
+
+def test_inline_variant_keeps_the_filters():
+    variant, _query = query_variant('by_channel', ('channel',))
+    assert inline_variant(variant) == query_variant('by_channel', ('channel',), inline=True)
+    assert inline_variant(variant)[0] == 'by_channel_c_inline'
@@ -0,0 +1,86 @@
+import re
+
+import pytest
+
+from odoo.addons.ai_marketing_assistant.tools import marketing_summary
+from odoo.addons.ai_marketing_assistant.tools.marketing_queries import MARKETING_QUERIES
+from odoo.addons.ai_marketing_assistant.tools.marketing_summary import SUMMARY_STATS_KEYS, SUMMARY_STATS_SQL
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.connection.executed.append(' '.join(sql.split()))
+
+    def fetchone(self):
+        last = self.connection.executed[-1]
+        if "to_regclass('marketing_data_summary')" in last:
+            return ('marketing_data_summary' if self.connection.installed else None,)
+        if 'to_regclass' in last:
+            return ('marketing_data',)
+        return None
+
+
+class FakeConnection:
+    def __init__(self, dsn, installed):
+        self.dsn = dsn
+        self.installed = installed
+        self.executed = []
+
+    def cursor(self, cursor_factory=None):
+        return FakeCursor(self)
+
+    def rollback(self):
+        pass
+
+    def commit(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def forget_installs():
+    marketing_summary.reset_installed()
+    yield
+    marketing_summary.reset_installed()
+
+
+def test_missing_summary_is_not_installed_on_read():
+    connection = FakeConnection('db=missing', installed=False)
+    assert marketing_summary.read_summary_stats(connection) is None
+    assert connection.executed == ["SELECT to_regclass('marketing_data_summary')"]
+
+
+def test_installed_summary_is_remembered():
+    connection = FakeConnection('db=ready', installed=True)
+    assert marketing_summary.read_summary_stats(connection) == dict.fromkeys(SUMMARY_STATS_KEYS, 0)
+    connection.executed.clear()
+    marketing_summary.read_summary_stats(connection)
+    assert not any('to_regclass' in sql for sql in connection.executed)
+
+
+def test_ensure_summary_installs_once():
+    connection = FakeConnection('db=new', installed=False)
+    assert marketing_summary.ensure_summary(connection)
+    assert any(sql.startswith('CREATE TABLE IF NOT EXISTS marketing_data_summary') for sql in connection.executed)
+    connection.executed.clear()
+    assert marketing_summary.ensure_summary(connection)
+    assert connection.executed == []
+
+
+def selected_names(sql):
+    """Output column names of a SELECT written one expression per line"""
+    select_list = re.split(r'\n\s*FROM ', sql, maxsplit=1)[0] + ','
+    return set(re.findall(r'(\w+),\s*\n', select_list.replace(',', ',\n')))
+
+
+@pytest.mark.parametrize('sql', [SUMMARY_STATS_SQL, MARKETING_QUERIES['totals']])
+def test_statistics_queries_have_every_key(sql):
+    assert set(SUMMARY_STATS_KEYS) <= selected_names(sql)
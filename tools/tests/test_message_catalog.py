@@ -0,0 +1,51 @@
+from string import Formatter
+
+import pytest
+
+from odoo.addons.ai_marketing_assistant.tools.chat_messages import CHAT_MESSAGES
+from odoo.addons.ai_marketing_assistant.tools.message_catalog import CompiledTemplate, MessageCatalog
+
+CATALOG = MessageCatalog({
+    'hello': {'en': "Hello {name}!\n", 'fr': "Bonjour {name} !\n"},
+    'row': {'en': "{index}. {name}: {roi:.1f}%\n"},
+    'header': {'en': "Top campaigns\n"},
+    'footer': {'en': "{count} shown"},
+})
+
+
+@pytest.mark.parametrize('source, values', [
+    ("plain text", {}),
+    ("{name} spent ${cost:,.0f}", {'name': "Spring", 'cost': 12345.6}),
+    ("{rate:.2f}% {{literal}}", {'rate': 3.14159}),
+])
+def test_compiled_template_matches_str_format(source, values):
+    assert CompiledTemplate(source).render(values) == source.format(**values)
+
+
+@pytest.mark.parametrize('source', ["{0}", "{}", "{name!r}", "{row[name]}", "{row.name}"])
+def test_unsupported_placeholders_are_rejected(source):
+    with pytest.raises(ValueError):
+        CompiledTemplate(source)
+
+
+def test_render_falls_back_to_the_default_language():
+    assert CATALOG.render('hello', 'fr', {'name': "Ana"}) == "Bonjour Ana !\n"
+    assert CATALOG.render('hello', 'ar', {'name': "Ana"}) == "Hello Ana!\n"
+
+
+def test_render_rows():
+    rows = [{'index': 1, 'name': "A", 'roi': 12.34}, {'index': 2, 'name': "B", 'roi': -5}]
+    text = CATALOG.render_rows('row', 'en', rows, header='header', footer='footer', values={'count': 2})
+    assert text == "Top campaigns\n1. A: 12.3%\n2. B: -5.0%\n2 shown"
+    assert CATALOG.render_rows('row', 'en', []) == ""
+
+
+@pytest.mark.parametrize('key', sorted(CHAT_MESSAGES))
+def test_chat_messages_use_the_same_fields_in_every_language(key):
+    by_language = CHAT_MESSAGES[key]
+    assert 'en' in by_language
+    fields = {
+        language: {field for _literal, field, _spec, _conversion in Formatter().parse(source) if field}
+        for language, source in by_language.items()
+    }
+    assert all(names == fields['en'] for names in fields.values()), fields
@@ -0,0 +1,89 @@
+import time
+
+import pytest
+
+from odoo.addons.ai_marketing_assistant.tools import pg_pool
+from odoo.addons.ai_marketing_assistant.tools.pg_pool import MarketingConnectionPool, PoolError
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.rollbacks = 0
+
+    def close(self):
+        self.closed = 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def get_transaction_status(self):
+        return pg_pool.extensions.TRANSACTION_STATUS_IDLE
+
+    def cursor(self):
+        raise AssertionError("no health check expected")
+
+
+@pytest.fixture
+def make_pool(monkeypatch):
+    def make(**kwargs):
+        pool = MarketingConnectionPool({}, **kwargs)
+        pool.opened = []
+
+        def connect():
+            connection = FakeConnection()
+            pool.opened.append(connection)
+            return connection
+        monkeypatch.setattr(pool, '_connect', connect)
+        return pool
+    return make
+
+
+def test_reuses_idle_connection(make_pool):
+    pool = make_pool(minconn=0, maxconn=2)
+    connection = pool.getconn()
+    pool.putconn(connection)
+    assert pool.getconn() is connection
+    assert len(pool.opened) == 1
+
+
+def test_invalid_size():
+    with pytest.raises(ValueError):
+        MarketingConnectionPool({}, minconn=3, maxconn=2)
+
+
+def test_closes_expired_idle_connections(make_pool):
+    pool = make_pool(minconn=1, maxconn=2, idle_timeout=0.01)
+    busy, stale = pool.getconn(), pool.getconn()
+    pool.putconn(stale)
+    time.sleep(0.02)
+    fresh = pool.getconn()
+    assert stale.closed
+    assert fresh is not stale and not fresh.closed
+    assert pool.stats()['size'] == 2
+    pool.putconn(busy)
+
+
+def test_times_out_when_full(make_pool):
+    pool = make_pool(minconn=0, maxconn=1, idle_timeout=60, acquire_timeout=0.05)
+    pool.getconn()
+    with pytest.raises(PoolError):
+        pool.getconn()
+
+
+def test_discarded_connection_is_closed(make_pool):
+    pool = make_pool(minconn=0, maxconn=1)
+    connection = pool.getconn()
+    pool.putconn(connection, discard=True)
+    assert connection.closed
+    assert pool.stats()['size'] == 0
+
+
+def test_closeall_rejects_new_borrowers(make_pool):
+    pool = make_pool(minconn=0, maxconn=1)
+    connection = pool.getconn()
+    pool.putconn(connection)
+    pool.closeall()
+    assert connection.closed
+    with pytest.raises(PoolError):
+        pool.getconn()
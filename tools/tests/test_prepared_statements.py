@@ -0,0 +1,86 @@
+import pytest
+from psycopg2 import errors
+
+from odoo.addons.ai_marketing_assistant.tools.prepared_statements import PreparedStatement, StatementRegistry
+
+
+class FakeConnection:
+    def __init__(self):
+        self.rollbacks = 0
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+class FakeCursor:
+    def __init__(self, connection, fail_on=()):
+        self.connection = connection
+        self.executed = []
+        self.fail_on = list(fail_on)
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+        if self.fail_on and sql.startswith('EXECUTE'):
+            raise self.fail_on.pop(0)("prepared statement does not exist")
+
+
+def test_placeholders_are_numbered_once_per_name():
+    statement = PreparedStatement('s', "SELECT * FROM t WHERE a = %(a)s AND b > %(b)s OR a < %(a)s")
+    assert statement.prepare_sql == "PREPARE s AS SELECT * FROM t WHERE a = $1 AND b > $2 OR a < $1"
+    assert statement.execute_sql == "EXECUTE s (%s, %s)"
+    assert statement.args({'b': 2, 'a': 1}) == (1, 2)
+
+
+def test_statement_without_parameters():
+    statement = PreparedStatement('s', "  SELECT 1  ")
+    assert statement.prepare_sql == "PREPARE s AS SELECT 1"
+    assert statement.execute_sql == "EXECUTE s"
+    assert statement.args(None) == ()
+
+
+def test_prepared_once_per_connection():
+    registry = StatementRegistry({'count': "SELECT count(*) FROM t WHERE c = %(c)s"})
+    first, second = FakeConnection(), FakeConnection()
+    cursor = FakeCursor(first)
+    registry.execute(cursor, 'count', {'c': 'x'})
+    registry.execute(cursor, 'count', {'c': 'y'})
+    registry.execute(FakeCursor(second), 'count', {'c': 'z'})
+    assert cursor.executed == [
+        ("PREPARE ai_marketing_count AS SELECT count(*) FROM t WHERE c = $1", None),
+        ("EXECUTE ai_marketing_count (%s)", ('x',)),
+        ("EXECUTE ai_marketing_count (%s)", ('y',)),
+    ]
+    assert registry.stats()['prepares'] == 2
+    assert registry.stats()['executions'] == 3
+    assert registry.stats()['connections'] == 2
+
+
+def test_variants_are_registered_on_first_use():
+    registry = StatementRegistry({})
+    cursor = FakeCursor(FakeConnection())
+    registry.execute(cursor, 'variant', {}, query="SELECT 2")
+    assert cursor.executed[0] == ("PREPARE ai_marketing_variant AS SELECT 2", None)
+    assert registry.stats()['statements'] == 1
+
+
+@pytest.mark.parametrize('error', [errors.InvalidSqlStatementName, errors.FeatureNotSupported])
+def test_invalid_statement_is_prepared_again(error):
+    registry = StatementRegistry({'one': "SELECT 1"})
+    connection = FakeConnection()
+    cursor = FakeCursor(connection, fail_on=[error])
+    registry.execute(cursor, 'one')
+    assert connection.rollbacks == 1
+    assert [sql for sql, _params in cursor.executed] == [
+        "PREPARE ai_marketing_one AS SELECT 1",
+        "EXECUTE ai_marketing_one",
+        "DEALLOCATE ALL",
+        "PREPARE ai_marketing_one AS SELECT 1",
+        "EXECUTE ai_marketing_one",
+    ]
+
+
+def test_disabled_registry_sends_plain_sql():
+    registry = StatementRegistry({'one': "SELECT %(a)s"}, enabled=False)
+    cursor = FakeCursor(FakeConnection())
+    registry.execute(cursor, 'one', {'a': 1})
+    assert cursor.executed == [("SELECT %(a)s", {'a': 1})]
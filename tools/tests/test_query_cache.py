@@ -0,0 +1,86 @@
+import threading
+
+from odoo.addons.ai_marketing_assistant.tools import query_cache as query_cache_module
+from odoo.addons.ai_marketing_assistant.tools.query_cache import QueryCache, current_memo, query_memo
+
+
+def test_make_key_ignores_whitespace_and_param_order():
+    key = QueryCache.make_key("SELECT *\n    FROM t WHERE a = %(a)s", {'b': 2, 'a': 1})
+    assert key == QueryCache.make_key("SELECT * FROM t  WHERE a = %(a)s", {'a': 1, 'b': 2})
+    assert QueryCache.make_key("SELECT 1", [1, 2]) == ("SELECT 1", (1, 2))
+    assert QueryCache.make_key("SELECT 1") == ("SELECT 1", ())
+
+
+def test_get_or_compute_caches_results():
+    cache = QueryCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return [('row',)]
+    assert cache.get_or_compute("SELECT 1", (), 60, compute) == [('row',)]
+    assert cache.get_or_compute("SELECT  1", (), 60, compute) == [('row',)]
+    assert len(calls) == 1
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_none_results_are_not_cached():
+    cache = QueryCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+    cache.get_or_compute("SELECT 1", (), 60, compute)
+    cache.get_or_compute("SELECT 1", (), 60, compute)
+    assert len(calls) == 2
+    assert cache.stats()['entries'] == 0
+
+
+def test_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(query_cache_module.time, 'monotonic', lambda: now[0])
+    cache = QueryCache()
+    cache.set('key', 'value', 10)
+    assert cache.get('key') == 'value'
+    now[0] += 10
+    assert cache.get('key') is None
+    assert cache.stats()['entries'] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = QueryCache(max_entries=2)
+    cache.set('a', 1, 60)
+    cache.set('b', 2, 60)
+    cache.get('a')
+    cache.set('c', 3, 60)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.stats()['evictions'] == 1
+
+
+def test_invalidate_clears_entries():
+    cache = QueryCache()
+    cache.set('a', 1, 60)
+    cache.invalidate()
+    assert cache.get('a') is None
+
+
+def test_query_memo_is_shared_by_nested_scopes_only():
+    assert current_memo() is None
+    with query_memo() as outer:
+        outer['key'] = 'value'
+        with query_memo() as inner:
+            assert inner is outer
+        assert current_memo() is outer
+    assert current_memo() is None
+
+
+def test_query_memo_is_per_thread():
+    seen = []
+    with query_memo():
+        thread = threading.Thread(target=lambda: seen.append(current_memo()))
+        thread.start()
+        thread.join()
+    assert seen == [None]
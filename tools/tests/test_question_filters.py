@@ -0,0 +1,81 @@
+from datetime import date, timedelta
+
+import pytest
+
+from odoo.addons.ai_marketing_assistant.tools.question_filters import (
+    MAX_LIMIT, MAX_WINDOW, NO_FILTERS, QuestionFilters, parse_filters,
+)
+
+TODAY = date(2026, 3, 31)
+CHANNELS = ['Google Ads', 'Google', 'Facebook']
+
+
+def parse(message, today=TODAY):
+    return parse_filters(message.lower(), CHANNELS, today=today)
+
+
+@pytest.mark.parametrize('message, limit', [
+    ("top 10 campaigns", 10),
+    ("show me the 7 best campaigns", 7),
+    ("les 4 meilleures campagnes", 4),
+    ("أفضل 6 حملات", 6),
+    ("top 500 campaigns", MAX_LIMIT),
+    ("top 0 campaigns", None),
+    ("campaigns of 2024", None),
+])
+def test_limit(message, limit):
+    assert parse(message).limit == limit
+
+
+@pytest.mark.parametrize('message, date_from, date_to', [
+    ("roi over the last 30 days", date(2026, 3, 2), None),
+    ("les 2 dernières semaines", date(2026, 3, 18), None),
+    ("آخر 7 أيام", date(2026, 3, 25), None),
+    ("last 1 month", date(2026, 3, 1), None),
+    ("last 2 years", date(2024, 4, 1), None),
+    ("this month", date(2026, 3, 1), None),
+    ("ce mois", date(2026, 3, 1), None),
+    ("last month", date(2026, 2, 1), date(2026, 3, 1)),
+    ("الشهر الماضي", date(2026, 2, 1), date(2026, 3, 1)),
+    ("this week", date(2026, 3, 30), None),
+    ("last week", date(2026, 3, 23), date(2026, 3, 30)),
+    ("l'année dernière", date(2025, 1, 1), date(2026, 1, 1)),
+    ("today", TODAY, None),
+    ("hier", date(2026, 3, 30), date(2026, 3, 31)),
+    ("best campaigns", None, None),
+])
+def test_window(message, date_from, date_to):
+    filters = parse(message)
+    assert (filters.date_from, filters.date_to) == (date_from, date_to)
+
+
+@pytest.mark.parametrize('today, date_from', [
+    (date(2026, 5, 31), date(2026, 3, 1)),  # February has no 31st
+    (date(2024, 5, 31), date(2024, 3, 1)),  # leap February ends on the 29th
+    (date(2026, 3, 15), date(2025, 12, 16)),
+])
+def test_rolling_months_at_month_end(today, date_from):
+    assert parse("last 3 months", today).date_from == date_from
+
+
+def test_huge_windows_are_capped():
+    assert parse("last 9999 years").date_from == date(2016, 4, 1)
+    assert parse("last 9999 days").date_from == TODAY - timedelta(days=MAX_WINDOW['day'] - 1)
+
+
+@pytest.mark.parametrize('message, channel', [
+    ("roi on google ads", 'Google Ads'),
+    ("roi on google", 'Google'),
+    ("facebook budget", 'Facebook'),
+    ("googleplex budget", None),
+])
+def test_channel(message, channel):
+    assert parse(message).channel == channel
+
+
+def test_predicates_and_params():
+    filters = QuestionFilters(5, date(2026, 3, 1), None, 'Google')
+    assert filters.predicates == ('channel', 'date_from')
+    assert filters.params(limit=5) == {'channel': 'Google', 'date_from': date(2026, 3, 1), 'limit': 5}
+    assert NO_FILTERS.predicates == ()
+    assert NO_FILTERS.params() == {}